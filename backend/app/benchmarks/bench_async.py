@@ -0,0 +1,128 @@
+"""
+Teste de carga das leituras com a pilha síncrona e a assíncrona.
+
+Sobe dois uvicorn (``DB_ASYNC=false`` e ``DB_ASYNC=true``), ambos com o
+cache de respostas desligado para que toda requisição chegue ao banco, e
+dispara leitores concorrentes contra ``GET /atos/`` e ``/atos/dashboard``
+durante alguns segundos. Reporta requisições/s e latências p50/p99.
+
+Usa o banco do ``DATABASE_URL`` atual; não grava nada.
+
+Uso (a partir de ``backend/``):
+
+    python -m app.benchmarks.bench_async --leitores 16 64 --duracao 15
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+
+import requests
+
+ROTAS = ["/atos/?limit=50", "/atos/dashboard"]
+
+
+def _subir_api(porta: int, assincrono: bool) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DB_ASYNC": "true" if assincrono else "false",
+        "CACHE_BACKEND": "desativado",
+        "RPA_POOL_MIN": "0",
+    }
+    processo = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(porta), "--log-level", "warning"],
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    limite = time.monotonic() + 30
+    while time.monotonic() < limite:
+        try:
+            requests.get(f"http://127.0.0.1:{porta}/docs", timeout=1)
+            return processo
+        except requests.ConnectionError:
+            time.sleep(0.2)
+
+    processo.kill()
+    raise RuntimeError(f"API na porta {porta} não respondeu")
+
+
+def _carga(base_url: str, leitores: int, duracao: float) -> dict:
+    latencias = []
+    erros = []
+    lock = threading.Lock()
+    fim = time.monotonic() + duracao
+
+    def _leitor(indice: int):
+        sessao = requests.Session()
+        locais, falhas = [], 0
+        i = indice
+
+        while time.monotonic() < fim:
+            inicio = time.perf_counter()
+            try:
+                resposta = sessao.get(base_url + ROTAS[i % len(ROTAS)], timeout=30)
+                if resposta.status_code != 200:
+                    falhas += 1
+            except requests.RequestException:
+                falhas += 1
+            locais.append(time.perf_counter() - inicio)
+            i += 1
+
+        with lock:
+            latencias.extend(locais)
+            erros.append(falhas)
+
+    threads = [threading.Thread(target=_leitor, args=(i,)) for i in range(leitores)]
+    inicio = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    tempo = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        "requisicoes": len(latencias),
+        "erros": sum(erros),
+        "rps": len(latencias) / tempo,
+        "p50_ms": statistics.median(latencias) * 1000,
+        "p99_ms": latencias[int(len(latencias) * 0.99) - 1] * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--leitores", nargs="+", type=int, default=[16, 64])
+    parser.add_argument("--duracao", type=float, default=15.0)
+    parser.add_argument("--porta", type=int, default=8100)
+    args = parser.parse_args()
+
+    resultados = []
+
+    for nome, assincrono, porta in (("sync", False, args.porta), ("async", True, args.porta + 1)):
+        processo = _subir_api(porta, assincrono)
+        try:
+            # Aquece conexões do pool antes de medir
+            _carga(f"http://127.0.0.1:{porta}", 4, 2)
+
+            for leitores in args.leitores:
+                resultados.append({
+                    "pilha": nome,
+                    "leitores": leitores,
+                    **_carga(f"http://127.0.0.1:{porta}", leitores, args.duracao),
+                })
+        finally:
+            processo.terminate()
+            processo.wait()
+
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
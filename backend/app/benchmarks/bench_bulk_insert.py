@@ -0,0 +1,59 @@
+"""
+Compara a vazão de ``salvar_lote_atos`` com COPY + staging e com INSERT
+em chunks de 500 linhas.
+
+Os atos sintéticos vêm do ``gerador`` e são removidos entre as rodadas.
+
+Uso (a partir de ``backend/``):
+
+    python -m app.benchmarks.bench_bulk_insert --tamanhos 10000 100000 1000000
+"""
+import argparse
+import json
+import time
+
+from app.benchmarks.gerador import gerar_atos, limpar
+from app.database.session import SessionLocal
+from app.services.ato_service import salvar_lote_atos
+
+PREFIXO = "LOTE-"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tamanhos", nargs="+", type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--metodos", nargs="+", default=["copy", "insert"])
+    args = parser.parse_args()
+
+    resultados = []
+    db = SessionLocal()
+
+    try:
+        for tamanho in args.tamanhos:
+            atos = gerar_atos(tamanho, PREFIXO)
+
+            for metodo in args.metodos:
+                limpar(db, PREFIXO)
+
+                inicio = time.perf_counter()
+                resposta = salvar_lote_atos(db, atos, metodo=metodo)
+                tempo = time.perf_counter() - inicio
+
+                resultados.append({
+                    "linhas": tamanho,
+                    "metodo": metodo,
+                    "status": resposta["status"],
+                    "inseridos": resposta["total_registros"],
+                    "tempo_s": tempo,
+                    "linhas_por_s": tamanho / tempo,
+                })
+
+        limpar(db, PREFIXO)
+    finally:
+        db.close()
+
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compara a latência de ``GET /atos?search=`` nos modos ``ilike`` (trecho
+sem índice), ``fts`` e ``ranking``, e do ``fts`` com os índices GIN
+removidos, em tabelas de tamanhos crescentes.
+
+A remoção dos índices acontece dentro de uma transação desfeita ao final
+da medição (DDL é transacional no Postgres), então o banco volta ao
+estado original. ``DROP INDEX`` bloqueia a tabela durante a medição:
+rode apenas em bancos de desenvolvimento.
+
+Uso (a partir de ``backend/``):
+
+    python -m app.benchmarks.bench_busca --tamanhos 10000 100000 1000000
+"""
+import argparse
+import json
+import statistics
+import time
+
+from sqlalchemy import text
+
+from app.benchmarks.gerador import MARCADOR, limpar, popular
+from app.database.session import SessionLocal
+from app.routers.atos import _listar_atos
+
+TERMOS = ["escrituração contábil", "lucro presumido", "insumos", f"{MARCADOR}12345"]
+
+
+def _medir(db, modo: str, repeticoes: int) -> float:
+    tempos = []
+    for termo in TERMOS:
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            _listar_atos(db, None, None, termo, modo, 100, None)
+            tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tamanhos", nargs="+", type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    resultados = []
+    db = SessionLocal()
+    populados = 0
+
+    try:
+        for tamanho in sorted(args.tamanhos):
+            popular(db, populados, tamanho)
+            populados = tamanho
+            db.execute(text("ANALYZE atos"))
+            db.commit()
+
+            medicao = {"linhas_benchmark": tamanho}
+            for modo in ("ilike", "fts", "ranking"):
+                medicao[f"{modo}_ms"] = _medir(db, modo, args.repeticoes)
+
+            db.execute(text("DROP INDEX ix_atos_busca"))
+            db.execute(text("DROP INDEX ix_atos_numero_ato_trgm"))
+            medicao["fts_sem_indice_ms"] = _medir(db, "fts", args.repeticoes)
+            db.rollback()
+
+            resultados.append(medicao)
+    finally:
+        db.rollback()
+        limpar(db)
+        db.close()
+
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
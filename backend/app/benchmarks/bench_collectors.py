@@ -0,0 +1,83 @@
+"""
+Mede vazão e pico de memória dos motores de coleta contra o SIJUT2 local
+(``app.rpa.fixture_server``).
+
+Cada motor roda em um subprocesso próprio, para que o pico de RSS
+(incluindo Chromium/chromedriver, no caso do Selenium) não se misture
+entre as medições.
+
+Uso (a partir de ``backend/``):
+
+    python -m app.benchmarks.bench_collectors --engines selenium http --repeticoes 3
+"""
+import argparse
+import json
+import resource
+import subprocess
+import sys
+import time
+
+from app.rpa.collector import criar_collector
+from app.rpa.fixture_server import iniciar_servidor
+
+
+def _executar(engine: str, url: str, repeticoes: int) -> dict:
+    collector = criar_collector(engine, url=url)
+    tempos = []
+    linhas = 0
+
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        linhas = len(collector.coletar())
+        tempos.append(time.perf_counter() - inicio)
+
+    proprio = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    filhos = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss
+
+    return {
+        "engine": engine,
+        "linhas": linhas,
+        "tempo_medio_s": sum(tempos) / len(tempos),
+        "linhas_por_s": linhas / (sum(tempos) / len(tempos)),
+        # ru_maxrss é em KiB no Linux
+        "pico_rss_mb": (proprio + filhos) / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--engines", nargs="+", default=["selenium", "http"])
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--interno", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.interno:
+        print(json.dumps(_executar(args.interno, args.url, args.repeticoes)))
+        return
+
+    servidor, url = iniciar_servidor()
+    resultados = []
+
+    try:
+        for engine in args.engines:
+            saida = subprocess.run(
+                [
+                    sys.executable, "-m", "app.benchmarks.bench_collectors",
+                    "--interno", engine,
+                    "--url", url,
+                    "--repeticoes", str(args.repeticoes),
+                ],
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            resultados.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+    finally:
+        servidor.shutdown()
+
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Compara ``/atos/dashboard`` sobre o resumo diário com as três agregações
+diretas na tabela ``atos`` usadas antes, em tabelas de tamanhos
+crescentes.
+
+Os atos sintéticos vêm do ``gerador`` e são removidos ao final (com a
+baixa correspondente no resumo).
+
+Uso (a partir de ``backend/``):
+
+    python -m app.benchmarks.bench_dashboard --tamanhos 10000 100000 1000000
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import func
+
+from app.benchmarks.gerador import limpar, popular
+from app.database.session import SessionLocal
+from app.models.ato import Ato
+from app.services.resumo_service import resumo_dashboard
+
+
+def _dashboard_direto(db, data_inicio, data_fim):
+    query_base = db.query(Ato).filter(Ato.deleted_at.is_(None))
+    if data_inicio:
+        query_base = query_base.filter(Ato.publicacao >= data_inicio)
+    if data_fim:
+        query_base = query_base.filter(Ato.publicacao <= data_fim)
+
+    query_base.count()
+    query_base.with_entities(Ato.orgao_unidade, func.count(Ato.id)).group_by(Ato.orgao_unidade).all()
+    query_base.with_entities(Ato.tipo_ato, func.count(Ato.id)).group_by(Ato.tipo_ato).all()
+
+
+def _medir(funcao, repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tamanhos", nargs="+", type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    resultados = []
+    db = SessionLocal()
+    populados = 0
+    ano = (date.today() - timedelta(days=365), date.today())
+
+    try:
+        for tamanho in sorted(args.tamanhos):
+            popular(db, populados, tamanho)
+            populados = tamanho
+
+            resultados.append({
+                "linhas_benchmark": tamanho,
+                "resumo_total_ms": _medir(lambda: resumo_dashboard(db, None, None), args.repeticoes),
+                "direto_total_ms": _medir(lambda: _dashboard_direto(db, None, None), args.repeticoes),
+                "resumo_1_ano_ms": _medir(lambda: resumo_dashboard(db, *ano), args.repeticoes),
+                "direto_1_ano_ms": _medir(lambda: _dashboard_direto(db, *ano), args.repeticoes),
+            })
+    finally:
+        limpar(db)
+        db.close()
+
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
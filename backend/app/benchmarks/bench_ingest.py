@@ -0,0 +1,63 @@
+"""
+Mede o tempo de ingestão ponta a ponta do pipeline do RPA nos dois modos
+de envio: ``direto`` (serviço no mesmo processo) e ``http`` (login JWT +
+POST em ``/atos/batch``).
+
+O modo ``http`` precisa da API rodando em ``API_BASE_URL``. Os atos
+sintéticos vêm do ``gerador`` e são removidos ao final.
+
+Uso (a partir de ``backend/``):
+
+    python -m app.benchmarks.bench_ingest --linhas 10000
+"""
+import argparse
+import json
+import time
+
+from app.benchmarks.gerador import gerar_paginas, limpar
+from app.database.session import SessionLocal
+from app.services.pipeline import executar_pipeline
+from app.services.rpa_service import ENVIOS
+
+PREFIXO = "INGEST-"
+
+
+def _limpar():
+    db = SessionLocal()
+    try:
+        limpar(db, PREFIXO)
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--linhas", type=int, default=10_000)
+    parser.add_argument("--modos", nargs="+", default=list(ENVIOS))
+    args = parser.parse_args()
+
+    resultados = []
+
+    for modo in args.modos:
+        _limpar()
+
+        inicio = time.perf_counter()
+        resultado = executar_pipeline(gerar_paginas(args.linhas, PREFIXO), ENVIOS[modo]())
+        tempo = time.perf_counter() - inicio
+
+        resultados.append({
+            "modo": modo,
+            "status": resultado["status"],
+            "linhas": args.linhas,
+            "inseridos": resultado["total_inseridos"],
+            "tempo_s": tempo,
+            "linhas_por_s": args.linhas / tempo,
+        })
+
+    _limpar()
+
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
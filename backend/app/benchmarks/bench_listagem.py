@@ -0,0 +1,77 @@
+"""
+Mede a primeira página de ``GET /atos`` (paginação por chave) e a
+exportação NDJSON em tabelas de tamanhos crescentes, com o pico de
+memória Python (tracemalloc) de cada operação.
+
+As rotas são chamadas em processo, sem servidor HTTP. Os atos
+sintéticos vêm do ``gerador``; a cada tamanho a tabela é completada até
+o total pedido e tudo é removido ao final.
+
+Uso (a partir de ``backend/``):
+
+    python -m app.benchmarks.bench_listagem --tamanhos 10000 100000 1000000
+"""
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+
+from app.benchmarks.gerador import limpar, popular
+from app.database.session import SessionLocal
+from app.routers.atos import _listar_atos, export_atos
+
+
+def _medir(funcao):
+    tracemalloc.start()
+    inicio = time.perf_counter()
+    resultado = funcao()
+    tempo = time.perf_counter() - inicio
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return resultado, tempo, pico / 1024 / 1024
+
+
+async def _consumir(streaming) -> int:
+    linhas = 0
+    async for _ in streaming.body_iterator:
+        linhas += 1
+    return linhas
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tamanhos", nargs="+", type=int, default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--limit", type=int, default=100)
+    args = parser.parse_args()
+
+    resultados = []
+    db = SessionLocal()
+    populados = 0
+
+    try:
+        for tamanho in sorted(args.tamanhos):
+            popular(db, populados, tamanho)
+            populados = tamanho
+
+            (pagina, _), tempo_pagina, pico_pagina = _medir(lambda: _listar_atos(
+                db, None, None, None, "fts", args.limit, None
+            ))
+            linhas_export, tempo_export, pico_export = _medir(
+                lambda: asyncio.run(_consumir(export_atos(None, None, None)))
+            )
+
+            resultados.append({
+                "linhas_benchmark": tamanho,
+                "pagina": {"itens": len(pagina), "tempo_ms": tempo_pagina * 1000, "pico_mb": pico_pagina},
+                "export": {"linhas": linhas_export, "tempo_s": tempo_export, "pico_mb": pico_export},
+            })
+    finally:
+        limpar(db)
+        db.close()
+
+    print(json.dumps(resultados, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Paridade e tempo da busca de páginas em paralelo (``rpa_paginas_simultaneas``)
+contra a busca sequencial.
+
+Sobe o SIJUT2 local servindo páginas sintéticas (``gerador.gerar_paginas``)
+com ``--atraso-paginas`` segundos por página, como o site lento da Receita,
+e coleta o mesmo período com cada valor de ``--simultaneas``. A primeira
+coleta é sempre sequencial (1) e serve de referência: as demais precisam
+devolver exatamente os mesmos atos, na mesma ordem, que também são
+conferidos contra as páginas geradas. Sai com código 1 se alguma
+coleta divergir.
+
+Uso (a partir de ``backend/``):
+
+    python -m app.benchmarks.bench_paginas_paralelas --linhas 2000 --simultaneas 2 4 8
+"""
+import argparse
+import json
+import sys
+import time
+
+from app.benchmarks.gerador import gerar_paginas
+from app.rpa.collector import criar_collector
+from app.rpa.fixture_server import iniciar_servidor
+
+
+def _coletar(engine: str, url: str, simultaneas: int) -> dict:
+    metricas = {}
+    inicio = time.perf_counter()
+    atos = [
+        ato
+        for pagina in criar_collector(engine, url=url, simultaneas=simultaneas).coletar_paginas(
+            metricas=metricas
+        )
+        for ato in pagina
+    ]
+
+    return {
+        "simultaneas": simultaneas,
+        "tempo_s": time.perf_counter() - inicio,
+        "paginas": metricas["paginas"],
+        "linhas": len(atos),
+        "atos": atos,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--engine", choices=["http", "selenium"], default="http")
+    parser.add_argument("--linhas", type=int, default=2000)
+    parser.add_argument("--por-pagina", type=int, default=50)
+    parser.add_argument("--atraso-paginas", type=float, default=0.2)
+    parser.add_argument("--simultaneas", type=int, nargs="+", default=[2, 4, 8])
+    args = parser.parse_args()
+
+    paginas = list(gerar_paginas(args.linhas, "PAR-", args.por_pagina))
+    esperado = [ato for pagina in paginas for ato in pagina]
+
+    servidor, url = iniciar_servidor(atraso_paginas=args.atraso_paginas, paginas=paginas)
+
+    try:
+        referencia = _coletar(args.engine, url, 1)
+        resultados = [referencia] + [
+            _coletar(args.engine, url, simultaneas)
+            for simultaneas in args.simultaneas
+            if simultaneas != 1
+        ]
+    finally:
+        servidor.shutdown()
+
+    for resultado in resultados:
+        atos = resultado.pop("atos")
+        resultado["paridade"] = atos == esperado
+        resultado["aceleracao"] = referencia["tempo_s"] / resultado["tempo_s"]
+
+    print(json.dumps({
+        "engine": args.engine,
+        "paginas_geradas": len(paginas),
+        "atraso_paginas_s": args.atraso_paginas,
+        "coletas": resultados,
+    }, indent=2))
+
+    if not all(resultado["paridade"] for resultado in resultados):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Compara a extração da tabela de resultados do SIJUT2 célula a célula
+("dom") com a leitura do HTML em uma única chamada ("html").
+
+Abre cada página salva em ``app/rpa/fixtures/sijut2`` no Chrome, confere
+que os dois modos devolvem exatamente os mesmos registros e mede a
+latência por página de cada um.
+
+Uso (a partir de ``backend/``):
+
+    python -m app.benchmarks.bench_parser --repeticoes 20
+"""
+import argparse
+import json
+import statistics
+import time
+from pathlib import Path
+
+from selenium import webdriver
+
+from app.rpa.scraper_selenium import EXTRATORES
+
+
+FIXTURES = Path(__file__).resolve().parent.parent / "rpa" / "fixtures" / "sijut2"
+
+
+def _medir(extrair, driver, repeticoes: int) -> list[float]:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        extrair(driver)
+        tempos.append(time.perf_counter() - inicio)
+    return tempos
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--repeticoes", type=int, default=10)
+    args = parser.parse_args()
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    driver = webdriver.Chrome(options=options)
+
+    resultado = {}
+
+    try:
+        for pagina in sorted(FIXTURES.glob("resultado_p*.html")):
+            driver.get(pagina.as_uri())
+
+            esperado = EXTRATORES["dom"](driver)
+            obtido = EXTRATORES["html"](driver)
+
+            if esperado != obtido:
+                raise SystemExit(f"Divergência entre os modos em {pagina.name}")
+
+            resultado[pagina.name] = {"linhas": len(esperado)}
+
+            for modo, extrair in EXTRATORES.items():
+                tempos = _medir(extrair, driver, args.repeticoes)
+                resultado[pagina.name][modo] = {
+                    "mediana_ms": statistics.median(tempos) * 1000,
+                    "max_ms": max(tempos) * 1000,
+                }
+    finally:
+        driver.quit()
+
+    print(json.dumps(resultado, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,246 @@
+"""
+Consultas por período em ``atos`` e ``rpa_logs`` particionadas por mês,
+comparadas com as mesmas tabelas sem partição.
+
+Popula as tabelas (já particionadas pela migração 0004) com dados do
+``gerador`` e copia o conteúdo para ``bench_atos_heap`` e
+``bench_rpa_logs_heap``, tabelas comuns com os mesmos índices da versão
+anterior à 0004. As consultas são as das rotas, em SQL, rodadas nas duas
+versões (a primeira página de ``GET /atos`` com a janela de
+``JANELA_LISTAGEM_DIAS`` na particionada, como a rota faz); ``particoes_lidas``
+conta as partições que o plano ainda lê depois da poda e
+``mesmo_resultado`` confere que as duas versões devolvem as mesmas linhas. A retenção compara o ``DELETE`` dos logs antigos na
+tabela comum com o ``DROP`` das partições (ambos desfeitos com rollback).
+
+Os dados sintéticos, as cópias e as partições criadas só para eles são
+removidos ao final. Rode apenas em bancos de desenvolvimento.
+
+Uso (a partir de ``backend/``):
+
+    python -m app.benchmarks.bench_particoes --atos 200000 --logs 100000
+"""
+import argparse
+import json
+import statistics
+import time
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+
+from app.benchmarks import gerador
+from app.database.session import SessionLocal, engine
+from app.routers.atos import JANELA_LISTAGEM_DIAS
+from app.services import particoes_service
+
+DIAS_ATOS = 3650
+DIAS_LOGS = 365
+
+# Índices das tabelas antes da 0004 (a chave primária vem à parte)
+INDICES_HEAP = {
+    "bench_atos_heap": [
+        "(publicacao DESC, id DESC) WHERE deleted_at IS NULL",
+        "(publicacao, orgao_unidade, tipo_ato) WHERE deleted_at IS NULL",
+    ],
+    "bench_rpa_logs_heap": ["(execution_date DESC)"],
+}
+
+PRIMEIRA_PAGINA = """
+    SELECT id, publicacao FROM {atos}
+    WHERE deleted_at IS NULL {janela}
+    ORDER BY publicacao DESC, id DESC LIMIT 101
+"""
+
+# SQL único ou {versão: SQL}
+CONSULTAS = {
+    "atos_primeira_pagina": {
+        "heap": PRIMEIRA_PAGINA.replace("{janela}", ""),
+        "particionada": PRIMEIRA_PAGINA.replace("{janela}", "AND publicacao >= :janela"),
+    },
+    "atos_mes": """
+        SELECT id, publicacao FROM {atos}
+        WHERE deleted_at IS NULL AND publicacao >= :mes AND publicacao < :mes_fim
+        ORDER BY publicacao DESC, id DESC LIMIT 100
+    """,
+    "atos_trimestre_por_orgao": """
+        SELECT orgao_unidade, count(*) FROM {atos}
+        WHERE deleted_at IS NULL AND publicacao >= :mes AND publicacao < :trimestre_fim
+        GROUP BY orgao_unidade
+    """,
+    "atos_ano_contagem": """
+        SELECT count(*) FROM {atos}
+        WHERE deleted_at IS NULL AND publicacao >= :hoje - 365
+    """,
+    "logs_30_dias": """
+        SELECT id, execution_date, status FROM {logs}
+        WHERE execution_date >= :agora - interval '30 days'
+        ORDER BY execution_date DESC LIMIT 20
+    """,
+    "logs_trimestre_por_status": """
+        SELECT status, count(*) FROM {logs}
+        WHERE execution_date >= :agora - interval '90 days'
+        GROUP BY status
+    """,
+}
+
+VERSOES = {
+    "heap": {"atos": "bench_atos_heap", "logs": "bench_rpa_logs_heap"},
+    "particionada": {"atos": "atos", "logs": "rpa_logs"},
+}
+
+
+def _meses(dias: int) -> list[date]:
+    mes = particoes_service.inicio_do_mes(date.today() - timedelta(days=dias))
+    meses = []
+    while mes <= date.today():
+        meses.append(mes)
+        mes = particoes_service.proximo_mes(mes)
+    return meses
+
+
+def _preparar(db, args) -> tuple[list[str], list]:
+    """Cria as partições dos períodos sintéticos e popula; devolve as criadas e os ids dos logs."""
+    criadas = [
+        particoes_service.nome_particao(tabela, mes)
+        for tabela, dias in (("atos", DIAS_ATOS), ("rpa_logs", DIAS_LOGS))
+        for mes in _meses(dias)
+        if particoes_service.criar_particao(db, tabela, mes)
+    ]
+    db.commit()
+
+    gerador.popular(db, 0, args.atos, "PART-")
+    ids_logs = gerador.popular_logs(db, args.logs, dias=DIAS_LOGS)
+
+    for heap, origem in (("bench_atos_heap", "atos"), ("bench_rpa_logs_heap", "rpa_logs")):
+        db.execute(text(f"CREATE TABLE {heap} AS SELECT * FROM {origem}"))
+        db.execute(text(f"ALTER TABLE {heap} ADD PRIMARY KEY (id)"))
+        for definicao in INDICES_HEAP[heap]:
+            db.execute(text(f"CREATE INDEX ON {heap} {definicao}"))
+    db.commit()
+
+    # Visibility map e estatísticas em dia nas duas versões
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conexao:
+        for tabela in ("atos", "rpa_logs", "bench_atos_heap", "bench_rpa_logs_heap"):
+            conexao.execute(text(f"VACUUM ANALYZE {tabela}"))
+
+    return criadas, ids_logs
+
+
+def _particoes_lidas(no: dict) -> set[str]:
+    lidas = {no["Relation Name"]} if "Relation Name" in no else set()
+    for filho in no.get("Plans", []):
+        lidas |= _particoes_lidas(filho)
+    return lidas
+
+
+def _medir(db, sql: str, parametros: dict, repeticoes: int) -> tuple[dict, list]:
+    plano = db.execute(text("EXPLAIN (FORMAT JSON) " + sql), parametros).scalar()
+    if isinstance(plano, str):
+        plano = json.loads(plano)
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        linhas = db.execute(text(sql), parametros).all()
+        tempos.append(time.perf_counter() - inicio)
+
+    medidas = {
+        "mediana_ms": statistics.median(tempos) * 1000,
+        "particoes_lidas": len(_particoes_lidas(plano[0]["Plan"])),
+    }
+    return medidas, sorted(linhas)
+
+
+def _retencao(db, retencao_dias: int) -> dict:
+    limite = datetime.utcnow() - timedelta(days=retencao_dias)
+
+    inicio = time.perf_counter()
+    apagadas = db.execute(
+        text("DELETE FROM bench_rpa_logs_heap WHERE execution_date < :limite"), {"limite": limite}
+    ).rowcount
+    delete_ms = (time.perf_counter() - inicio) * 1000
+    db.rollback()
+
+    inicio = time.perf_counter()
+    removidas = particoes_service.remover_antigas(db, "rpa_logs", retencao_dias)
+    drop_ms = (time.perf_counter() - inicio) * 1000
+    db.rollback()
+
+    return {
+        "retencao_dias": retencao_dias,
+        "delete_linhas": apagadas,
+        "delete_ms": delete_ms,
+        "drop_particoes": len(removidas),
+        "drop_ms": drop_ms,
+    }
+
+
+def _limpar(db, criadas: list[str], ids_logs: list):
+    db.execute(text("DROP TABLE IF EXISTS bench_atos_heap, bench_rpa_logs_heap"))
+    db.commit()
+    gerador.limpar(db, "PART-")
+    gerador.limpar_logs(db, ids_logs)
+
+    # Só as partições criadas para os dados sintéticos, se ficaram vazias
+    for nome in criadas:
+        if db.execute(text(f"SELECT NOT EXISTS (SELECT 1 FROM {nome})")).scalar():
+            db.execute(text(f"DROP TABLE {nome}"))
+    db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--atos", type=int, default=200_000)
+    parser.add_argument("--logs", type=int, default=100_000)
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--retencao-dias", type=int, default=180)
+    args = parser.parse_args()
+
+    hoje = date.today()
+    # Um mês de dois anos atrás: fora das partições mais recentes
+    mes = particoes_service.inicio_do_mes(hoje - timedelta(days=730))
+    mes_fim = particoes_service.proximo_mes(mes)
+    parametros = {
+        "hoje": hoje,
+        "agora": datetime.utcnow(),
+        "mes": mes,
+        "mes_fim": mes_fim,
+        "trimestre_fim": particoes_service.proximo_mes(particoes_service.proximo_mes(mes_fim)),
+        "janela": hoje - timedelta(days=JANELA_LISTAGEM_DIAS),
+    }
+
+    db = SessionLocal()
+    criadas, ids_logs = [], []
+
+    try:
+        criadas, ids_logs = _preparar(db, args)
+        particoes = {tabela: len(particoes_service.listar(db, tabela)) for tabela in particoes_service.TABELAS}
+
+        consultas = {}
+        for nome, sql in CONSULTAS.items():
+            medidas, resultados = {}, []
+            for versao, tabelas in VERSOES.items():
+                sql_versao = sql[versao] if isinstance(sql, dict) else sql
+                medidas[versao], linhas = _medir(db, sql_versao.format(**tabelas), parametros, args.repeticoes)
+                resultados.append(linhas)
+
+            medidas["aceleracao"] = medidas["heap"]["mediana_ms"] / medidas["particionada"]["mediana_ms"]
+            medidas["mesmo_resultado"] = resultados[0] == resultados[1]
+            consultas[nome] = medidas
+
+        retencao = _retencao(db, args.retencao_dias)
+    finally:
+        db.rollback()
+        _limpar(db, criadas, ids_logs)
+        db.close()
+
+    print(json.dumps({
+        "atos": args.atos,
+        "logs": args.logs,
+        "particoes": particoes,
+        "consultas": consultas,
+        "retencao": retencao,
+    }, indent=2, default=str))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Compara o Chromium com e sem o perfil enxuto (``app.rpa.perfil_navegador``)
+contra o SIJUT2 local, com os recursos estáticos atrasados
+(``--atraso-recursos``) para simular um site cujos CSS/imagens/fontes
+pesam mais que o HTML.
+
+Cada perfil roda em um subprocesso próprio (``RPA_PERFIL_ENXUTO``), com o
+navegador reaproveitado entre as repetições como no pool. Por perfil:
+latência por página (fetch medido pelo collector), tempo até a primeira
+página sem contar a abertura do navegador, tempo total e RSS do
+Chromium (chromedriver e todos os processos filhos, somados; páginas
+compartilhadas entre eles entram mais de uma vez), amostrado durante a
+coleta. ``mesmas_linhas`` confere que os seletores continuam lendo a
+mesma tabela nos dois perfis.
+
+Linux (lê ``/proc``). Uso (a partir de ``backend/``):
+
+    python -m app.benchmarks.bench_perfil_navegador --repeticoes 5 --atraso-recursos 0.3
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import threading
+
+from app.rpa.fixture_server import iniciar_servidor
+
+PERFIS = {"enxuto": "true", "padrao": "false"}
+
+
+def _descendentes(pid: int) -> list[int]:
+    filhos = {}
+
+    for entrada in os.listdir("/proc"):
+        if not entrada.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entrada}/stat") as arquivo:
+                # O nome do processo pode ter espaços: o ppid vem depois do ")"
+                ppid = int(arquivo.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        filhos.setdefault(ppid, []).append(int(entrada))
+
+    encontrados, pendentes = [], [pid]
+    while pendentes:
+        for filho in filhos.get(pendentes.pop(), []):
+            encontrados.append(filho)
+            pendentes.append(filho)
+
+    return encontrados
+
+
+def _rss_mb(pids: list[int]) -> float:
+    total_kb = 0
+
+    for pid in pids:
+        try:
+            with open(f"/proc/{pid}/status") as arquivo:
+                for linha in arquivo:
+                    if linha.startswith("VmRSS:"):
+                        total_kb += int(linha.split()[1])
+                        break
+        except OSError:
+            continue
+
+    return total_kb / 1024
+
+
+class _AmostradorRss(threading.Thread):
+    """Soma o RSS dos processos filhos (chromedriver + Chromium) a cada ``intervalo`` s."""
+
+    def __init__(self, intervalo: float = 0.05):
+        super().__init__(daemon=True)
+        self.intervalo = intervalo
+        self.pico = 0.0
+        self.ultimo = 0.0
+        self._parar = threading.Event()
+
+    def run(self):
+        while not self._parar.is_set():
+            self.ultimo = _rss_mb(_descendentes(os.getpid()))
+            self.pico = max(self.pico, self.ultimo)
+            self._parar.wait(self.intervalo)
+
+    def parar(self):
+        self._parar.set()
+        self.join()
+
+
+def _executar(url: str, repeticoes: int) -> dict:
+    # Imports aqui: o perfil é lido das settings, definidas pelo ambiente do subprocesso
+    from app.core.settings import settings
+    from app.rpa.driver_pool import driver_pool
+    from app.rpa.scraper_selenium import SeleniumCollector
+
+    amostrador = _AmostradorRss()
+    amostrador.start()
+
+    execucoes = []
+    linhas = 0
+
+    try:
+        for _ in range(repeticoes):
+            metricas = {}
+            linhas = sum(
+                len(pagina)
+                for pagina in SeleniumCollector(url=url).coletar_paginas(metricas=metricas)
+            )
+            execucoes.append(metricas)
+    finally:
+        amostrador.parar()
+        driver_pool.encerrar()
+
+    return {
+        "perfil": "enxuto" if settings.rpa_perfil_enxuto else "padrao",
+        "linhas": linhas,
+        "paginas": execucoes[-1]["paginas"],
+        "abertura_navegador_s": execucoes[0]["tempo_obter_driver"],
+        "fetch_por_pagina_ms": statistics.median(m["tempo_fetch"] / m["paginas"] for m in execucoes) * 1000,
+        "primeira_pagina_ms": statistics.median(
+            m["tempo_ate_primeira_linha"] - m["tempo_obter_driver"] for m in execucoes
+        ) * 1000,
+        "tempo_coleta_s": statistics.median(m["tempo_coleta"] for m in execucoes),
+        "rss_pico_mb": amostrador.pico,
+        "rss_final_mb": amostrador.ultimo,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--perfis", nargs="+", choices=list(PERFIS), default=list(PERFIS))
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--atraso-recursos", type=float, default=0.3)
+    parser.add_argument("--interno", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--url", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.interno:
+        print(json.dumps(_executar(args.url, args.repeticoes)))
+        return
+
+    servidor, url = iniciar_servidor(atraso_recursos=args.atraso_recursos)
+    resultados = []
+
+    try:
+        for perfil in args.perfis:
+            saida = subprocess.run(
+                [
+                    sys.executable, "-m", "app.benchmarks.bench_perfil_navegador",
+                    "--interno",
+                    "--url", url,
+                    "--repeticoes", str(args.repeticoes),
+                ],
+                env={**os.environ, "RPA_PERFIL_ENXUTO": PERFIS[perfil], "RPA_POOL_MIN": "0"},
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+            resultados.append(json.loads(saida.stdout.strip().splitlines()[-1]))
+    finally:
+        servidor.shutdown()
+
+    print(json.dumps({
+        "atraso_recursos_s": args.atraso_recursos,
+        "repeticoes": args.repeticoes,
+        "mesmas_linhas": len({resultado["linhas"] for resultado in resultados}) == 1,
+        "perfis": resultados,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
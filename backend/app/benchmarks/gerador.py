@@ -0,0 +1,246 @@
+"""
+Gerador de dados sintéticos para os benchmarks.
+
+Produz atos com a cara dos do SIJUT2: poucos órgãos e tipos concentrando
+a maior parte das publicações, ementas longas montadas a partir de
+frases reais de atos da Receita e datas espalhadas pelos últimos anos.
+A geração é determinística (``semente``), então duas rodadas sobre o
+mesmo banco medem exatamente os mesmos dados.
+
+Todo ato gerado tem ``numero_ato`` começando com ``MARCADOR``; é por ele
+que ``limpar`` encontra e remove os dados (mantendo o resumo diário do
+dashboard consistente), sem tocar nos atos reais.
+"""
+import random
+import uuid
+from collections import Counter
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import func, insert
+
+from app.models.ato import Ato
+from app.models.rpa_log import RpaLog
+from app.services.ato_service import salvar_lote_atos
+from app.services.resumo_service import aplicar_variacoes
+
+MARCADOR = "BENCH-"
+
+# (valor, peso): distribuição aproximada da base do SIJUT2
+ORGAOS = [
+    ("Coordenação-Geral de Tributação", 38),
+    ("Secretaria Especial da Receita Federal do Brasil", 24),
+    ("Coordenação-Geral de Administração Aduaneira", 6),
+    ("Superintendência Regional da Receita Federal do Brasil da 8ª Região Fiscal", 5),
+    ("Superintendência Regional da Receita Federal do Brasil da 7ª Região Fiscal", 4),
+    ("Superintendência Regional da Receita Federal do Brasil da 6ª Região Fiscal", 4),
+    ("Superintendência Regional da Receita Federal do Brasil da 10ª Região Fiscal", 3),
+    ("Delegacia da Receita Federal do Brasil em São Paulo", 3),
+    ("Delegacia Especial da Receita Federal do Brasil de Fiscalização", 2),
+    ("Coordenação-Geral de Cadastros", 2),
+    ("Coordenação-Geral de Arrecadação e Cobrança", 2),
+    ("Alfândega da Receita Federal do Brasil do Porto de Santos", 2),
+    ("Procuradoria-Geral da Fazenda Nacional", 2),
+    ("Ministério da Fazenda", 1),
+    ("Conselho Administrativo de Recursos Fiscais", 1),
+    ("Delegacia da Receita Federal do Brasil de Julgamento", 1),
+]
+
+TIPOS = [
+    ("Solução de Consulta COSIT", 30),
+    ("Ato Declaratório Executivo", 24),
+    ("Solução de Consulta DISIT/SRRF08", 6),
+    ("Solução de Consulta DISIT/SRRF07", 5),
+    ("Solução de Consulta DISIT/SRRF06", 4),
+    ("Instrução Normativa RFB", 8),
+    ("Portaria RFB", 7),
+    ("Ato Declaratório Interpretativo", 4),
+    ("Solução de Divergência COSIT", 3),
+    ("Parecer Normativo COSIT", 2),
+    ("Portaria Conjunta RFB/PGFN", 2),
+    ("Nota Executiva", 2),
+    ("Instrução Normativa Conjunta", 1),
+    ("Ato Declaratório COSIT", 1),
+    ("Despacho", 1),
+]
+
+ASSUNTOS = [
+    "Imposto sobre a Renda de Pessoa Jurídica - IRPJ.",
+    "Imposto sobre a Renda de Pessoa Física - IRPF.",
+    "Imposto sobre Produtos Industrializados - IPI.",
+    "Contribuição para o PIS/Pasep.",
+    "Contribuição para o Financiamento da Seguridade Social - Cofins.",
+    "Contribuição Social sobre o Lucro Líquido - CSLL.",
+    "Contribuições Sociais Previdenciárias.",
+    "Normas de Administração Tributária.",
+    "Normas Gerais de Direito Tributário.",
+    "Imposto sobre Operações de Crédito, Câmbio e Seguros - IOF.",
+    "Regimes Aduaneiros.",
+    "Simples Nacional.",
+]
+
+FRASES = [
+    "Dispõe sobre a apresentação da Escrituração Contábil Fiscal (ECF).",
+    "Regime de apuração não cumulativa. Créditos. Insumos. Conceito.",
+    "Lucro presumido. Receita bruta. Base de cálculo. Percentual aplicável.",
+    "Estabelece procedimentos para a habilitação ao regime especial.",
+    "Declara a inaptidão de inscrição no Cadastro Nacional da Pessoa Jurídica.",
+    "Altera a Instrução Normativa RFB nº 2.005, de 29 de janeiro de 2021.",
+    "Serviços hospitalares. Requisitos. Percentuais de presunção reduzidos.",
+    "Retenção na fonte. Pagamentos efetuados por órgãos públicos federais.",
+    "Ganho de capital. Alienação de participação societária. Custo de aquisição.",
+    "Drawback. Modalidade suspensão. Comprovação do adimplemento do compromisso de exportar.",
+    "Importação por conta e ordem de terceiros. Responsabilidade solidária.",
+    "Crédito presumido. Atividade agroindustrial. Vedação de ressarcimento.",
+    "Incorporação imobiliária. Regime especial de tributação. Pagamento unificado.",
+    "Subvenção para investimento. Exclusão da base de cálculo. Requisitos.",
+    "Compensação. Declaração de compensação. Crédito decorrente de decisão judicial transitada em julgado.",
+    "Alíquota zero. Produtos hortícolas e frutas. Classificação fiscal na TIPI.",
+    "Dispensa de retenção. Entidades imunes e isentas. Declaração do beneficiário.",
+    "Desoneração da folha de pagamento. Contribuição previdenciária sobre a receita bruta.",
+    "Ineficácia parcial da consulta. Matéria disciplinada em ato normativo publicado.",
+    "Juros sobre capital próprio. Dedutibilidade. Limites e condições.",
+]
+
+STATUS_LOGS = [("SUCESSO", 85), ("ERRO", 10), ("PARCIAL", 5)]
+
+
+def _escolhas(gerador: random.Random, opcoes: list[tuple[str, int]], quantidade: int) -> list[str]:
+    valores, pesos = zip(*opcoes)
+    return gerador.choices(valores, weights=pesos, k=quantidade)
+
+
+def _ementa(gerador: random.Random) -> str:
+    # 3 a 8 frases após o assunto: de ~250 a ~700 caracteres, como na base real
+    return " ".join([gerador.choice(ASSUNTOS), *gerador.sample(FRASES, gerador.randint(3, 8))])
+
+
+def gerar_atos(
+    linhas: int,
+    prefixo: str = "",
+    inicio: int = 0,
+    dias: int = 3650,
+    semente: int = 42,
+) -> list[dict]:
+    """
+    Atos no formato de ``salvar_lote_atos``, numerados de ``inicio`` a
+    ``inicio + linhas``. Publicações distribuídas nos últimos ``dias``,
+    com mais atos nos dias úteis recentes.
+    """
+    gerador = random.Random(f"{semente}-{prefixo}-{inicio}")
+    hoje = date.today()
+    orgaos = _escolhas(gerador, ORGAOS, linhas)
+    tipos = _escolhas(gerador, TIPOS, linhas)
+
+    atos = []
+    for i in range(linhas):
+        # Triangular: a base cresce com o tempo, há mais atos recentes
+        publicacao = hoje - timedelta(days=int(gerador.triangular(0, dias, 0)))
+        if publicacao.weekday() >= 5:
+            publicacao -= timedelta(days=publicacao.weekday() - 4)
+
+        atos.append({
+            "tipo_ato": tipos[i],
+            "numero_ato": f"{MARCADOR}{prefixo}{inicio + i}",
+            "orgao_unidade": orgaos[i],
+            "publicacao": publicacao,
+            "ementa": _ementa(gerador),
+        })
+
+    return atos
+
+
+def gerar_paginas(linhas: int, prefixo: str = "", por_pagina: int = 50, semente: int = 42):
+    """Os mesmos atos no formato bruto do scraper, em páginas de ``por_pagina``."""
+    pagina = []
+
+    for ato in gerar_atos(linhas, prefixo, dias=30, semente=semente):
+        pagina.append({
+            "tipo_ato": ato["tipo_ato"],
+            "numero": ato["numero_ato"],
+            "orgao": ato["orgao_unidade"],
+            "data_publicacao": ato["publicacao"].strftime("%d/%m/%Y"),
+            "ementa": ato["ementa"],
+        })
+
+        if len(pagina) == por_pagina:
+            yield pagina
+            pagina = []
+
+    if pagina:
+        yield pagina
+
+
+def popular(db, de: int, ate: int, prefixo: str = "", semente: int = 42, bloco: int = 100_000) -> int:
+    """
+    Completa a base sintética de ``de`` até ``ate`` atos via COPY, em
+    blocos, para tamanhos crescentes reaproveitarem o que já foi gravado.
+    """
+    inseridos = 0
+    for inicio in range(de, ate, bloco):
+        resposta = salvar_lote_atos(
+            db,
+            gerar_atos(min(bloco, ate - inicio), prefixo, inicio, semente=semente),
+            metodo="copy",
+            registrar_log=False,
+        )
+        inseridos += resposta["total_registros"]
+    return inseridos
+
+
+def limpar(db, prefixo: str = "") -> int:
+    """Remove os atos sintéticos descontando-os do resumo diário."""
+    filtro = Ato.numero_ato.like(f"{MARCADOR}{prefixo}%")
+
+    contagens = (
+        db.query(Ato.publicacao, Ato.orgao_unidade, Ato.tipo_ato, func.count(Ato.id))
+        .filter(filtro, Ato.deleted_at.is_(None))
+        .group_by(Ato.publicacao, Ato.orgao_unidade, Ato.tipo_ato)
+        .all()
+    )
+    aplicar_variacoes(db, Counter({
+        (publicacao, orgao, tipo): -quantidade
+        for publicacao, orgao, tipo, quantidade in contagens
+    }))
+
+    removidos = db.query(Ato).filter(filtro).delete(synchronize_session=False)
+    db.commit()
+    return removidos
+
+
+def popular_logs(db, quantidade: int, dias: int = 365, semente: int = 42) -> list[uuid.UUID]:
+    """
+    Logs de execução sintéticos espalhados pelos últimos ``dias``.
+    Devolve os ids, usados por ``limpar_logs``.
+    """
+    gerador = random.Random(semente)
+    agora = datetime.utcnow()
+    status = _escolhas(gerador, STATUS_LOGS, quantidade)
+
+    logs = []
+    for i in range(quantidade):
+        vistas = gerador.randint(0, 5_000)
+        inseridas = gerador.randint(0, vistas)
+        fetch, parse, insercao = (gerador.uniform(0.5, 60) for _ in range(3))
+        logs.append({
+            "id": uuid.uuid4(),
+            "execution_date": agora - timedelta(seconds=gerador.uniform(0, dias * 86_400)),
+            "total_registros": inseridas,
+            "status": status[i],
+            "error_message": "Timeout ao aguardar a tabela de resultados" if status[i] == "ERRO" else None,
+            "execution_time": fetch + parse + insercao,
+            "etapas": {"fetch": fetch, "parse": parse, "insercao": insercao, "total": fetch + parse + insercao},
+            "linhas_vistas": vistas,
+            "linhas_duplicadas": vistas - inseridas,
+        })
+
+    for inicio in range(0, quantidade, 10_000):
+        db.execute(insert(RpaLog), logs[inicio:inicio + 10_000])
+    db.commit()
+
+    return [log["id"] for log in logs]
+
+
+def limpar_logs(db, ids: list[uuid.UUID]):
+    for inicio in range(0, len(ids), 10_000):
+        db.query(RpaLog).filter(RpaLog.id.in_(ids[inicio:inicio + 10_000])).delete(synchronize_session=False)
+    db.commit()
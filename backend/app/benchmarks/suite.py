@@ -0,0 +1,249 @@
+"""
+Suíte de benchmarks dos caminhos quentes da API e do RPA, comparada com
+uma linha de base gravada.
+
+Popula o Postgres local com dados do ``gerador`` e mede, em processo:
+
+- ``insercao``: ``salvar_lote_atos`` com INSERT em chunks de tamanhos
+  diferentes e com COPY;
+- ``atos``: primeira página de ``GET /atos`` sem busca, com período e com
+  ``search`` em cada modo;
+- ``dashboard``: ``/atos/dashboard`` no período todo e no último ano;
+- ``logs``: paginação de ``/rpa/logs`` (primeira página, página
+  profunda e filtro por status);
+- ``parser``: extração das páginas salvas do SIJUT2
+  (``app/rpa/fixtures/sijut2``) e montagem da consulta, sem navegador.
+
+Cada métrica é a mediana em milissegundos (menor é melhor). Com a linha
+de base (``--baseline``), métricas acima de ``1 + tolerancia`` vezes o
+valor gravado (e mais de ``--minimo-ms`` acima dele) são reportadas como
+regressão e o processo sai com código 1. Os números só são comparáveis na mesma máquina e com os mesmos
+parâmetros; grave uma nova base com ``--gravar-baseline`` ao trocar de
+ambiente.
+
+Os dados sintéticos são removidos ao final. Rode apenas em bancos de
+desenvolvimento.
+
+Uso (a partir de ``backend/``):
+
+    python -m app.benchmarks.suite
+    python -m app.benchmarks.suite --casos atos dashboard --tolerancia 0.3
+    python -m app.benchmarks.suite --gravar-baseline
+"""
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from sqlalchemy import text
+
+from app.benchmarks import gerador
+from app.database.session import SessionLocal
+from app.routers.atos import _listar_atos
+from app.routers.rpa import list_rpa_logs
+from app.rpa.parser import montar_consulta, parse_tabela_atos
+from app.services.ato_service import salvar_lote_atos
+from app.services.resumo_service import resumo_dashboard
+
+BASELINE = Path(__file__).resolve().parent / "baseline.json"
+FIXTURES = Path(__file__).resolve().parent.parent / "rpa" / "fixtures" / "sijut2"
+
+TERMOS = ["escrituração contábil", "lucro presumido", "insumos", f"{gerador.MARCADOR}12345"]
+
+
+def _mediana_ms(funcao, repeticoes: int) -> float:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos) * 1000
+
+
+def caso_insercao(db, args) -> dict:
+    atos = gerador.gerar_atos(args.lote, prefixo="LOTE-")
+    metricas = {}
+
+    variantes = [(f"insercao_insert_chunk_{chunk}_ms", "insert", chunk) for chunk in args.chunks]
+    variantes.append(("insercao_copy_ms", "copy", 500))
+
+    for nome, metodo, chunk in variantes:
+        tempos = []
+        for _ in range(args.repeticoes_insercao):
+            gerador.limpar(db, "LOTE-")
+            inicio = time.perf_counter()
+            salvar_lote_atos(db, atos, chunk_size=chunk, metodo=metodo, registrar_log=False)
+            tempos.append(time.perf_counter() - inicio)
+        metricas[nome] = statistics.median(tempos) * 1000
+
+    gerador.limpar(db, "LOTE-")
+    return metricas
+
+
+def caso_atos(db, args) -> dict:
+    ano = (date.today() - timedelta(days=365), date.today())
+    metricas = {
+        "atos_sem_busca_ms": _mediana_ms(
+            lambda: _listar_atos(db, None, None, None, "fts", 100, None), args.repeticoes
+        ),
+        "atos_periodo_1_ano_ms": _mediana_ms(
+            lambda: _listar_atos(db, *ano, None, "fts", 100, None), args.repeticoes
+        ),
+    }
+
+    for modo in ("fts", "ranking", "ilike"):
+        metricas[f"atos_busca_{modo}_ms"] = statistics.median(
+            _mediana_ms(lambda: _listar_atos(db, None, None, termo, modo, 100, None), args.repeticoes)
+            for termo in TERMOS
+        )
+
+    return metricas
+
+
+def caso_dashboard(db, args) -> dict:
+    ano = (date.today() - timedelta(days=365), date.today())
+    return {
+        "dashboard_total_ms": _mediana_ms(lambda: resumo_dashboard(db, None, None), args.repeticoes),
+        "dashboard_1_ano_ms": _mediana_ms(lambda: resumo_dashboard(db, *ano), args.repeticoes),
+    }
+
+
+def caso_logs(db, args) -> dict:
+    def pagina(page: int, status: str | None = None):
+        return list_rpa_logs(
+            page=page, size=20, status=status, data_inicio=None, data_fim=None, db=db, user="benchmark"
+        )
+
+    ultima = max(1, args.logs // 20)
+    return {
+        "logs_primeira_pagina_ms": _mediana_ms(lambda: pagina(1), args.repeticoes),
+        "logs_pagina_profunda_ms": _mediana_ms(lambda: pagina(ultima), args.repeticoes),
+        "logs_filtro_status_ms": _mediana_ms(lambda: pagina(1, "ERRO"), args.repeticoes),
+    }
+
+
+def caso_parser(db, args) -> dict:
+    paginas = [p.read_text(encoding="utf-8") for p in sorted(FIXTURES.glob("resultado_p*.html"))]
+    consulta = (FIXTURES / "consulta.html").read_text(encoding="utf-8")
+
+    return {
+        "parser_pagina_ms": statistics.median(
+            _mediana_ms(lambda: parse_tabela_atos(html), args.repeticoes * 10) for html in paginas
+        ),
+        "parser_consulta_ms": _mediana_ms(
+            lambda: montar_consulta(consulta, "http://localhost/", "01/01/2025", "31/01/2025"),
+            args.repeticoes * 10,
+        ),
+    }
+
+
+CASOS = {
+    "insercao": caso_insercao,
+    "atos": caso_atos,
+    "dashboard": caso_dashboard,
+    "logs": caso_logs,
+    "parser": caso_parser,
+}
+
+# Casos que leem a base sintética de atos / de logs
+PRECISAM_ATOS = {"atos", "dashboard"}
+PRECISAM_LOGS = {"logs"}
+
+
+def comparar(metricas: dict, baseline: dict, tolerancia: float, minimo_ms: float) -> list[dict]:
+    comparacao = []
+    for nome, valor in sorted(metricas.items()):
+        base = baseline.get(nome)
+        if not base:
+            continue
+
+        razao = valor / base
+        comparacao.append({
+            "metrica": nome,
+            "baseline_ms": base,
+            "atual_ms": valor,
+            "razao": round(razao, 3),
+            # Diferenças abaixo de minimo_ms são ruído de medição
+            "regressao": razao > 1 + tolerancia and valor - base > minimo_ms,
+        })
+    return comparacao
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--casos", nargs="+", choices=list(CASOS), default=list(CASOS))
+    parser.add_argument("--linhas", type=int, default=100_000, help="Atos sintéticos na base")
+    parser.add_argument("--logs", type=int, default=20_000, help="Logs de execução sintéticos")
+    parser.add_argument("--lote", type=int, default=10_000, help="Atos por rodada de inserção")
+    parser.add_argument("--chunks", nargs="+", type=int, default=[100, 500, 2_000, 5_000])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--repeticoes-insercao", type=int, default=3)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--tolerancia", type=float, default=0.25)
+    parser.add_argument("--minimo-ms", type=float, default=1.0)
+    parser.add_argument("--gravar-baseline", action="store_true")
+    args = parser.parse_args()
+
+    parametros = {
+        "linhas": args.linhas,
+        "logs": args.logs,
+        "lote": args.lote,
+        "chunks": args.chunks,
+        "repeticoes": args.repeticoes,
+    }
+
+    metricas = {}
+    logs = []
+    db = SessionLocal()
+
+    try:
+        if PRECISAM_ATOS & set(args.casos):
+            gerador.popular(db, 0, args.linhas)
+            db.execute(text("ANALYZE atos"))
+            db.commit()
+
+        if PRECISAM_LOGS & set(args.casos):
+            logs = gerador.popular_logs(db, args.logs)
+            db.execute(text("ANALYZE rpa_logs"))
+            db.commit()
+
+        for caso in args.casos:
+            metricas.update(CASOS[caso](db, args))
+    finally:
+        db.rollback()
+        gerador.limpar(db)
+        gerador.limpar_logs(db, logs)
+        db.close()
+
+    saida = {
+        "data": date.today().isoformat(),
+        "python": platform.python_version(),
+        "parametros": parametros,
+        "metricas": metricas,
+    }
+
+    if args.gravar_baseline:
+        args.baseline.write_text(json.dumps(saida, indent=2) + "\n", encoding="utf-8")
+
+    elif args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        saida["comparacao"] = comparar(
+            metricas, baseline["metricas"], args.tolerancia, args.minimo_ms
+        )
+        saida["regressoes"] = [c["metrica"] for c in saida["comparacao"] if c["regressao"]]
+
+        if baseline.get("parametros") != parametros:
+            saida["aviso"] = "Parâmetros diferentes dos da linha de base: comparação apenas indicativa"
+
+    print(json.dumps(saida, indent=2, ensure_ascii=False))
+
+    if saida.get("regressoes"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Comandos de manutenção.
+
+Uso (a partir de ``backend/``):
+
+    python -m app.cli resumo reconstruir
+    python -m app.cli resumo verificar
+    python -m app.cli migracoes aplicar
+    python -m app.cli migracoes atual
+    python -m app.cli migracoes criar "descrição da mudança"
+    python -m app.cli migracoes sql
+    python -m app.cli indices verificar
+    python -m app.cli particoes manter
+    python -m app.cli particoes listar
+"""
+import argparse
+import json
+import sys
+
+from alembic import command
+
+from app.core.cache import response_cache
+from app.database import migracoes
+from app.database.session import SessionLocal, engine
+from app.services import indices_service, particoes_service, resumo_service
+
+
+def _resumo(args) -> int:
+    db = SessionLocal()
+    try:
+        if args.acao == "reconstruir":
+            total = resumo_service.reconstruir(db)
+            # Só alcança a API quando o cache é compartilhado (CACHE_BACKEND=redis)
+            response_cache.invalidar()
+            print(f"Resumo reconstruído: {total} linhas")
+            return 0
+
+        divergencias = resumo_service.verificar(db)
+        print(json.dumps(divergencias, indent=2, default=str))
+        print(f"{len(divergencias)} divergência(s)")
+        return 1 if divergencias else 0
+    finally:
+        db.close()
+
+
+def _migracoes(args) -> int:
+    if args.acao == "aplicar":
+        migracoes.aplicar_migracoes(engine, args.revisao)
+        return 0
+
+    if args.acao == "sql":
+        # Modo offline: imprime o SQL sem tocar no banco
+        command.upgrade(migracoes.configuracao(), args.revisao, sql=True)
+        return 0
+
+    if args.acao == "historico":
+        command.history(migracoes.configuracao(), verbose=True)
+        return 0
+
+    with engine.connect() as conexao:
+        config = migracoes.configuracao(conexao)
+
+        if args.acao == "atual":
+            command.current(config, verbose=True)
+            return 0
+
+        if not args.mensagem:
+            print("Informe a descrição da revisão")
+            return 1
+
+        # Compara os modelos com o banco (que deve estar na última revisão)
+        command.revision(
+            config,
+            message=args.mensagem,
+            autogenerate=True,
+            rev_id=migracoes.proxima_revisao(),
+        )
+        return 0
+
+
+def _indices(args) -> int:
+    db = SessionLocal()
+    try:
+        resultados = indices_service.verificar_indices(db, planejador_real=args.planejador_real)
+    finally:
+        db.close()
+
+    print(json.dumps(resultados, indent=2))
+    falhas = [r["consulta"] for r in resultados if not r["ok"]]
+    print(f"{len(falhas)} consulta(s) sem o índice esperado")
+    return 1 if falhas else 0
+
+
+def _particoes(args) -> int:
+    db = SessionLocal()
+    try:
+        if args.acao == "manter":
+            resultado = particoes_service.manter(db)
+        else:
+            resultado = {tabela: particoes_service.listar(db, tabela) for tabela in particoes_service.TABELAS}
+    finally:
+        db.close()
+
+    print(json.dumps(resultado, indent=2))
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    comandos = parser.add_subparsers(dest="comando", required=True)
+
+    resumo = comandos.add_parser("resumo", help="Resumo diário usado pelo dashboard")
+    resumo.add_argument("acao", choices=["reconstruir", "verificar"])
+    resumo.set_defaults(executar=_resumo)
+
+    migracao = comandos.add_parser("migracoes", help="Migrações do esquema (Alembic)")
+    migracao.add_argument("acao", choices=["aplicar", "atual", "historico", "criar", "sql"])
+    migracao.add_argument("mensagem", nargs="?", help="Descrição da revisão (criar)")
+    migracao.add_argument("--revisao", default="head")
+    migracao.set_defaults(executar=_migracoes)
+
+    indices = comandos.add_parser("indices", help="Confere via EXPLAIN o uso dos índices")
+    indices.add_argument("acao", choices=["verificar"])
+    indices.add_argument(
+        "--planejador-real",
+        action="store_true",
+        help="Não desliga a varredura sequencial (plano real da base atual)",
+    )
+    indices.set_defaults(executar=_indices)
+
+    particoes = comandos.add_parser("particoes", help="Partições mensais de atos e rpa_logs")
+    particoes.add_argument("acao", choices=["manter", "listar"])
+    particoes.set_defaults(executar=_particoes)
+
+    args = parser.parse_args(argv)
+    return args.executar(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,222 @@
+import hashlib
+import json
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.settings import settings
+
+
+class CacheBackend(ABC):
+    """Operações mínimas do cache, no mesmo formato de um cliente Redis."""
+
+    # Operações com I/O de rede: as rotas async as chamam no threadpool
+    bloqueante = False
+
+    @abstractmethod
+    def get(self, chave: str) -> bytes | None:
+        ...
+
+    @abstractmethod
+    def set(self, chave: str, valor: bytes, ex: int | None = None):
+        ...
+
+    @abstractmethod
+    def incr(self, chave: str) -> int:
+        ...
+
+
+class MemoriaCache(CacheBackend):
+    """Cache no próprio processo, com TTL por entrada e descarte LRU."""
+
+    def __init__(self, max_itens: int):
+        self.max_itens = max_itens
+        self._itens = OrderedDict()
+        # Contadores (versão dos dados) ficam fora do LRU para nunca serem descartados
+        self._contadores = {}
+        self._lock = threading.Lock()
+
+    def get(self, chave):
+        with self._lock:
+            if chave in self._contadores:
+                return str(self._contadores[chave]).encode()
+
+            item = self._itens.get(chave)
+            if item is None:
+                return None
+
+            valor, expira_em = item
+            if expira_em is not None and expira_em <= time.monotonic():
+                del self._itens[chave]
+                return None
+
+            self._itens.move_to_end(chave)
+            return valor
+
+    def set(self, chave, valor, ex=None):
+        expira_em = time.monotonic() + ex if ex else None
+        with self._lock:
+            self._itens[chave] = (valor, expira_em)
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.max_itens:
+                self._itens.popitem(last=False)
+
+    def incr(self, chave):
+        with self._lock:
+            self._contadores[chave] = self._contadores.get(chave, 0) + 1
+            return self._contadores[chave]
+
+
+class RedisCache(CacheBackend):
+    """
+    Adapta qualquer cliente com a API do Redis (``redis.Redis``,
+    ``fakeredis.FakeRedis``...). Compartilha cache e versão entre workers.
+    """
+
+    bloqueante = True
+
+    def __init__(self, cliente):
+        self.cliente = cliente
+
+    def get(self, chave):
+        return self.cliente.get(chave)
+
+    def set(self, chave, valor, ex=None):
+        self.cliente.set(chave, valor, ex=ex)
+
+    def incr(self, chave):
+        return self.cliente.incr(chave)
+
+
+CHAVE_VERSAO = "atos:versao"
+CHAVE_ESCRITA_RECENTE = "atos:escrita_recente"
+
+
+class ResponseCache:
+    """
+    Cache das respostas de leitura de atos.
+
+    As chaves incluem a versão atual dos dados; toda escrita em atos
+    chama ``invalidar``, que só incrementa a versão, e as entradas
+    antigas deixam de ser alcançadas até expirarem ou saírem pelo LRU.
+
+    Com réplica de leitura, ``invalidar`` também marca uma escrita recente
+    por ``janela_primario`` segundos (no backend, visível a todos os
+    workers). Enquanto a marca existe, as leituras vão ao primário
+    (``database.deps``) e nada é guardado: uma leitura que já tinha
+    começado na réplica não fica no cache com a versão nova.
+    """
+
+    def __init__(self, backend: CacheBackend | None, ttl: int, janela_primario: int = 0):
+        self.backend = backend
+        self.ttl = ttl
+        self.janela_primario = janela_primario
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def ativo(self) -> bool:
+        return self.backend is not None
+
+    def versao(self) -> int:
+        valor = self.backend.get(CHAVE_VERSAO) if self.ativo else None
+        return int(valor) if valor else 0
+
+    def chave(self, rota: str, params: dict) -> str:
+        normalizados = sorted(
+            (nome, str(valor)) for nome, valor in params.items() if valor is not None
+        )
+        return f"atos:{self.versao()}:{rota}:{json.dumps(normalizados)}"
+
+    def obter(self, chave: str) -> dict | None:
+        if not self.ativo:
+            return None
+
+        valor = self.backend.get(chave)
+
+        if valor is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return json.loads(valor)
+
+    def guardar(self, chave: str, corpo: bytes, headers: dict) -> dict:
+        entrada = {
+            "corpo": corpo.decode("utf-8"),
+            "headers": headers,
+            "etag": f'"{hashlib.sha1(corpo).hexdigest()}"',
+        }
+        if self.ativo and not self.escrita_recente():
+            self.backend.set(chave, json.dumps(entrada).encode("utf-8"), ex=self.ttl)
+        return entrada
+
+    def escrita_recente(self) -> bool:
+        """Houve escrita em atos há menos de ``janela_primario`` segundos."""
+        if not self.ativo or not self.janela_primario:
+            return False
+        return self.backend.get(CHAVE_ESCRITA_RECENTE) is not None
+
+    def invalidar(self):
+        if self.ativo:
+            self.backend.incr(CHAVE_VERSAO)
+            if self.janela_primario:
+                self.backend.set(CHAVE_ESCRITA_RECENTE, b"1", ex=self.janela_primario)
+
+    # Versões para as rotas async: com backend bloqueante (Redis síncrono),
+    # a chamada vai para o threadpool em vez de parar o event loop
+    async def _sem_bloquear(self, funcao, *args):
+        if self.ativo and self.backend.bloqueante:
+            return await run_in_threadpool(funcao, *args)
+        return funcao(*args)
+
+    async def chave_async(self, rota: str, params: dict) -> str:
+        return await self._sem_bloquear(self.chave, rota, params)
+
+    async def obter_async(self, chave: str) -> dict | None:
+        return await self._sem_bloquear(self.obter, chave)
+
+    async def guardar_async(self, chave: str, corpo: bytes, headers: dict) -> dict:
+        return await self._sem_bloquear(self.guardar, chave, corpo, headers)
+
+    async def escrita_recente_async(self) -> bool:
+        return await self._sem_bloquear(self.escrita_recente)
+
+    async def invalidar_async(self):
+        await self._sem_bloquear(self.invalidar)
+
+    def estatisticas(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": settings.cache_backend,
+            "versao": self.versao(),
+            "hits": self.hits,
+            "misses": self.misses,
+            "taxa_acerto": self.hits / total if total else 0.0,
+        }
+
+
+def _criar_backend() -> CacheBackend | None:
+    if settings.cache_backend == "desativado":
+        return None
+
+    if settings.cache_backend == "redis":
+        try:
+            import redis
+        except ImportError as exc:
+            raise RuntimeError("CACHE_BACKEND=redis requer o pacote 'redis' instalado") from exc
+
+        return RedisCache(redis.Redis.from_url(settings.redis_url))
+
+    return MemoriaCache(settings.cache_max_itens)
+
+
+response_cache = ResponseCache(
+    _criar_backend(),
+    settings.cache_ttl_segundos,
+    # Sem réplica, as leituras já são do primário
+    settings.database_read_janela_segundos if settings.database_read_url else 0,
+)
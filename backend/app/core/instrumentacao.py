@@ -0,0 +1,82 @@
+"""
+Instrumentação da API exportada em ``GET /metrics``: latência das
+requisições por rota (middleware ASGI) e tempo de cada comando SQL
+(eventos do SQLAlchemy, valem para todos os engines, inclusive asyncpg).
+"""
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.metrics import registro
+
+LATENCIA_HTTP = registro.histograma(
+    "http_requisicao_segundos",
+    "Latência das requisições por método, rota e status",
+)
+
+TEMPO_SQL = registro.histograma(
+    "db_comando_segundos",
+    "Tempo de execução dos comandos SQL por operação",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+OPERACOES_SQL = {"SELECT", "INSERT", "UPDATE", "DELETE", "WITH", "COPY", "CREATE", "ALTER", "DROP"}
+
+
+class MetricasHttpMiddleware:
+    """
+    Mede cada requisição HTTP. A rota é o template do FastAPI
+    (``/atos/{ato_id}``), não o caminho real, para não explodir o número
+    de séries.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        inicio = time.perf_counter()
+        status = 500
+
+        async def _send(mensagem):
+            nonlocal status
+            if mensagem["type"] == "http.response.start":
+                status = mensagem["status"]
+            await send(mensagem)
+
+        try:
+            await self.app(scope, receive, _send)
+        finally:
+            rota = scope.get("route")
+            LATENCIA_HTTP.observe(
+                time.perf_counter() - inicio,
+                metodo=scope["method"],
+                rota=getattr(rota, "path", "nao_encontrada"),
+                status=status,
+            )
+
+
+def _operacao(statement: str) -> str:
+    palavra = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return palavra if palavra in OPERACOES_SQL else "OUTRO"
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _antes_sql(conn, cursor, statement, parameters, context, executemany):
+    # Sem contexto de execução (SQL interno do dialeto, por exemplo): não medido
+    if context is None:
+        return
+    context._inicio_metricas = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _depois_sql(conn, cursor, statement, parameters, context, executemany):
+    if context is None:
+        return
+    inicio = getattr(context, "_inicio_metricas", None)
+    if inicio is not None:
+        TEMPO_SQL.observe(time.perf_counter() - inicio, operacao=_operacao(statement))
@@ -0,0 +1,162 @@
+"""
+Registro de métricas do processo, exportado em ``GET /metrics`` no
+formato texto do Prometheus.
+
+Sem dependências externas: contadores, medidores e histogramas simples,
+com rótulos, protegidos por lock. Medidores podem ser calculados na hora
+da leitura (``funcao``), como o uso dos pools de conexão.
+"""
+import math
+import threading
+from collections.abc import Callable
+
+
+def _rotulos(valores: dict) -> tuple:
+    return tuple(sorted((nome, str(valor)) for nome, valor in valores.items()))
+
+
+def _escapar(valor: str) -> str:
+    return valor.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _formatar_rotulos(rotulos: tuple, extra: tuple = ()) -> str:
+    pares = rotulos + extra
+    if not pares:
+        return ""
+
+    return "{" + ",".join(f'{nome}="{_escapar(valor)}"' for nome, valor in pares) + "}"
+
+
+def _formatar_valor(valor: float) -> str:
+    if valor == math.inf:
+        return "+Inf"
+    return repr(float(valor))
+
+
+class _Metrica:
+    tipo: str
+
+    def __init__(self, nome: str, ajuda: str):
+        self.nome = nome
+        self.ajuda = ajuda
+        self._valores = {}
+        self._lock = threading.Lock()
+
+    def _linhas(self) -> list[str]:
+        with self._lock:
+            return [
+                f"{self.nome}{_formatar_rotulos(rotulos)} {_formatar_valor(valor)}"
+                for rotulos, valor in sorted(self._valores.items())
+            ]
+
+    def exportar(self) -> str:
+        return "\n".join([
+            f"# HELP {self.nome} {self.ajuda}",
+            f"# TYPE {self.nome} {self.tipo}",
+            *self._linhas(),
+        ])
+
+
+class Contador(_Metrica):
+    tipo = "counter"
+
+    def inc(self, valor: float = 1, **rotulos):
+        chave = _rotulos(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+
+class Medidor(_Metrica):
+    tipo = "gauge"
+
+    def __init__(self, nome: str, ajuda: str, funcao: Callable[[], list[tuple[dict, float]]] | None = None):
+        super().__init__(nome, ajuda)
+        self.funcao = funcao
+
+    def set(self, valor: float, **rotulos):
+        with self._lock:
+            self._valores[_rotulos(rotulos)] = valor
+
+    def inc(self, valor: float = 1, **rotulos):
+        chave = _rotulos(rotulos)
+        with self._lock:
+            self._valores[chave] = self._valores.get(chave, 0) + valor
+
+    def dec(self, valor: float = 1, **rotulos):
+        self.inc(-valor, **rotulos)
+
+    def _linhas(self) -> list[str]:
+        if self.funcao is not None:
+            try:
+                valores = {_rotulos(rotulos): valor for rotulos, valor in self.funcao()}
+            except Exception:
+                # Uma leitura que falha (banco fora, pool esgotado) não derruba
+                # o /metrics: o medidor repete os últimos valores lidos
+                ERROS_MEDIDORES.inc(metrica=self.nome)
+            else:
+                with self._lock:
+                    self._valores = valores
+        return super()._linhas()
+
+
+class Histograma(_Metrica):
+    tipo = "histogram"
+
+    BUCKETS_PADRAO = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, nome: str, ajuda: str, buckets: tuple[float, ...] = BUCKETS_PADRAO):
+        super().__init__(nome, ajuda)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, valor: float, **rotulos):
+        chave = _rotulos(rotulos)
+        with self._lock:
+            contagens, soma = self._valores.get(chave, ([0] * len(self.buckets), 0.0))
+            for i, limite in enumerate(self.buckets):
+                if valor <= limite:
+                    contagens[i] += 1
+            self._valores[chave] = (contagens, soma + valor)
+
+    def _linhas(self) -> list[str]:
+        linhas = []
+        with self._lock:
+            for rotulos, (contagens, soma) in sorted(self._valores.items()):
+                for limite, contagem in zip(self.buckets, contagens):
+                    le = (("le", _formatar_valor(limite)),)
+                    linhas.append(f"{self.nome}_bucket{_formatar_rotulos(rotulos, le)} {contagem}")
+                linhas.append(f"{self.nome}_sum{_formatar_rotulos(rotulos)} {_formatar_valor(soma)}")
+                linhas.append(f"{self.nome}_count{_formatar_rotulos(rotulos)} {contagens[-1]}")
+        return linhas
+
+
+class Registro:
+    def __init__(self):
+        self._metricas = {}
+        self._lock = threading.Lock()
+
+    def _registrar(self, classe, nome: str, *args, **kwargs):
+        with self._lock:
+            if nome not in self._metricas:
+                self._metricas[nome] = classe(nome, *args, **kwargs)
+            return self._metricas[nome]
+
+    def contador(self, nome: str, ajuda: str) -> Contador:
+        return self._registrar(Contador, nome, ajuda)
+
+    def medidor(self, nome: str, ajuda: str, funcao=None) -> Medidor:
+        return self._registrar(Medidor, nome, ajuda, funcao)
+
+    def histograma(self, nome: str, ajuda: str, buckets=Histograma.BUCKETS_PADRAO) -> Histograma:
+        return self._registrar(Histograma, nome, ajuda, buckets)
+
+    def exportar(self) -> str:
+        with self._lock:
+            metricas = list(self._metricas.values())
+        return "\n".join(metrica.exportar() for metrica in metricas) + "\n"
+
+
+registro = Registro()
+
+ERROS_MEDIDORES = registro.contador(
+    "metricas_medidor_erros_total", "Falhas ao calcular um medidor na leitura, por métrica"
+)
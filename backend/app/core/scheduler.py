@@ -1,3 +1,149 @@
+import threading
+
+from apscheduler.events import (
+    EVENT_JOB_ERROR,
+    EVENT_JOB_EXECUTED,
+    EVENT_JOB_MAX_INSTANCES,
+    EVENT_JOB_MISSED,
+)
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
 from apscheduler.schedulers.background import BackgroundScheduler
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import NullPool
+
+from app.core.metrics import registro
+from app.core.settings import settings
+from app.database.session import engine
+
+# Jobs persistidos no próprio banco (tabela apscheduler_jobs): sobrevivem a
+# reinícios e são vistos por todos os workers/réplicas.
+# coalesce + max_instances=1: disparos atrasados viram um só e uma execução
+# lenta nunca é sobreposta pela seguinte.
+scheduler = BackgroundScheduler(
+    jobstores={"default": SQLAlchemyJobStore(engine=engine)},
+    job_defaults={
+        "coalesce": True,
+        "max_instances": 1,
+        "misfire_grace_time": settings.scheduler_misfire_segundos,
+    },
+)
+
+DISPAROS = registro.contador(
+    "scheduler_jobs_total",
+    "Disparos do scheduler: executado, erro, perdido (misfire) ou ignorado (já em execução)",
+)
+
+_EVENTOS = {
+    EVENT_JOB_EXECUTED: "executado",
+    EVENT_JOB_ERROR: "erro",
+    EVENT_JOB_MISSED: "perdido",
+    EVENT_JOB_MAX_INSTANCES: "ignorado",
+}
+
+
+def _registrar_disparo(evento):
+    DISPAROS.inc(resultado=_EVENTOS[evento.code])
+
+
+scheduler.add_listener(_registrar_disparo, sum(_EVENTOS))
+
+# Chave do advisory lock que elege o processo que dispara os jobs
+CHAVE_LIDER = 0x52504153
+
+
+class EleicaoLider:
+    """
+    Mantém o scheduler disparando em um único processo.
+
+    Todos os processos iniciam o scheduler pausado (podem criar, listar e
+    remover jobs no job store). Uma thread tenta
+    ``pg_try_advisory_lock`` numa conexão dedicada; quem obtém o lock
+    retoma o scheduler e o mantém enquanto a conexão estiver viva. Se a
+    conexão cair, o Postgres libera o lock e outro processo assume.
+
+    O líder chama ``wakeup`` a cada verificação para enxergar jobs criados
+    por outros processos.
+    """
+
+    def __init__(self, scheduler, database_url: str, chave: int, intervalo: float):
+        self.scheduler = scheduler
+        self.chave = chave
+        self.intervalo = intervalo
+        self.lider = False
+        # Fora do pool da API e em autocommit: a conexão fica aberta, mas
+        # nunca "idle in transaction"
+        self._engine = create_engine(
+            database_url, poolclass=NullPool, isolation_level="AUTOCOMMIT"
+        )
+        self._conexao = None
+        self._parar = threading.Event()
+        self._thread = None
+
+    def _suporta_lock(self) -> bool:
+        return self._engine.dialect.name == "postgresql"
+
+    def _tentar_assumir(self) -> bool:
+        if not self._suporta_lock():
+            return True
+
+        if self._conexao is None:
+            self._conexao = self._engine.connect()
+
+        return self._conexao.execute(
+            text("SELECT pg_try_advisory_lock(:chave)"), {"chave": self.chave}
+        ).scalar()
+
+    def _fechar_conexao(self):
+        if self._conexao is not None:
+            try:
+                self._conexao.close()
+            except Exception:
+                pass
+            self._conexao = None
+
+    def _verificar(self):
+        try:
+            if self.lider:
+                if self._conexao is not None:
+                    self._conexao.execute(text("SELECT 1"))
+                self.scheduler.wakeup()
+
+            elif self._tentar_assumir():
+                self.lider = True
+                self.scheduler.resume()
+                print("Scheduler: este processo assumiu os disparos")
+
+        except Exception as exc:
+            # Conexão perdida: o lock foi liberado junto com ela
+            if self.lider:
+                self.lider = False
+                self.scheduler.pause()
+                print(f"Scheduler: liderança perdida ({exc})")
+            self._fechar_conexao()
+
+    def _loop(self):
+        while not self._parar.is_set():
+            self._verificar()
+            self._parar.wait(self.intervalo)
+
+    def iniciar(self):
+        self.scheduler.start(paused=True)
+        self._thread = threading.Thread(target=self._loop, name="scheduler-lider", daemon=True)
+        self._thread.start()
+
+    def encerrar(self):
+        self._parar.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self.scheduler.shutdown(wait=False)
+        # Fechar a conexão libera o advisory lock para outro processo
+        self._fechar_conexao()
+        self._engine.dispose()
+
 
-scheduler = BackgroundScheduler()
\ No newline at end of file
+eleicao_lider = EleicaoLider(
+    scheduler,
+    settings.database_url,
+    CHAVE_LIDER,
+    settings.scheduler_lider_intervalo,
+)
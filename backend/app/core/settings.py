@@ -16,4 +16,105 @@ class Settings(BaseSettings):
     database_url: str
     api_base_url: str = "http://localhost:8000"
 
+    # Pool de conexões (vale para o engine principal, a réplica e o asyncpg)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: int = 30
+    db_pool_recycle: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 0  # 0 = sem limite
+    db_echo: bool = False
+
+    # Réplica de leitura opcional para GET /atos, /atos/dashboard, /atos/export e /rpa/logs
+    database_read_url: str | None = None
+    # Depois de uma escrita em atos, as rotas em cache leem do primário e
+    # não guardam respostas por estes segundos: a réplica atrasada poria no
+    # cache, com a versão nova, dados anteriores à escrita. Use um valor
+    # acima do atraso de replicação observado
+    database_read_janela_segundos: int = 5
+
+    # Rotas de atos e logs sobre AsyncSession (asyncpg) em vez do threadpool
+    db_async: bool = False
+
+    # Cache das leituras de atos: "memoria", "redis" ou "desativado".
+    # Com vários workers, use "redis" para compartilhar a invalidação.
+    cache_backend: str = "memoria"
+    cache_ttl_segundos: int = 300
+    cache_max_itens: int = 1024
+    redis_url: str = "redis://localhost:6379/0"
+
+    # Carga em lote: "copy" (COPY + staging, só Postgres) ou "insert" (INSERT em chunks)
+    ingest_metodo: str = "copy"
+
+    # Motor de coleta: "selenium" (Chromium headless) ou "http" (sem navegador)
+    rpa_engine: str = "selenium"
+    sijut2_url: str = "http://normas.receita.fazenda.gov.br/sijut2consulta/consulta.action"
+    rpa_http_timeout: int = 30
+
+    # Páginas de uma mesma consulta buscadas ao mesmo tempo, depois da
+    # primeira (1 = uma por vez). É por coleta: com janelas em paralelo,
+    # o site recebe até rpa_shard_workers x este valor de requisições
+    rpa_paginas_simultaneas: int = 1
+
+    # Pool de navegadores reaproveitados entre execuções
+    rpa_pool_min: int = 0
+    rpa_pool_max: int = 2
+    rpa_pool_max_usos: int = 20
+    rpa_pool_timeout: float = 300
+
+    # Perfil enxuto do Chromium: bloqueia os grupos de recursos listados
+    # (imagens, estilos, fontes, rastreadores), navega com pageLoadStrategy
+    # eager e consulta as esperas a cada rpa_wait_intervalo segundos
+    rpa_perfil_enxuto: bool = True
+    rpa_bloquear_recursos: list[str] = ["imagens", "estilos", "fontes", "rastreadores"]
+    rpa_wait_intervalo: float = 0.1
+
+    # Coleta de períodos longos em janelas paralelas
+    rpa_shard_dias: int = 7
+    rpa_shard_workers: int = 2
+    rpa_shard_timeout: float = 600
+    rpa_shard_tentativas: int = 2
+
+    # Falha no meio da paginação: novas tentativas a partir da última
+    # página lida, com espera dobrando de backoff até backoff_max segundos
+    rpa_retomada_tentativas: int = 3
+    rpa_retomada_backoff: float = 2
+    rpa_retomada_backoff_max: float = 60
+
+    # Ingestão em lotes enquanto a coleta continua. "direto" grava pelo
+    # serviço no próprio processo; "http" posta em /atos/batch (runner externo)
+    rpa_ingest_modo: str = "direto"
+    rpa_lote_tamanho: int = 500
+    rpa_fila_lotes: int = 4
+
+    # Coleta incremental a partir do último ato gravado
+    rpa_incremental: bool = True
+    rpa_checkpoint_overlap_dias: int = 1
+    rpa_parada_antecipada: bool = True
+
+    # Execuções em segundo plano (tabela rpa_execucoes, comum a todos os
+    # workers): quantas rodam ao mesmo tempo e quantas podem esperar na
+    # fila, somando todos os workers, e quantas ficam no histórico. Cada
+    # worker renova as suas a cada rpa_execucoes_heartbeat segundos; sem
+    # sinal por 4 intervalos, a execução é dada como abandonada
+    rpa_execucoes_simultaneas: int = 1
+    rpa_execucoes_fila: int = 5
+    rpa_execucoes_historico: int = 100
+    rpa_execucoes_heartbeat: float = 15
+
+    # Agendamentos: tolerância para disparos atrasados e intervalo da
+    # eleição do processo que dispara (advisory lock no Postgres)
+    scheduler_misfire_segundos: int = 300
+    scheduler_lider_intervalo: float = 15
+
+    # Partições mensais de atos e rpa_logs: criadas com esta antecedência
+    # pela manutenção diária (às particoes_manutencao_hora, UTC). Partições
+    # de rpa_logs mais antigas que a retenção são removidas (0 = mantém tudo)
+    particoes_meses_a_frente: int = 3
+    particoes_manutencao_hora: int = 3
+    rpa_logs_retencao_dias: int = 365
+
+    # "html" lê a tabela de uma vez pelo page source; "dom" percorre célula a célula
+    rpa_modo_parse: str = "html"
+
 settings = Settings()
@@ -0,0 +1,44 @@
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.settings import settings
+from app.database.pool import opcoes_engine, registrar_engine
+
+
+def url_async(url: str) -> str:
+    """Mesma DATABASE_URL, trocando o driver síncrono pelo asyncpg."""
+    return (
+        make_url(url)
+        .set(drivername="postgresql+asyncpg")
+        .render_as_string(hide_password=False)
+    )
+
+
+def _criar_engine(url: str, nome: str):
+    url = url_async(url)
+    engine = create_async_engine(url, **opcoes_engine(url, nome, AsyncAdaptedQueuePool))
+    registrar_engine(nome, engine)
+    return engine
+
+
+async_engine = _criar_engine(settings.database_url, "async")
+
+if settings.database_read_url:
+    async_read_engine = _criar_engine(settings.database_read_url, "async_leitura")
+else:
+    async_read_engine = async_engine
+
+# expire_on_commit=False: depois do commit os objetos seguem legíveis sem
+# um novo SELECT implícito (que exigiria await)
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+AsyncReadSessionLocal = async_sessionmaker(
+    bind=async_read_engine,
+    autoflush=False,
+    expire_on_commit=False,
+)
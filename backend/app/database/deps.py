@@ -1,8 +1,32 @@
-from app.database.session import SessionLocal
+from app.core.cache import response_cache
+from app.database.session import ReadSessionLocal, SessionLocal
 
 def get_db():
     db = SessionLocal()
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+def get_read_db():
+    # Rotas só de leitura: réplica quando DATABASE_READ_URL estiver definida,
+    # exceto logo depois de uma escrita em atos (a réplica pode estar atrasada)
+    db = SessionLocal() if response_cache.escrita_recente() else ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    # Import local: o engine asyncpg só é criado quando DB_ASYNC está ligado
+    from app.database.async_session import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db():
+    from app.database.async_session import AsyncReadSessionLocal, AsyncSessionLocal
+
+    fabrica = AsyncSessionLocal if await response_cache.escrita_recente_async() else AsyncReadSessionLocal
+    async with fabrica() as db:
+        yield db
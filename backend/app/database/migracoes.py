@@ -0,0 +1,38 @@
+"""
+Migrações do esquema (Alembic, em ``app/migrations``).
+
+Substituem o ``create_all`` na subida da API. Vários workers/réplicas
+sobem ao mesmo tempo, então ``aplicar_migracoes`` roda sob um advisory
+lock: o primeiro aplica, os demais esperam e encontram o banco em dia.
+"""
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import text
+
+DIRETORIO = Path(__file__).resolve().parent.parent / "migrations"
+
+# Chave do advisory lock das migrações (a do scheduler é 0x52504153)
+CHAVE_MIGRACOES = 0x52504154
+
+
+def configuracao(conexao=None) -> Config:
+    config = Config()
+    config.set_main_option("script_location", str(DIRETORIO))
+    config.attributes["connection"] = conexao
+    return config
+
+
+def aplicar_migracoes(engine, revisao: str = "head"):
+    # Uma transação só: DDL é transacional no Postgres e o lock é liberado no commit
+    with engine.begin() as conexao:
+        conexao.execute(text("SELECT pg_advisory_xact_lock(:chave)"), {"chave": CHAVE_MIGRACOES})
+        command.upgrade(configuracao(conexao), revisao)
+
+
+def proxima_revisao() -> str:
+    """Revisões numeradas em sequência (0001, 0002...), na ordem de aplicação."""
+    atual = ScriptDirectory.from_config(configuracao()).get_current_head()
+    return f"{int(atual or 0) + 1:04d}"
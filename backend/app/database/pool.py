@@ -0,0 +1,84 @@
+"""
+Configuração comum dos engines (síncronos e asyncpg) e métricas dos
+pools de conexão: tempo de espera no checkout e conexões em uso.
+"""
+import time
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+
+from app.core.metrics import registro
+from app.core.settings import settings
+
+ESPERA_CHECKOUT = registro.histograma(
+    "db_pool_checkout_espera_segundos",
+    "Tempo esperando uma conexão do pool",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+)
+TIMEOUTS_CHECKOUT = registro.contador(
+    "db_pool_checkout_timeouts_total",
+    "Checkouts que desistiram após DB_POOL_TIMEOUT",
+)
+
+# nome -> engine (síncrono ou o sync_engine de um AsyncEngine). Guarda o
+# engine, não o pool: dispose() troca o objeto do pool.
+_engines = {}
+
+
+class _PoolMedido:
+    nome = "principal"
+
+    def _do_get(self):
+        inicio = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            TIMEOUTS_CHECKOUT.inc(engine=self.nome)
+            raise
+        finally:
+            ESPERA_CHECKOUT.observe(time.perf_counter() - inicio, engine=self.nome)
+
+
+def _estado_pools() -> list[tuple[dict, float]]:
+    estado = []
+    for nome, engine in list(_engines.items()):
+        pool = engine.pool
+        estado.append(({"engine": nome, "estado": "em_uso"}, pool.checkedout()))
+        estado.append(({"engine": nome, "estado": "livre"}, pool.checkedin()))
+    return estado
+
+
+registro.medidor(
+    "db_pool_conexoes",
+    "Conexões abertas por pool, em uso ou livres",
+    funcao=_estado_pools,
+)
+
+
+def opcoes_engine(url: str, nome: str, pool_base=QueuePool) -> dict:
+    """Argumentos de ``create_engine``/``create_async_engine`` a partir de ``Settings``."""
+    opcoes = {
+        "echo": settings.db_echo,
+        # Subclasse por engine: pool.recreate() preserva a classe e o nome
+        "poolclass": type(f"{pool_base.__name__}Medido", (_PoolMedido, pool_base), {"nome": nome}),
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        "pool_pre_ping": settings.db_pool_pre_ping,
+    }
+
+    if settings.db_statement_timeout_ms:
+        timeout = str(settings.db_statement_timeout_ms)
+
+        if make_url(url).get_driver_name() == "asyncpg":
+            opcoes["connect_args"] = {"server_settings": {"statement_timeout": timeout}}
+        else:
+            opcoes["connect_args"] = {"options": f"-c statement_timeout={timeout}"}
+
+    return opcoes
+
+
+def registrar_engine(nome: str, engine):
+    _engines[nome] = getattr(engine, "sync_engine", engine)
@@ -2,14 +2,33 @@ from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.settings import settings
+from app.database.pool import opcoes_engine, registrar_engine
 
 engine = create_engine(
     settings.database_url,
-    echo=True,
+    **opcoes_engine(settings.database_url, "principal"),
 )
+registrar_engine("principal", engine)
 
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine,
 )
+
+# Réplica opcional para as rotas só de leitura; sem DATABASE_READ_URL,
+# elas usam o mesmo engine das escritas
+if settings.database_read_url:
+    read_engine = create_engine(
+        settings.database_read_url,
+        **opcoes_engine(settings.database_read_url, "leitura"),
+    )
+    registrar_engine("leitura", read_engine)
+else:
+    read_engine = engine
+
+ReadSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=False,
+    bind=read_engine,
+)
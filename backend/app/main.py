@@ -1,29 +1,85 @@
 from fastapi import FastAPI
+from app.core.instrumentacao import MetricasHttpMiddleware
 from sqlalchemy.exc import OperationalError
-from app.core.scheduler import scheduler
-from app.database.session import engine
-from app.database.base import Base
+from app.core.scheduler import eleicao_lider, scheduler
+from app.core.settings import settings
+from app.database.migracoes import aplicar_migracoes
+from app.database.session import engine, SessionLocal
 from app.routers import atos
 from app.core import auth
 from app.routers import rpa
+from app.routers import metrics
+from app.rpa.driver_pool import driver_pool
+from app.services.execucoes import gerenciador_execucoes
+from app.services.particoes_service import executar_manutencao, verificar_na_subida
+from app.services.resumo_service import reconstruir_se_vazio
 
 app = FastAPI()
+app.add_middleware(MetricasHttpMiddleware)
+
+# Registradas antes das síncronas: atendem os mesmos caminhos primeiro
+if settings.db_async:
+    from app.routers import atos_async, rpa_async
+
+    app.include_router(rpa_async.router)
+    app.include_router(atos_async.router)
 
 app.include_router(rpa.router)
 app.include_router(atos.router)
 app.include_router(auth.router)
+app.include_router(metrics.router)
 
 @app.on_event("startup")
-def create_tables():
+def migrate_database():
     try:
-        Base.metadata.create_all(bind=engine)
+        aplicar_migracoes(engine)
     except OperationalError as e:
         raise RuntimeError("Falha ao conectar no banco. Verifique DATABASE_URL e se o Postgres está ativo.") from e
 
+    db = SessionLocal()
+    try:
+        reconstruir_se_vazio(db)
+        # Partições do mês atual em diante, caso a API tenha ficado parada;
+        # sem derrubar a subida se não der (a manutenção diária tenta de novo)
+        verificar_na_subida(db)
+    finally:
+        db.close()
+
 @app.on_event("startup")
 def start_scheduler():
-    scheduler.start()
+    eleicao_lider.iniciar()
+    scheduler.add_job(
+        executar_manutencao,
+        trigger="cron",
+        hour=settings.particoes_manutencao_hora,
+        timezone="UTC",
+        id="manutencao_particoes",
+        replace_existing=True,
+    )
+
+@app.on_event("startup")
+def start_execucoes():
+    gerenciador_execucoes.iniciar()
+
+@app.on_event("startup")
+def start_driver_pool():
+    driver_pool.aquecer()
 
 @app.on_event("shutdown")
 def shutdown_scheduler():
-    scheduler.shutdown()
+    eleicao_lider.encerrar()
+
+@app.on_event("shutdown")
+def shutdown_execucoes():
+    gerenciador_execucoes.encerrar()
+
+@app.on_event("shutdown")
+def shutdown_driver_pool():
+    driver_pool.encerrar()
+
+@app.on_event("shutdown")
+async def shutdown_async_engine():
+    if settings.db_async:
+        from app.database.async_session import async_engine
+
+        await async_engine.dispose()
@@ -0,0 +1,54 @@
+"""
+Ambiente do Alembic. Roda sobre a conexão recebida em
+``config.attributes["connection"]`` (``aplicar_migracoes`` e a CLI) ou,
+sem ela, abre uma a partir de ``DATABASE_URL``.
+"""
+from alembic import context
+from sqlalchemy import create_engine
+from sqlalchemy.pool import NullPool
+
+from app.core.settings import settings
+from app.database.base import Base
+from app.models import ato, ato_resumo, rpa_checkpoint, rpa_execucao, rpa_log  # noqa: F401 (registra as tabelas)
+from app.services.particoes_service import eh_particao
+
+config = context.config
+
+# Criadas fora do ORM: o job store do APScheduler mantém a própria tabela
+# e as partições mensais de atos e rpa_logs são criadas pela manutenção
+TABELAS_EXTERNAS = {"apscheduler_jobs"}
+
+
+def _incluir(objeto, nome, tipo, refletido, comparado_com):
+    return not (tipo == "table" and (nome in TABELAS_EXTERNAS or eh_particao(nome)))
+
+
+def _configurar(**kwargs):
+    context.configure(
+        target_metadata=Base.metadata,
+        include_object=_incluir,
+        compare_type=True,
+        **kwargs,
+    )
+
+
+def _executar(conexao):
+    _configurar(connection=conexao)
+    with context.begin_transaction():
+        context.run_migrations()
+
+
+if context.is_offline_mode():
+    # Só gera o SQL (python -m app.cli migracoes sql)
+    _configurar(url=settings.database_url, literal_binds=True)
+    with context.begin_transaction():
+        context.run_migrations()
+
+elif config.attributes.get("connection") is not None:
+    _executar(config.attributes["connection"])
+
+else:
+    engine = create_engine(settings.database_url, poolclass=NullPool)
+    with engine.connect() as conexao:
+        _executar(conexao)
+    engine.dispose()
@@ -0,0 +1,91 @@
+"""Esquema base
+
+Idempotente: cria o que faltar tanto em bancos novos quanto nos criados
+pelo antigo ``create_all`` da subida da API, que nunca adicionava colunas
+a tabelas existentes (``atos.busca`` e as colunas de etapas de
+``rpa_logs``).
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS atos (
+            id UUID NOT NULL,
+            tipo_ato VARCHAR(255) NOT NULL,
+            numero_ato VARCHAR(100) NOT NULL,
+            orgao_unidade VARCHAR(255) NOT NULL,
+            publicacao DATE NOT NULL,
+            ementa TEXT NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE,
+            updated_at TIMESTAMP WITHOUT TIME ZONE,
+            deleted_at TIMESTAMP WITHOUT TIME ZONE,
+            PRIMARY KEY (id),
+            CONSTRAINT uq_ato_unico UNIQUE (numero_ato, publicacao, orgao_unidade)
+        )
+    """)
+    op.execute("""
+        ALTER TABLE atos ADD COLUMN IF NOT EXISTS busca TSVECTOR
+        GENERATED ALWAYS AS (
+            to_tsvector('portuguese', tipo_ato || ' ' || numero_ato || ' ' || orgao_unidade || ' ' || ementa)
+        ) STORED
+    """)
+    op.execute("CREATE INDEX IF NOT EXISTS ix_atos_busca ON atos USING gin (busca)")
+    op.execute(
+        "CREATE INDEX IF NOT EXISTS ix_atos_numero_ato_trgm ON atos USING gin (numero_ato gin_trgm_ops)"
+    )
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS atos_resumo_diario (
+            publicacao DATE NOT NULL,
+            orgao_unidade VARCHAR(255) NOT NULL,
+            tipo_ato VARCHAR(255) NOT NULL,
+            quantidade INTEGER NOT NULL,
+            PRIMARY KEY (publicacao, orgao_unidade, tipo_ato)
+        )
+    """)
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS rpa_checkpoints (
+            fonte VARCHAR(100) NOT NULL,
+            ultima_publicacao DATE,
+            ultimo_numero_ato VARCHAR(100),
+            updated_at TIMESTAMP WITHOUT TIME ZONE,
+            PRIMARY KEY (fonte)
+        )
+    """)
+
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS rpa_logs (
+            id UUID NOT NULL,
+            execution_date TIMESTAMP WITHOUT TIME ZONE,
+            total_registros INTEGER,
+            status VARCHAR(50),
+            error_message TEXT,
+            execution_time FLOAT,
+            PRIMARY KEY (id)
+        )
+    """)
+    op.execute("ALTER TABLE rpa_logs ADD COLUMN IF NOT EXISTS etapas JSONB")
+    op.execute("ALTER TABLE rpa_logs ADD COLUMN IF NOT EXISTS linhas_vistas INTEGER")
+    op.execute("ALTER TABLE rpa_logs ADD COLUMN IF NOT EXISTS linhas_duplicadas INTEGER")
+
+
+def downgrade():
+    # Volta ao banco vazio: apaga as tabelas (e os dados) com os seus índices.
+    # pg_trgm fica, pode ser usada por outros esquemas do banco
+    op.execute("DROP TABLE IF EXISTS rpa_logs")
+    op.execute("DROP TABLE IF EXISTS rpa_checkpoints")
+    op.execute("DROP TABLE IF EXISTS atos_resumo_diario")
+    op.execute("DROP TABLE IF EXISTS atos")
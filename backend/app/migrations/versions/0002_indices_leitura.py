@@ -0,0 +1,41 @@
+"""Índices parciais das leituras de atos ativos e de rpa_logs
+
+Toda leitura de ``atos`` filtra ``deleted_at IS NULL``; os índices
+parciais deixam os removidos de fora. Em tabelas grandes, crie-os antes
+com ``CREATE INDEX CONCURRENTLY`` (mesmos nomes e definições) para não
+bloquear as escritas durante a subida: o ``IF NOT EXISTS`` os
+reaproveita.
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_atos_ativos_publicacao
+        ON atos (publicacao DESC, id DESC)
+        WHERE deleted_at IS NULL
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_atos_ativos_resumo
+        ON atos (publicacao, orgao_unidade, tipo_ato)
+        WHERE deleted_at IS NULL
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_rpa_logs_execution_date
+        ON rpa_logs (execution_date DESC)
+    """)
+
+
+def downgrade():
+    op.execute("DROP INDEX IF EXISTS ix_rpa_logs_execution_date")
+    op.execute("DROP INDEX IF EXISTS ix_atos_ativos_resumo")
+    op.execute("DROP INDEX IF EXISTS ix_atos_ativos_publicacao")
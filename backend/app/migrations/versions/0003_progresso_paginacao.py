@@ -0,0 +1,31 @@
+"""Progresso por página da coleta em rpa_checkpoints
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+COLUNAS = {
+    "janela_inicio": "DATE",
+    "janela_fim": "DATE",
+    "pagina": "INTEGER",
+    "chave_primeira_linha": "JSONB",
+    "linhas_pagina": "INTEGER",
+    "linhas_coletadas": "INTEGER",
+}
+
+
+def upgrade():
+    for coluna, tipo in COLUNAS.items():
+        op.execute(f"ALTER TABLE rpa_checkpoints ADD COLUMN IF NOT EXISTS {coluna} {tipo}")
+
+
+def downgrade():
+    for coluna in reversed(COLUNAS):
+        op.execute(f"ALTER TABLE rpa_checkpoints DROP COLUMN IF EXISTS {coluna}")
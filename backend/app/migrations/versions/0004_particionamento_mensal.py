@@ -0,0 +1,190 @@
+"""Particiona atos por mês de publicação e rpa_logs por mês de execução
+
+As tabelas existentes são renomeadas, recriadas como ``PARTITION BY
+RANGE`` com uma partição por mês presente nos dados (mais o atual e os
+três seguintes) e uma ``_default``, e os dados são copiados. A chave
+primária passa a incluir a coluna da partição (exigência do Postgres):
+``(id, publicacao)`` e ``(id, execution_date)``; ``uq_ato_unico`` já a
+inclui. Os índices são recriados na tabela mãe depois da cópia e
+propagados às partições.
+
+A cópia reescreve as duas tabelas sob lock exclusivo: em bases grandes,
+rode ``python -m app.cli migracoes aplicar`` numa janela de manutenção
+antes de subir a nova versão. Idempotente: tabelas já particionadas são
+mantidas.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from datetime import timedelta
+
+from alembic import op
+from sqlalchemy import text
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+MESES_A_FRENTE = 3
+
+COLUNAS_ATOS = "id, tipo_ato, numero_ato, orgao_unidade, publicacao, ementa, created_at, updated_at, deleted_at"
+COLUNAS_LOGS = (
+    "id, execution_date, total_registros, status, error_message, execution_time, "
+    "etapas, linhas_vistas, linhas_duplicadas"
+)
+
+BUSCA = """
+    busca TSVECTOR GENERATED ALWAYS AS (
+        to_tsvector('portuguese', tipo_ato || ' ' || numero_ato || ' ' || orgao_unidade || ' ' || ementa)
+    ) STORED
+"""
+
+INDICES_ATOS = {
+    "ix_atos_busca": "ON atos USING gin (busca)",
+    "ix_atos_numero_ato_trgm": "ON atos USING gin (numero_ato gin_trgm_ops)",
+    "ix_atos_ativos_publicacao": "ON atos (publicacao DESC, id DESC) WHERE deleted_at IS NULL",
+    "ix_atos_ativos_resumo": "ON atos (publicacao, orgao_unidade, tipo_ato) WHERE deleted_at IS NULL",
+}
+INDICES_LOGS = {"ix_rpa_logs_execution_date": "ON rpa_logs (execution_date DESC)"}
+
+
+def _particionada(tabela: str) -> bool:
+    return op.get_bind().execute(
+        text("SELECT EXISTS (SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:tabela))"),
+        {"tabela": tabela},
+    ).scalar()
+
+
+def _separar_antiga(tabela: str, indices: dict):
+    # Os nomes da chave, da constraint e dos índices ficam livres para a nova tabela
+    op.execute(f"ALTER TABLE {tabela} RENAME TO {tabela}_antiga")
+    op.execute(f"ALTER TABLE {tabela}_antiga DROP CONSTRAINT IF EXISTS {tabela}_pkey")
+    op.execute(f"ALTER TABLE {tabela}_antiga DROP CONSTRAINT IF EXISTS uq_ato_unico")
+    for nome in indices:
+        op.execute(f"DROP INDEX IF EXISTS {nome}")
+
+
+def _criar_particoes(tabela: str, coluna: str):
+    op.execute(f"CREATE TABLE {tabela}_default PARTITION OF {tabela} DEFAULT")
+
+    meses = op.get_bind().execute(text(f"""
+        SELECT CAST(date_trunc('month', {coluna}) AS date) FROM {tabela}_antiga WHERE {coluna} IS NOT NULL
+        UNION
+        SELECT CAST(generate_series(
+            date_trunc('month', now()),
+            date_trunc('month', now()) + interval '{MESES_A_FRENTE} months',
+            interval '1 month'
+        ) AS date)
+    """)).scalars()
+
+    for mes in sorted(meses):
+        fim = (mes.replace(day=28) + timedelta(days=4)).replace(day=1)
+        op.execute(
+            f"CREATE TABLE {tabela}_p{mes:%Y%m} PARTITION OF {tabela} "
+            f"FOR VALUES FROM ('{mes}') TO ('{fim}')"
+        )
+
+
+def _criar_indices(indices: dict):
+    for nome, definicao in indices.items():
+        op.execute(f"CREATE INDEX IF NOT EXISTS {nome} {definicao}")
+
+
+def upgrade():
+    if not _particionada("atos"):
+        _separar_antiga("atos", INDICES_ATOS)
+        op.execute(f"""
+            CREATE TABLE atos (
+                id UUID NOT NULL,
+                tipo_ato VARCHAR(255) NOT NULL,
+                numero_ato VARCHAR(100) NOT NULL,
+                orgao_unidade VARCHAR(255) NOT NULL,
+                publicacao DATE NOT NULL,
+                ementa TEXT NOT NULL,
+                created_at TIMESTAMP WITHOUT TIME ZONE,
+                updated_at TIMESTAMP WITHOUT TIME ZONE,
+                deleted_at TIMESTAMP WITHOUT TIME ZONE,
+                {BUSCA},
+                PRIMARY KEY (id, publicacao),
+                CONSTRAINT uq_ato_unico UNIQUE (numero_ato, publicacao, orgao_unidade)
+            ) PARTITION BY RANGE (publicacao)
+        """)
+        _criar_particoes("atos", "publicacao")
+        op.execute(f"INSERT INTO atos ({COLUNAS_ATOS}) SELECT {COLUNAS_ATOS} FROM atos_antiga")
+        op.execute("DROP TABLE atos_antiga")
+
+    _criar_indices(INDICES_ATOS)
+
+    if not _particionada("rpa_logs"):
+        _separar_antiga("rpa_logs", INDICES_LOGS)
+        op.execute("""
+            CREATE TABLE rpa_logs (
+                id UUID NOT NULL,
+                execution_date TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+                total_registros INTEGER,
+                status VARCHAR(50),
+                error_message TEXT,
+                execution_time FLOAT,
+                etapas JSONB,
+                linhas_vistas INTEGER,
+                linhas_duplicadas INTEGER,
+                PRIMARY KEY (id, execution_date)
+            ) PARTITION BY RANGE (execution_date)
+        """)
+        _criar_particoes("rpa_logs", "execution_date")
+        # execution_date passa a ser obrigatória (chave da partição)
+        op.execute(f"""
+            INSERT INTO rpa_logs ({COLUNAS_LOGS})
+            SELECT id, COALESCE(execution_date, timezone('utc', now())), total_registros, status,
+                   error_message, execution_time, etapas, linhas_vistas, linhas_duplicadas
+            FROM rpa_logs_antiga
+        """)
+        op.execute("DROP TABLE rpa_logs_antiga")
+
+    _criar_indices(INDICES_LOGS)
+
+
+def downgrade():
+    if _particionada("atos"):
+        _separar_antiga("atos", INDICES_ATOS)
+        op.execute(f"""
+            CREATE TABLE atos (
+                id UUID NOT NULL,
+                tipo_ato VARCHAR(255) NOT NULL,
+                numero_ato VARCHAR(100) NOT NULL,
+                orgao_unidade VARCHAR(255) NOT NULL,
+                publicacao DATE NOT NULL,
+                ementa TEXT NOT NULL,
+                created_at TIMESTAMP WITHOUT TIME ZONE,
+                updated_at TIMESTAMP WITHOUT TIME ZONE,
+                deleted_at TIMESTAMP WITHOUT TIME ZONE,
+                {BUSCA},
+                PRIMARY KEY (id),
+                CONSTRAINT uq_ato_unico UNIQUE (numero_ato, publicacao, orgao_unidade)
+            )
+        """)
+        op.execute(f"INSERT INTO atos ({COLUNAS_ATOS}) SELECT {COLUNAS_ATOS} FROM atos_antiga")
+        op.execute("DROP TABLE atos_antiga")
+        _criar_indices(INDICES_ATOS)
+
+    if _particionada("rpa_logs"):
+        _separar_antiga("rpa_logs", INDICES_LOGS)
+        op.execute("""
+            CREATE TABLE rpa_logs (
+                id UUID NOT NULL,
+                execution_date TIMESTAMP WITHOUT TIME ZONE,
+                total_registros INTEGER,
+                status VARCHAR(50),
+                error_message TEXT,
+                execution_time FLOAT,
+                etapas JSONB,
+                linhas_vistas INTEGER,
+                linhas_duplicadas INTEGER,
+                PRIMARY KEY (id)
+            )
+        """)
+        op.execute(f"INSERT INTO rpa_logs ({COLUNAS_LOGS}) SELECT {COLUNAS_LOGS} FROM rpa_logs_antiga")
+        op.execute("DROP TABLE rpa_logs_antiga")
+        _criar_indices(INDICES_LOGS)
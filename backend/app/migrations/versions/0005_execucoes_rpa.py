@@ -0,0 +1,50 @@
+"""Execuções do RPA em segundo plano em rpa_execucoes
+
+O estado das execuções submetidas por ``POST /rpa/executar`` e pelos
+agendamentos sai da memória de cada worker para o banco, visível a todos.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.execute("""
+        CREATE TABLE IF NOT EXISTS rpa_execucoes (
+            id VARCHAR(32) NOT NULL,
+            estado VARCHAR(20) NOT NULL,
+            origem VARCHAR(50) NOT NULL,
+            data_inicio DATE,
+            data_fim DATE,
+            criado_em TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            iniciado_em TIMESTAMP WITHOUT TIME ZONE,
+            finalizado_em TIMESTAMP WITHOUT TIME ZONE,
+            tempo_execucao FLOAT,
+            progresso JSONB,
+            resultado JSONB,
+            erro TEXT,
+            worker VARCHAR(255) NOT NULL,
+            atualizado_em TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            PRIMARY KEY (id)
+        )
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_rpa_execucoes_criado_em
+        ON rpa_execucoes (criado_em DESC)
+    """)
+    op.execute("""
+        CREATE INDEX IF NOT EXISTS ix_rpa_execucoes_ativas
+        ON rpa_execucoes (atualizado_em)
+        WHERE estado IN ('na_fila', 'executando')
+    """)
+
+
+def downgrade():
+    op.execute("DROP TABLE IF EXISTS rpa_execucoes")
@@ -1,25 +1,76 @@
 import uuid
-from sqlalchemy import Column, String, Date, Text, DateTime
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Date, Text, DateTime, Computed, DDL, Index, event
+from sqlalchemy.dialects.postgresql import UUID, TSVECTOR
 from sqlalchemy import UniqueConstraint
 from datetime import datetime
 
 from app.database.base import Base
 
+# Configuração de idioma usada no índice e nas consultas de texto completo
+TS_CONFIG = "portuguese"
+
+# Particionada por mês de publicação (atos_p202610...). A chave primária
+# inclui a coluna da partição, exigência do Postgres; as partições são
+# mantidas por app.services.particoes_service
 class Ato(Base):
     __tablename__ = "atos"
 
     __table_args__ = (
         UniqueConstraint("numero_ato", "publicacao", "orgao_unidade", name="uq_ato_unico"),
+        Index("ix_atos_busca", "busca", postgresql_using="gin"),
+        Index(
+            "ix_atos_numero_ato_trgm",
+            "numero_ato",
+            postgresql_using="gin",
+            postgresql_ops={"numero_ato": "gin_trgm_ops"},
+        ),
+        {"postgresql_partition_by": "RANGE (publicacao)"},
     )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     tipo_ato = Column(String(255), nullable=False)
     numero_ato = Column(String(100), nullable=False)
     orgao_unidade = Column(String(255), nullable=False)
-    publicacao = Column(Date, nullable=False)
+    publicacao = Column(Date, primary_key=True, nullable=False)
     ementa = Column(Text, nullable=False)
 
+    # Mantida pelo próprio Postgres a cada INSERT/UPDATE
+    busca = Column(
+        TSVECTOR,
+        Computed(
+            f"to_tsvector('{TS_CONFIG}', "
+            "tipo_ato || ' ' || numero_ato || ' ' || orgao_unidade || ' ' || ementa)",
+            persisted=True,
+        ),
+    )
+
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, onupdate=datetime.utcnow)
-    deleted_at = Column(DateTime, nullable=True)
\ No newline at end of file
+    deleted_at = Column(DateTime, nullable=True)
+
+
+# Leituras só enxergam atos ativos: os índices abaixo ignoram os removidos.
+# Listagem paginada por chave: WHERE deleted_at IS NULL ORDER BY publicacao DESC, id DESC
+Index(
+    "ix_atos_ativos_publicacao",
+    Ato.publicacao.desc(),
+    Ato.id.desc(),
+    postgresql_where=Ato.deleted_at.is_(None),
+)
+
+# Agregação por dia, órgão e tipo (reconstrução e conferência do resumo
+# diário): varredura só do índice, já na ordem do GROUP BY
+Index(
+    "ix_atos_ativos_resumo",
+    Ato.publicacao,
+    Ato.orgao_unidade,
+    Ato.tipo_ato,
+    postgresql_where=Ato.deleted_at.is_(None),
+)
+
+# gin_trgm_ops vem da extensão pg_trgm
+event.listen(
+    Ato.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"),
+)
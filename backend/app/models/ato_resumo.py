@@ -0,0 +1,13 @@
+from sqlalchemy import Column, String, Date, Integer
+from app.database.base import Base
+
+
+class AtoResumoDiario(Base):
+    """Contagem de atos ativos por dia de publicação, órgão e tipo (usada no dashboard)."""
+
+    __tablename__ = "atos_resumo_diario"
+
+    publicacao = Column(Date, primary_key=True)
+    orgao_unidade = Column(String(255), primary_key=True)
+    tipo_ato = Column(String(255), primary_key=True)
+    quantidade = Column(Integer, nullable=False, default=0)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, String, Date, DateTime, Integer
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+from app.database.base import Base
+
+
+class RpaCheckpoint(Base):
+    __tablename__ = "rpa_checkpoints"
+
+    fonte = Column(String(100), primary_key=True)
+    ultima_publicacao = Column(Date, nullable=True)
+    ultimo_numero_ato = Column(String(100), nullable=True)
+
+    # Última página lida de uma coleta que não terminou; a próxima execução
+    # na mesma janela retoma dali. Limpo quando a coleta termina completa
+    janela_inicio = Column(Date, nullable=True)
+    janela_fim = Column(Date, nullable=True)
+    pagina = Column(Integer, nullable=True)
+    chave_primeira_linha = Column(JSONB, nullable=True)
+    linhas_pagina = Column(Integer, nullable=True)
+    linhas_coletadas = Column(Integer, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
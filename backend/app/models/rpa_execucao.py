@@ -0,0 +1,42 @@
+from sqlalchemy import Column, String, Date, DateTime, Float, Text, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
+from datetime import datetime
+from app.database.base import Base
+
+
+class RpaExecucao(Base):
+    """
+    Execuções do RPA em segundo plano (``app.services.execucoes``). Ficam no
+    banco para que todos os workers vejam o mesmo estado e a mesma fila;
+    o log definitivo de cada execução continua em ``rpa_logs``.
+    """
+
+    __tablename__ = "rpa_execucoes"
+
+    id = Column(String(32), primary_key=True)
+    estado = Column(String(20), nullable=False)
+    origem = Column(String(50), nullable=False)
+    data_inicio = Column(Date, nullable=True)
+    data_fim = Column(Date, nullable=True)
+    criado_em = Column(DateTime, nullable=False, default=datetime.utcnow)
+    iniciado_em = Column(DateTime, nullable=True)
+    finalizado_em = Column(DateTime, nullable=True)
+    tempo_execucao = Column(Float, nullable=True)
+    progresso = Column(JSONB, nullable=True)
+    resultado = Column(JSONB, nullable=True)
+    erro = Column(Text, nullable=True)
+
+    # Processo que recebeu a execução e o último sinal de vida dele: as de
+    # um worker que caiu são encerradas como erro e saem da fila
+    worker = Column(String(255), nullable=False)
+    atualizado_em = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+# GET /rpa/runs: mais recentes primeiro
+Index("ix_rpa_execucoes_criado_em", RpaExecucao.criado_em.desc())
+# Contagem da fila na submissão e busca das execuções órfãs
+Index(
+    "ix_rpa_execucoes_ativas",
+    RpaExecucao.atualizado_em,
+    postgresql_where=text("estado IN ('na_fila', 'executando')"),
+)
@@ -1,16 +1,30 @@
 import uuid
-from sqlalchemy import Column, String, Integer, Float, DateTime, Text
-from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy import Column, String, Integer, Float, DateTime, Text, Index
+from sqlalchemy.dialects.postgresql import JSONB, UUID
 from datetime import datetime
 from app.database.base import Base
 
 
+# Particionada por mês de execução (rpa_logs_p202610...); partições mais
+# antigas que RPA_LOGS_RETENCAO_DIAS são removidas por app.services.particoes_service
 class RpaLog(Base):
     __tablename__ = "rpa_logs"
-    
+    __table_args__ = {"postgresql_partition_by": "RANGE (execution_date)"}
+
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    execution_date = Column(DateTime, default=datetime.utcnow)
+    execution_date = Column(DateTime, primary_key=True, default=datetime.utcnow)
     total_registros = Column(Integer)
     status = Column(String(50))
     error_message = Column(Text, nullable=True)
-    execution_time = Column(Float)
\ No newline at end of file
+    execution_time = Column(Float)
+
+    # Só nos logs de execução do RPA (um por execução): segundos por etapa
+    # (driver, fetch, parse, formatacao, transferencia, insercao, total...)
+    # e linhas vistas no site / descartadas por já existirem
+    etapas = Column(JSONB, nullable=True)
+    linhas_vistas = Column(Integer, nullable=True)
+    linhas_duplicadas = Column(Integer, nullable=True)
+
+
+# /rpa/logs: filtro por período e ORDER BY execution_date DESC
+Index("ix_rpa_logs_execution_date", RpaLog.execution_date.desc())
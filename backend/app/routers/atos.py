@@ -1,18 +1,27 @@
-from fastapi import APIRouter, Depends, Query
+import json
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
-from datetime import date
+from sqlalchemy import or_, tuple_
+from datetime import date, timedelta
 from uuid import UUID
 from fastapi import HTTPException
 from datetime import datetime
 from sqlalchemy import func
 from datetime import date
+from collections import Counter
 from app.schemas.ato import AtoUpdate
-from app.database.deps import get_db
-from app.models.ato import Ato
-from app.schemas.ato import AtoCreate, AtoResponse
-from app.services.ato_service import salvar_lote_atos
+from app.database.deps import get_db, get_read_db
+from app.database.session import ReadSessionLocal
+from app.models.ato import Ato, TS_CONFIG
+from app.schemas.ato import AtoCreate, AtoFiltroLote, AtoResponse, AtosAtualizacaoLote, AtosExclusaoLote
+from app.services.ato_service import atualizar_lote_atos, excluir_lote_atos, salvar_lote_atos
+from app.services.resumo_service import aplicar_variacoes, chave_resumo, resumo_dashboard
+from app.services.paginacao import codificar_cursor, decodificar_cursor
 from app.core.security import verificar_token
+from app.core.cache import response_cache
 
 router = APIRouter(prefix="/atos", tags=["Atos"])
 
@@ -20,7 +29,9 @@ router = APIRouter(prefix="/atos", tags=["Atos"])
 def create_ato(ato: AtoCreate, db: Session = Depends(get_db), user: str = Depends(verificar_token)):
     novo_ato = Ato(**ato.dict())
     db.add(novo_ato)
+    aplicar_variacoes(db, Counter({chave_resumo(novo_ato): 1}))
     db.commit()
+    response_cache.invalidar()
     db.refresh(novo_ato)
     return novo_ato
 
@@ -36,16 +47,78 @@ def create_atos_batch(
     )
 
 
-@router.get("/", response_model=list[AtoResponse])
-def get_atos(
-    data_inicio: date | None = Query(None),
-    data_fim: date | None = Query(None),
-    search: str | None = Query(None),
-    db: Session = Depends(get_db)
+def _filtro_lote(filtro: AtoFiltroLote) -> dict:
+    campos = filtro.model_dump(exclude_none=True)
+    if not campos:
+        raise HTTPException(status_code=400, detail="Informe ao menos um campo no filtro")
+    return campos
+
+
+def _argumentos_atualizacao_lote(lote: AtosAtualizacaoLote) -> dict:
+    if bool(lote.atos) == bool(lote.filtro):
+        raise HTTPException(status_code=400, detail="Informe atos ou filtro")
+
+    if lote.filtro:
+        alteracoes = lote.alteracoes.model_dump(exclude_none=True) if lote.alteracoes else {}
+        if not alteracoes:
+            raise HTTPException(status_code=400, detail="Informe as alterações para os atos do filtro")
+        return {"filtro": _filtro_lote(lote.filtro), "alteracoes": alteracoes}
+
+    ids = [ato.id for ato in lote.atos]
+    if len(set(ids)) != len(ids):
+        raise HTTPException(status_code=400, detail="Ids repetidos no lote")
+
+    return {"atualizacoes": [ato.model_dump(exclude_none=True) for ato in lote.atos]}
+
+
+# Outra transação seguiu gravando as mesmas chaves a cada nova conferência
+CONFLITO_CONCORRENTE = "Atos do lote alterados ao mesmo tempo por outra gravação; tente de novo"
+
+
+def _argumentos_exclusao_lote(lote: AtosExclusaoLote) -> dict:
+    if bool(lote.ids) == bool(lote.filtro):
+        raise HTTPException(status_code=400, detail="Informe ids ou filtro")
+
+    if lote.filtro:
+        return {"filtro": _filtro_lote(lote.filtro)}
+
+    return {"ids": list(dict.fromkeys(lote.ids))}
+
+
+# Antes das rotas /{ato_id}: "batch" não chegaria aqui
+@router.patch("/batch")
+def update_atos_batch(
+    lote: AtosAtualizacaoLote,
+    db: Session = Depends(get_db),
+    user: str = Depends(verificar_token)
+):
+    """
+    Atualiza vários atos em um único ``UPDATE``: por id (cada um com os
+    seus campos) ou pelo filtro (as mesmas alterações em todos).
+    """
+    try:
+        return atualizar_lote_atos(db, **_argumentos_atualizacao_lote(lote))
+    except IntegrityError as exc:
+        raise HTTPException(status_code=409, detail=CONFLITO_CONCORRENTE) from exc
+
+
+@router.delete("/batch")
+def delete_atos_batch(
+    lote: AtosExclusaoLote,
+    db: Session = Depends(get_db),
+    user: str = Depends(verificar_token)
 ):
+    return excluir_lote_atos(db, **_argumentos_exclusao_lote(lote))
+
+
+MODOS_BUSCA = "^(fts|ranking|ilike)$"
 
-    query = db.query(Ato).filter(Ato.deleted_at.is_(None))
 
+def _consulta_texto(search: str):
+    return func.websearch_to_tsquery(TS_CONFIG, search)
+
+
+def _filtrar_atos(query, data_inicio, data_fim, search, modo_busca="fts"):
     # Filtro por data inicial
     if data_inicio:
         query = query.filter(Ato.publicacao >= data_inicio)
@@ -54,8 +127,17 @@ def get_atos(
     if data_fim:
         query = query.filter(Ato.publicacao <= data_fim)
 
-    # Filtro de busca textual
-    if search:
+    # Busca por texto completo (índice GIN) + trecho do número (índice trigram)
+    if search and modo_busca != "ilike":
+        query = query.filter(
+            or_(
+                Ato.busca.op("@@")(_consulta_texto(search)),
+                Ato.numero_ato.ilike(f"%{search}%"),
+            )
+        )
+
+    # Busca textual antiga por trecho em todas as colunas (sem índice)
+    elif search:
         query = query.filter(
             or_(
                 Ato.tipo_ato.ilike(f"%{search}%"),
@@ -65,9 +147,213 @@ def get_atos(
             )
         )
 
-    atos = query.order_by(Ato.publicacao.desc()).all()
+    return query
+
+
+def _etag_confere(request: Request, etag: str) -> bool:
+    enviados = request.headers.get("if-none-match")
+    if not enviados:
+        return False
+
+    return any(
+        valor.strip().removeprefix("W/") in (etag, "*")
+        for valor in enviados.split(",")
+    )
+
+
+def _corpo_resposta(conteudo) -> bytes:
+    return json.dumps(
+        jsonable_encoder(conteudo), ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+def _guardar_resposta(chave: str, conteudo, headers: dict) -> dict:
+    return response_cache.guardar(chave, _corpo_resposta(conteudo), headers)
+
 
-    return atos
+def _resposta_com_etag(request: Request, entrada: dict) -> Response:
+    headers = {**entrada["headers"], "ETag": entrada["etag"], "Cache-Control": "no-cache"}
+
+    if _etag_confere(request, entrada["etag"]):
+        return Response(status_code=304, headers=headers)
+
+    return Response(entrada["corpo"], media_type="application/json", headers=headers)
+
+
+def _responder_em_cache(request: Request, rota: str, params: dict, produzir) -> Response:
+    """
+    Serve uma leitura pelo ``response_cache``.
+
+    ``produzir`` só é chamado em caso de miss e devolve ``(conteudo,
+    headers)``. A resposta leva um ETag do corpo; se o cliente já tem
+    essa versão (``If-None-Match``), devolve 304 sem corpo.
+    """
+    chave = response_cache.chave(rota, params)
+    entrada = response_cache.obter(chave)
+
+    if entrada is None:
+        entrada = _guardar_resposta(chave, *produzir())
+
+    return _resposta_com_etag(request, entrada)
+
+
+def _serializar(atos: list[Ato]) -> list[dict]:
+    return [AtoResponse.model_validate(ato).model_dump(mode="json") for ato in atos]
+
+
+# atos é particionada por mês de publicação: sem limite inferior de data a
+# listagem abre todas as partições. A primeira tentativa lê só os últimos
+# JANELA_LISTAGEM_DIAS antes do topo da página; se não encher a página,
+# repete sem o limite (o resultado é o mesmo, a ordem é por data)
+JANELA_LISTAGEM_DIAS = 90
+
+
+def _janela_listagem(data_inicio, data_fim, search, cursor) -> date | None:
+    """Limite inferior da primeira tentativa, ou None quando não compensa."""
+    if search:
+        return None
+
+    topo = data_fim or date.today()
+
+    if cursor:
+        try:
+            topo = min(topo, decodificar_cursor(cursor)[0])
+        except ValueError:
+            return None
+
+    desde = topo - timedelta(days=JANELA_LISTAGEM_DIAS)
+
+    if data_inicio and data_inicio >= desde:
+        return None
+
+    return desde
+
+
+def _montar_listagem(query, data_inicio, data_fim, search, modo_busca, limit, cursor, desde=None):
+    """
+    Aplica filtros, ordem e limite da listagem. Serve tanto para
+    ``db.query(Ato)`` quanto para ``select(Ato)`` (rotas assíncronas).
+    """
+    query = query.filter(Ato.deleted_at.is_(None))
+    query = _filtrar_atos(query, data_inicio, data_fim, search, modo_busca)
+
+    if desde:
+        query = query.filter(Ato.publicacao >= desde)
+
+    # Ranking devolve só os "limit" atos mais relevantes, sem paginação
+    if search and modo_busca == "ranking":
+        if cursor:
+            raise HTTPException(status_code=400, detail="cursor não se aplica ao modo ranking")
+
+        rank = func.ts_rank(Ato.busca, _consulta_texto(search))
+        return query.order_by(rank.desc(), Ato.publicacao.desc()).limit(limit)
+
+    # Paginação por chave: continua depois do último (publicacao, id) entregue
+    if cursor:
+        try:
+            publicacao, ato_id = decodificar_cursor(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Cursor inválido")
+
+        # A comparação de tuplas não poda partições; o limite na data, sim
+        query = query.filter(
+            Ato.publicacao <= publicacao,
+            tuple_(Ato.publicacao, Ato.id) < (publicacao, ato_id),
+        )
+
+    # Um item a mais indica se existe próxima página
+    return query.order_by(Ato.publicacao.desc(), Ato.id.desc()).limit(limit + 1)
+
+
+def _paginar(atos: list[Ato], limit: int) -> tuple[list[dict], dict]:
+    headers = {}
+
+    if len(atos) > limit:
+        atos = atos[:limit]
+        headers["X-Next-Cursor"] = codificar_cursor(atos[-1].publicacao, atos[-1].id)
+
+    return _serializar(atos), headers
+
+
+def _listar_atos(db, data_inicio, data_fim, search, modo_busca, limit, cursor):
+    desde = _janela_listagem(data_inicio, data_fim, search, cursor)
+
+    if desde:
+        atos = _montar_listagem(
+            db.query(Ato), data_inicio, data_fim, search, modo_busca, limit, cursor, desde
+        ).all()
+        if len(atos) > limit:
+            return _paginar(atos, limit)
+
+    query = _montar_listagem(
+        db.query(Ato), data_inicio, data_fim, search, modo_busca, limit, cursor
+    )
+    return _paginar(query.all(), limit)
+
+
+@router.get("/", response_model=list[AtoResponse])
+def get_atos(
+    request: Request,
+    data_inicio: date | None = Query(None),
+    data_fim: date | None = Query(None),
+    search: str | None = Query(None),
+    modo_busca: str = Query(
+        "fts",
+        pattern=MODOS_BUSCA,
+        description="fts (texto completo), ranking (por relevância) ou ilike (trecho, sem índice)",
+    ),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None, description="Valor de X-Next-Cursor da página anterior"),
+    db: Session = Depends(get_read_db)
+):
+    params = {
+        "data_inicio": data_inicio,
+        "data_fim": data_fim,
+        "search": search,
+        "modo_busca": modo_busca,
+        "limit": limit,
+        "cursor": cursor,
+    }
+
+    return _responder_em_cache(
+        request,
+        "listar",
+        params,
+        lambda: _listar_atos(db, **params),
+    )
+
+
+@router.get("/export")
+def export_atos(
+    data_inicio: date | None = Query(None),
+    data_fim: date | None = Query(None),
+    search: str | None = Query(None),
+    modo_busca: str = Query("fts", pattern="^(fts|ilike)$"),
+):
+    """
+    Exporta todos os atos filtrados em NDJSON (um JSON por linha).
+
+    As linhas são lidas com cursor no servidor e enviadas conforme chegam,
+    sem carregar o resultado inteiro em memória.
+    """
+    def gerar():
+        # Sessão própria: a do Depends é fechada antes do streaming começar
+        db = ReadSessionLocal()
+        try:
+            query = db.query(Ato).filter(Ato.deleted_at.is_(None))
+            query = (
+                _filtrar_atos(query, data_inicio, data_fim, search, modo_busca)
+                .order_by(Ato.publicacao.desc(), Ato.id.desc())
+                .execution_options(stream_results=True)
+                .yield_per(1000)
+            )
+
+            for ato in query:
+                yield AtoResponse.model_validate(ato).model_dump_json() + "\n"
+        finally:
+            db.close()
+
+    return StreamingResponse(gerar(), media_type="application/x-ndjson")
 
 
 @router.put("/{ato_id}", response_model=AtoResponse)
@@ -85,12 +371,18 @@ def update_ato(
     if not ato:
         raise HTTPException(status_code=404, detail="Ato não encontrado")
 
+    chave_anterior = chave_resumo(ato)
+
     for field, value in ato_update.dict(exclude_unset=True).items():
         setattr(ato, field, value)
 
     ato.updated_at = datetime.utcnow()
 
+    if chave_resumo(ato) != chave_anterior:
+        aplicar_variacoes(db, Counter({chave_anterior: -1, chave_resumo(ato): 1}))
+
     db.commit()
+    response_cache.invalidar()
     db.refresh(ato)
 
     return ato
@@ -111,58 +403,30 @@ def delete_ato(
         raise HTTPException(status_code=404, detail="Ato não encontrado")
 
     ato.deleted_at = datetime.utcnow()
+    aplicar_variacoes(db, Counter({chave_resumo(ato): -1}))
 
     db.commit()
+    response_cache.invalidar()
 
     return {"message": "Ato excluído com sucesso"}
 
 @router.get("/dashboard")
 def dashboard(
+    request: Request,
     data_inicio: date | None = None,
     data_fim: date | None = None,
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
-    query_base = db.query(Ato).filter(Ato.deleted_at.is_(None))
-
-    # Aplicando filtro por período
-    if data_inicio:
-        query_base = query_base.filter(Ato.publicacao >= data_inicio)
-
-    if data_fim:
-        query_base = query_base.filter(Ato.publicacao <= data_fim)
-
-    # Total de atos
-    total_atos = query_base.count()
-
-    # Quantidade por órgão
-    por_orgao = (
-        query_base.with_entities(
-            Ato.orgao_unidade,
-            func.count(Ato.id).label("quantidade")
-        )
-        .group_by(Ato.orgao_unidade)
-        .all()
+    # Soma sobre o resumo diário (atos_resumo_diario), mantido na ingestão,
+    # edição e exclusão: o custo depende do período, não do total de atos
+    return _responder_em_cache(
+        request,
+        "dashboard",
+        {"data_inicio": data_inicio, "data_fim": data_fim},
+        lambda: (resumo_dashboard(db, data_inicio, data_fim), {}),
     )
 
-    # Quantidade por tipo de ato
-    por_tipo = (
-        query_base.with_entities(
-            Ato.tipo_ato,
-            func.count(Ato.id).label("quantidade")
-        )
-        .group_by(Ato.tipo_ato)
-        .all()
-    )
-
-    return {
-        "total_atos": total_atos,
-        "por_orgao": [
-            {"orgao_unidade": orgao, "quantidade": qtd}
-            for orgao, qtd in por_orgao
-        ],
-        "por_tipo": [
-            {"tipo_ato": tipo, "quantidade": qtd}
-            for tipo, qtd in por_tipo
-        ]
-    }
 
+@router.get("/cache")
+def cache_estatisticas(user: str = Depends(verificar_token)):
+    return response_cache.estatisticas()
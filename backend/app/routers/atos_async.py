@@ -0,0 +1,207 @@
+"""
+Versões assíncronas (asyncpg) das rotas de atos.
+
+Registradas antes de ``routers.atos`` quando ``DB_ASYNC=true``, atendem
+os mesmos caminhos com o mesmo contrato. Filtros, paginação, cache e
+resumo diário reaproveitam as funções das rotas síncronas.
+"""
+from collections import Counter
+from datetime import date, datetime
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import response_cache
+from app.core.security import verificar_token
+from app.database.deps import get_async_db, get_async_read_db
+from app.models.ato import Ato
+from app.routers.atos import (
+    CONFLITO_CONCORRENTE,
+    MODOS_BUSCA,
+    _argumentos_atualizacao_lote,
+    _argumentos_exclusao_lote,
+    _corpo_resposta,
+    _janela_listagem,
+    _montar_listagem,
+    _paginar,
+    _resposta_com_etag,
+)
+from app.schemas.ato import AtoCreate, AtoResponse, AtosAtualizacaoLote, AtosExclusaoLote, AtoUpdate
+from app.services.ato_service import (
+    atualizar_lote_atos_async,
+    excluir_lote_atos_async,
+    salvar_lote_atos_async,
+)
+from app.services.resumo_service import aplicar_variacoes, chave_resumo, resumo_dashboard
+
+router = APIRouter(prefix="/atos", tags=["Atos"], include_in_schema=False)
+
+
+async def _responder_em_cache_async(request: Request, rota: str, params: dict, produzir) -> Response:
+    chave = await response_cache.chave_async(rota, params)
+    entrada = await response_cache.obter_async(chave)
+
+    if entrada is None:
+        conteudo, headers = await produzir()
+        entrada = await response_cache.guardar_async(chave, _corpo_resposta(conteudo), headers)
+
+    return _resposta_com_etag(request, entrada)
+
+
+async def _buscar_ato(db: AsyncSession, ato_id: UUID) -> Ato:
+    ato = await db.scalar(
+        select(Ato).where(Ato.id == ato_id, Ato.deleted_at.is_(None))
+    )
+
+    if not ato:
+        raise HTTPException(status_code=404, detail="Ato não encontrado")
+
+    return ato
+
+
+@router.post("/", response_model=AtoResponse)
+async def create_ato_async(
+    ato: AtoCreate,
+    db: AsyncSession = Depends(get_async_db),
+    user: str = Depends(verificar_token)
+):
+    novo_ato = Ato(**ato.model_dump())
+    db.add(novo_ato)
+    await db.run_sync(aplicar_variacoes, Counter({chave_resumo(novo_ato): 1}))
+    await db.commit()
+    await response_cache.invalidar_async()
+    await db.refresh(novo_ato)
+    return novo_ato
+
+
+@router.post("/batch")
+async def create_atos_batch_async(
+    atos: list[AtoCreate],
+    db: AsyncSession = Depends(get_async_db),
+    user: str = Depends(verificar_token)
+):
+    return await salvar_lote_atos_async(
+        db,
+        [ato.model_dump() for ato in atos]
+    )
+
+
+@router.patch("/batch")
+async def update_atos_batch_async(
+    lote: AtosAtualizacaoLote,
+    db: AsyncSession = Depends(get_async_db),
+    user: str = Depends(verificar_token)
+):
+    try:
+        return await atualizar_lote_atos_async(db, **_argumentos_atualizacao_lote(lote))
+    except IntegrityError as exc:
+        raise HTTPException(status_code=409, detail=CONFLITO_CONCORRENTE) from exc
+
+
+@router.delete("/batch")
+async def delete_atos_batch_async(
+    lote: AtosExclusaoLote,
+    db: AsyncSession = Depends(get_async_db),
+    user: str = Depends(verificar_token)
+):
+    return await excluir_lote_atos_async(db, **_argumentos_exclusao_lote(lote))
+
+
+@router.get("/", response_model=list[AtoResponse])
+async def get_atos_async(
+    request: Request,
+    data_inicio: date | None = Query(None),
+    data_fim: date | None = Query(None),
+    search: str | None = Query(None),
+    modo_busca: str = Query("fts", pattern=MODOS_BUSCA),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: str | None = Query(None),
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    params = {
+        "data_inicio": data_inicio,
+        "data_fim": data_fim,
+        "search": search,
+        "modo_busca": modo_busca,
+        "limit": limit,
+        "cursor": cursor,
+    }
+
+    async def _listar():
+        desde = _janela_listagem(data_inicio, data_fim, search, cursor)
+
+        if desde:
+            atos = (await db.scalars(_montar_listagem(select(Ato), **params, desde=desde))).all()
+            if len(atos) > limit:
+                return _paginar(atos, limit)
+
+        atos = (await db.scalars(_montar_listagem(select(Ato), **params))).all()
+        return _paginar(atos, limit)
+
+    # Mesma chave das rotas síncronas: o cache é compartilhado entre as duas
+    return await _responder_em_cache_async(request, "listar", params, _listar)
+
+
+@router.put("/{ato_id}", response_model=AtoResponse)
+async def update_ato_async(
+    ato_id: UUID,
+    ato_update: AtoUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    user: str = Depends(verificar_token)
+):
+    ato = await _buscar_ato(db, ato_id)
+    chave_anterior = chave_resumo(ato)
+
+    for field, value in ato_update.model_dump(exclude_unset=True).items():
+        setattr(ato, field, value)
+
+    ato.updated_at = datetime.utcnow()
+
+    if chave_resumo(ato) != chave_anterior:
+        await db.run_sync(
+            aplicar_variacoes, Counter({chave_anterior: -1, chave_resumo(ato): 1})
+        )
+
+    await db.commit()
+    await response_cache.invalidar_async()
+    await db.refresh(ato)
+
+    return ato
+
+
+@router.delete("/{ato_id}")
+async def delete_ato_async(
+    ato_id: UUID,
+    db: AsyncSession = Depends(get_async_db),
+    user: str = Depends(verificar_token)
+):
+    ato = await _buscar_ato(db, ato_id)
+
+    ato.deleted_at = datetime.utcnow()
+    await db.run_sync(aplicar_variacoes, Counter({chave_resumo(ato): -1}))
+
+    await db.commit()
+    await response_cache.invalidar_async()
+
+    return {"message": "Ato excluído com sucesso"}
+
+
+@router.get("/dashboard")
+async def dashboard_async(
+    request: Request,
+    data_inicio: date | None = None,
+    data_fim: date | None = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    async def _resumo():
+        return await db.run_sync(resumo_dashboard, data_inicio, data_fim), {}
+
+    return await _responder_em_cache_async(
+        request,
+        "dashboard",
+        {"data_inicio": data_inicio, "data_fim": data_fim},
+        _resumo,
+    )
@@ -0,0 +1,12 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import registro
+
+router = APIRouter(tags=["Métricas"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    # Formato texto do Prometheus (exposition format 0.0.4)
+    return PlainTextResponse(registro.exportar(), media_type="text/plain; version=0.0.4")
@@ -1,22 +1,48 @@
-from datetime import datetime, date, time
+from datetime import datetime, date, time, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from app.schemas.rpa_log import ScheduleRequest
-from app.database.deps import get_db
-from app.services.rpa_service import executar_rpa
+from app.database.deps import get_read_db
+from app.services.execucoes import FilaCheiaError, executar_agendado, gerenciador_execucoes
 from app.core.scheduler import scheduler
 from app.core.security import verificar_token
 from app.models.rpa_log import RpaLog
 from app.schemas.rpa_log import RpaLogListResponse
+from app.services.rpa_metricas_service import resumo_etapas
 
 router = APIRouter(prefix="/rpa", tags=["RPA"])
 
 
-@router.post("/executar")
+@router.post("/executar", status_code=202)
 def executar(
+    data_inicio: date | None = Query(None),
+    data_fim: date | None = Query(None),
     user: str = Depends(verificar_token),
 ):
-    return executar_rpa()
+    if data_inicio and data_fim and data_inicio > data_fim:
+        raise HTTPException(status_code=400, detail="data_inicio deve ser anterior a data_fim")
+
+    # Só enfileira: o andamento é consultado em GET /rpa/runs/{run_id}
+    try:
+        return gerenciador_execucoes.submeter(data_inicio, data_fim)
+    except FilaCheiaError as exc:
+        raise HTTPException(status_code=429, detail=str(exc))
+
+@router.get("/runs")
+def list_runs(user: str = Depends(verificar_token)):
+    return {
+        **gerenciador_execucoes.status(),
+        "execucoes": gerenciador_execucoes.listar(),
+    }
+
+@router.get("/runs/{run_id}")
+def get_run(run_id: str, user: str = Depends(verificar_token)):
+    execucao = gerenciador_execucoes.obter(run_id)
+
+    if not execucao:
+        raise HTTPException(status_code=404, detail="Execução não encontrada")
+
+    return execucao
 
 @router.post("/schedule")
 def schedule_rpa(
@@ -33,10 +59,10 @@ def schedule_rpa(
             raise HTTPException(status_code=400, detail="Informe hours ou minutes para interval")
 
         scheduler.add_job(
-            executar_rpa,
+            executar_agendado,
             trigger="interval",
-            hours=request.hours,
-            minutes=request.minutes,
+            hours=request.hours or 0,
+            minutes=request.minutes or 0,
             id=job_id,
             replace_existing=True
         )
@@ -46,7 +72,7 @@ def schedule_rpa(
             raise HTTPException(status_code=400, detail="Informe hours e minutes para cron")
 
         scheduler.add_job(
-            executar_rpa,
+            executar_agendado,
             trigger="cron",
             hour=request.hours,
             minute=request.minutes,
@@ -88,18 +114,8 @@ def remove_schedule(
 
     return {"status": "removido", "job_id": job_id}
 
-@router.get("/logs", response_model=RpaLogListResponse)
-def list_rpa_logs(
-    page: int = Query(1, ge=1),
-    size: int = Query(20, ge=1, le=100),
-    status: str | None = Query(None),
-    data_inicio: date | None = Query(None),
-    data_fim: date | None = Query(None),
-    db: Session = Depends(get_db),
-    user: str = Depends(verificar_token),
-):
-    query = db.query(RpaLog)
-
+def _filtrar_logs(query, status, data_inicio, data_fim):
+    # Vale para db.query(RpaLog) e para select(RpaLog) (rotas assíncronas)
     if status:
         query = query.filter(RpaLog.status.ilike(f"%{status}%"))
 
@@ -113,15 +129,10 @@ def list_rpa_logs(
             RpaLog.execution_date <= datetime.combine(data_fim, time.max)
         )
 
-    total = query.count()
+    return query
 
-    items = (
-        query.order_by(RpaLog.execution_date.desc())
-        .offset((page - 1) * size)
-        .limit(size)
-        .all()
-    )
 
+def _pagina_logs(page: int, size: int, total: int, items: list[RpaLog]) -> dict:
     return {
         "page": page,
         "size": size,
@@ -134,7 +145,51 @@ def list_rpa_logs(
                 "status": log.status,
                 "error_message": log.error_message,
                 "execution_time": log.execution_time,
+                "etapas": log.etapas,
+                "linhas_vistas": log.linhas_vistas,
+                "linhas_duplicadas": log.linhas_duplicadas,
             }
             for log in items
         ],
-    }
\ No newline at end of file
+    }
+
+
+@router.get("/logs", response_model=RpaLogListResponse)
+def list_rpa_logs(
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+    status: str | None = Query(None),
+    data_inicio: date | None = Query(None),
+    data_fim: date | None = Query(None),
+    db: Session = Depends(get_read_db),
+    user: str = Depends(verificar_token),
+):
+    query = _filtrar_logs(db.query(RpaLog), status, data_inicio, data_fim)
+
+    total = query.count()
+
+    items = (
+        query.order_by(RpaLog.execution_date.desc())
+        .offset((page - 1) * size)
+        .limit(size)
+        .all()
+    )
+
+    return _pagina_logs(page, size, total, items)
+
+@router.get("/metricas")
+def rpa_metricas(
+    data_inicio: date | None = Query(None, description="Padrão: 7 dias antes de data_fim"),
+    data_fim: date | None = Query(None, description="Padrão: hoje"),
+    db: Session = Depends(get_read_db),
+    user: str = Depends(verificar_token),
+):
+    # Tempos por etapa (driver, fetch, parse, formatacao, transferencia, insercao...)
+    data_fim = data_fim or date.today()
+    data_inicio = data_inicio or data_fim - timedelta(days=7)
+
+    return resumo_etapas(
+        db,
+        datetime.combine(data_inicio, time.min),
+        datetime.combine(data_fim, time.max),
+    )
@@ -0,0 +1,42 @@
+"""
+Versões assíncronas (asyncpg) das rotas de RPA que acessam o banco.
+
+Registradas antes de ``routers.rpa`` quando ``DB_ASYNC=true``. Execução e
+agendamento continuam síncronos: não consultam o banco na requisição.
+"""
+from datetime import date
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import verificar_token
+from app.database.deps import get_async_read_db
+from app.models.rpa_log import RpaLog
+from app.routers.rpa import _filtrar_logs, _pagina_logs
+from app.schemas.rpa_log import RpaLogListResponse
+
+router = APIRouter(prefix="/rpa", tags=["RPA"], include_in_schema=False)
+
+
+@router.get("/logs", response_model=RpaLogListResponse)
+async def list_rpa_logs_async(
+    page: int = Query(1, ge=1),
+    size: int = Query(20, ge=1, le=100),
+    status: str | None = Query(None),
+    data_inicio: date | None = Query(None),
+    data_fim: date | None = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    user: str = Depends(verificar_token),
+):
+    query = _filtrar_logs(select(RpaLog), status, data_inicio, data_fim)
+
+    total = await db.scalar(select(func.count()).select_from(query.subquery()))
+
+    items = (await db.scalars(
+        query.order_by(RpaLog.execution_date.desc())
+        .offset((page - 1) * size)
+        .limit(size)
+    )).all()
+
+    return _pagina_logs(page, size, total, items)
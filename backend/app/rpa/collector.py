@@ -0,0 +1,325 @@
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager, nullcontext
+from datetime import date, timedelta
+
+from app.core.metrics import registro
+from app.core.settings import settings
+
+PAGINAS_COLETADAS = registro.contador("rpa_paginas_total", "Páginas de resultado lidas, por motor")
+LINHAS_COLETADAS = registro.contador("rpa_linhas_coletadas_total", "Atos lidos do SIJUT2, por motor")
+RETENTATIVAS = registro.contador(
+    "rpa_retentativas_total", "Novas tentativas da coleta (requisição HTTP, página ou janela)"
+)
+
+
+class PaginacaoInterrompida(Exception):
+    """A próxima página não carregou a tempo: o que veio até aqui é parcial."""
+
+
+class PrazoEsgotado(Exception):
+    """A coleta passou do prazo dado por quem a coordena (``Prazo``)."""
+
+
+class Prazo:
+    """
+    Prazo de uma coleta, contado a partir da criação.
+
+    O motor confere o prazo entre as páginas (``conferir``) e limita as
+    suas esperas ao que resta dele (``limitar``). Se o prazo passa com o
+    motor preso numa chamada, quem coordena chama ``expirar``, que fecha
+    os recursos registrados pelo motor com ``ao_expirar`` (o navegador):
+    a chamada pendente falha e a thread da coleta termina.
+    """
+
+    def __init__(self, segundos: float):
+        self.segundos = segundos
+        self.fim = time.monotonic() + segundos
+        self.expirado = False
+        self._fechar = []
+        self._suspenso_desde = None
+        self._lock = threading.Lock()
+
+    def restante(self) -> float:
+        return max(self.fim - time.monotonic(), 0.0)
+
+    def esgotado(self) -> bool:
+        with self._lock:
+            if self.expirado:
+                return True
+            return self._suspenso_desde is None and time.monotonic() >= self.fim
+
+    @contextmanager
+    def suspenso(self):
+        """O tempo dentro do bloco (à espera de quem consome as páginas) não conta."""
+        with self._lock:
+            self._suspenso_desde = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.fim += time.monotonic() - self._suspenso_desde
+                self._suspenso_desde = None
+
+    def conferir(self):
+        if self.esgotado():
+            raise PrazoEsgotado(f"Timeout após {self.segundos}s")
+
+    @contextmanager
+    def registrar(self, fechar: Callable[[], None]):
+        """Dentro do bloco, ``expirar`` chama ``fechar``."""
+        with self._lock:
+            expirado = self.expirado
+            if not expirado:
+                self._fechar.append(fechar)
+
+        if expirado:
+            fechar()
+            raise PrazoEsgotado(f"Timeout após {self.segundos}s")
+
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._fechar.remove(fechar)
+
+    def expirar(self):
+        with self._lock:
+            self.expirado = True
+            fechar = list(self._fechar)
+
+        for funcao in fechar:
+            try:
+                funcao()
+            except Exception:
+                pass
+
+
+def ao_expirar(prazo: Prazo | None, fechar: Callable[[], None]):
+    """``prazo.registrar(fechar)``, ou nada quando a coleta não tem prazo."""
+    return prazo.registrar(fechar) if prazo is not None else nullcontext()
+
+
+def limitar(segundos: float, prazo: Prazo | None) -> float:
+    """``segundos`` limitado ao que resta do prazo; levanta se ele já passou."""
+    if prazo is None:
+        return segundos
+    prazo.conferir()
+    return min(segundos, prazo.restante())
+
+
+def janela_padrao(
+    data_inicio: date | None = None,
+    data_fim: date | None = None,
+) -> tuple[date, date]:
+    """Completa o período da consulta: por padrão, os últimos 3 dias."""
+    data_fim = data_fim or date.today()
+    data_inicio = data_inicio or data_fim - timedelta(days=3)
+    return data_inicio, data_fim
+
+
+def acumular(metricas: dict, chave: str, segundos: float):
+    """Soma o tempo de uma etapa que se repete a cada página."""
+    metricas[chave] = metricas.get(chave, 0.0) + segundos
+
+
+def chave_ato(ato: dict) -> tuple[str, str, str]:
+    # Mesma unicidade da constraint uq_ato_unico
+    return ato["numero"], ato["data_publicacao"], ato["orgao"]
+
+
+def registrar_pagina(motor: str, linhas: int):
+    PAGINAS_COLETADAS.inc(motor=motor)
+    LINHAS_COLETADAS.inc(linhas, motor=motor)
+
+
+class Collector(ABC):
+    """
+    Interface comum dos motores de coleta do SIJUT2.
+
+    Cada implementação consulta o período informado e gera, página a
+    página, os atos no formato bruto do scraper (``tipo_ato``, ``numero``,
+    ``orgao``, ``data_publicacao``, ``ementa``). Se ``metricas`` for
+    informado, é preenchido com os tempos da coleta
+    (``tempo_ate_primeira_linha``, ``tempo_coleta``, ``paginas``...) e com
+    a soma, sobre as páginas, do tempo de carregamento (``tempo_fetch``) e
+    de leitura da tabela (``tempo_parse``). O tempo em que o gerador fica
+    suspenso entregando a página não entra em nenhuma das duas.
+
+    Com ``pagina_inicial``, a primeira página gerada é essa (o motor salta
+    até ela sem entregar as anteriores). Se a próxima página não carregar
+    a tempo, o motor levanta ``PaginacaoInterrompida`` em vez de encerrar
+    como se a listagem tivesse acabado.
+
+    Interromper o gerador (``close()``) encerra a coleta e libera os
+    recursos do motor. Com ``prazo`` (``Prazo``), o motor limita as suas
+    esperas ao que resta dele e registra o que ``Prazo.expirar`` deve
+    fechar para destravar uma chamada pendente.
+    """
+
+    nome: str
+    prazo: Prazo | None = None
+
+    @abstractmethod
+    def coletar_paginas(
+        self,
+        data_inicio: date | None = None,
+        data_fim: date | None = None,
+        metricas: dict | None = None,
+        pagina_inicial: int = 1,
+    ) -> Iterator[list[dict]]:
+        ...
+
+    def coletar(
+        self,
+        data_inicio: date | None = None,
+        data_fim: date | None = None,
+        metricas: dict | None = None,
+    ) -> list[dict]:
+        return [
+            ato
+            for pagina in self.coletar_paginas(data_inicio, data_fim, metricas)
+            for ato in pagina
+        ]
+
+
+def coletar_com_retomada(
+    collector: Collector,
+    data_inicio: date,
+    data_fim: date,
+    metricas: dict | None = None,
+    progresso: dict | None = None,
+    tentativas: int | None = None,
+    backoff: float | None = None,
+    backoff_max: float | None = None,
+) -> Iterator[list[dict]]:
+    """
+    Gera as páginas do collector retomando da última página concluída
+    quando a coleta falha, em vez de recomeçar da primeira.
+
+    ``progresso`` é atualizado a cada página entregue (``data_inicio``,
+    ``data_fim``, ``pagina``, ``chave_primeira_linha``, ``linhas`` e
+    ``linhas_coletadas``). Se já chegar preenchido para a mesma janela, a
+    coleta começa dali (retomada entre execuções).
+
+    A retomada relê a última página concluída e confere a chave da
+    primeira linha: se bate, a página é pulada; se a listagem mudou (atos
+    novos empurram as páginas), a coleta recomeça da primeira página e os
+    atos já entregues nesta chamada são descartados. Entre as tentativas
+    a espera dobra, de ``backoff`` até ``backoff_max`` segundos.
+
+    Ao final, ``progresso["estado"]`` é ``"completa"`` ou, se as tentativas
+    se esgotarem por ``PaginacaoInterrompida``, ``"truncada"`` (o gerador
+    termina sem erro, com o que foi coletado). Outras falhas esgotadas são
+    propagadas. Com o prazo do collector esgotado não há nova tentativa:
+    a coleta termina com ``PrazoEsgotado``.
+    """
+    tentativas = tentativas if tentativas is not None else settings.rpa_retomada_tentativas
+    backoff = backoff if backoff is not None else settings.rpa_retomada_backoff
+    backoff_max = backoff_max if backoff_max is not None else settings.rpa_retomada_backoff_max
+    metricas = metricas if metricas is not None else {}
+    progresso = progresso if progresso is not None else {}
+
+    janela = {"data_inicio": data_inicio, "data_fim": data_fim}
+    if any(progresso.get(campo) != valor for campo, valor in janela.items()):
+        progresso.clear()
+
+    progresso.update(janela, estado=None, erro=None)
+    progresso.setdefault("pagina", 0)
+    progresso.setdefault("chave_primeira_linha", None)
+    progresso.setdefault("linhas", 0)
+    progresso.setdefault("linhas_coletadas", 0)
+
+    prazo = collector.prazo
+    entregues = set()
+    lidas = 0
+    falhas = 0
+
+    while True:
+        if prazo is not None:
+            prazo.conferir()
+
+        conferir = progresso["pagina"]
+        numero = max(conferir, 1) - 1
+        paginas = collector.coletar_paginas(
+            data_inicio, data_fim, metricas=metricas, pagina_inicial=max(conferir, 1)
+        )
+
+        try:
+            for linhas in paginas:
+                if prazo is not None:
+                    prazo.conferir()
+
+                numero += 1
+                chave = list(chave_ato(linhas[0])) if linhas else None
+
+                if numero == conferir:
+                    conferir = 0
+                    if chave == progresso["chave_primeira_linha"]:
+                        continue
+
+                    # A listagem andou: a página salva não é mais a mesma
+                    print(f"Página {numero} mudou desde a última coleta; recomeçando da primeira")
+                    progresso.update(pagina=0, chave_primeira_linha=None, linhas=0)
+                    break
+
+                novos = [ato for ato in linhas if chave_ato(ato) not in entregues]
+                entregues.update(chave_ato(ato) for ato in novos)
+
+                progresso.update(
+                    pagina=numero,
+                    chave_primeira_linha=chave,
+                    linhas=len(linhas),
+                    linhas_coletadas=progresso["linhas_coletadas"] + len(novos),
+                )
+                lidas += 1
+
+                yield novos
+            else:
+                progresso["estado"] = "completa"
+                break
+
+        except Exception as exc:
+            falhas += 1
+            progresso["erro"] = str(exc)
+
+            # A falha pode ser o navegador fechado por Prazo.expirar
+            if prazo is not None and prazo.esgotado():
+                raise PrazoEsgotado(f"Timeout após {prazo.segundos}s") from exc
+
+            if falhas > tentativas:
+                if isinstance(exc, PaginacaoInterrompida):
+                    progresso["estado"] = "truncada"
+                    break
+                raise
+
+            espera = min(backoff * 2 ** (falhas - 1), backoff_max)
+            print(
+                f"Coleta interrompida após a página {progresso['pagina']} ({exc}); "
+                f"nova tentativa em {espera:.1f}s"
+            )
+            RETENTATIVAS.inc(tipo="pagina")
+            time.sleep(limitar(espera, prazo))
+
+        finally:
+            paginas.close()
+
+    metricas["paginas"] = lidas
+    metricas["tentativas"] = falhas + 1
+
+
+def criar_collector(engine: str | None = None, **kwargs) -> Collector:
+    engine = engine or settings.rpa_engine
+
+    # Imports locais: cada motor puxa dependências próprias (Selenium, HTTP)
+    if engine == "selenium":
+        from app.rpa.scraper_selenium import SeleniumCollector
+        return SeleniumCollector(**kwargs)
+
+    if engine == "http":
+        from app.rpa.scraper_http import HttpCollector
+        return HttpCollector(**kwargs)
+
+    raise ValueError(f"Motor de coleta desconhecido: {engine}")
@@ -0,0 +1,275 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service
+
+from app.core.metrics import registro
+from app.core.settings import settings
+from app.rpa.perfil_navegador import aplicar_opcoes, bloquear_recursos
+
+NAVEGADORES = registro.contador(
+    "rpa_navegadores_total",
+    "Navegadores abertos (criado) e fechados (descartado) pelo pool",
+)
+
+
+def criar_driver() -> webdriver.Chrome:
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--window-size=1920,1080")
+    aplicar_opcoes(options)
+
+    running_in_docker = os.getenv("RUNNING_IN_DOCKER", "false").lower() == "true"
+
+    if running_in_docker:
+        options.binary_location = "/usr/bin/chromium"
+        options.add_argument("--no-sandbox")
+        options.add_argument("--disable-dev-shm-usage")
+        driver = webdriver.Chrome(service=Service("/usr/bin/chromedriver"), options=options)
+    else:
+        # Windows/local: deixa o Selenium Manager resolver o driver automaticamente
+        driver = webdriver.Chrome(options=options)
+
+    try:
+        bloquear_recursos(driver)
+    except Exception:
+        driver.quit()
+        raise
+
+    return driver
+
+
+def derrubar_driver(driver, espera: float = 5):
+    """
+    Fecha, de outra thread, um navegador em uso por uma coleta presa.
+
+    O ``quit`` pode ficar atrás do comando pendente no chromedriver; se não
+    terminar em ``espera`` segundos, o processo do chromedriver é morto e a
+    chamada pendente falha na thread da coleta. O pool descarta o driver
+    quando ele é devolvido.
+    """
+    def _derrubar():
+        encerrando = threading.Thread(target=driver.quit, daemon=True)
+        encerrando.start()
+        encerrando.join(espera)
+
+        if encerrando.is_alive():
+            try:
+                driver.service.process.kill()
+            except Exception:
+                pass
+
+    threading.Thread(target=_derrubar, name="rpa-derrubar-driver", daemon=True).start()
+
+
+class _DriverEntry:
+    def __init__(self, driver):
+        self.driver = driver
+        self.usos = 0
+
+
+class DriverPool:
+    """
+    Pool de navegadores aquecidos compartilhado pelas coletas Selenium.
+
+    Mantém no mínimo ``min_size`` drivers prontos e nunca mais que
+    ``max_size`` abertos ao mesmo tempo; quem pede um driver além do
+    limite espera até ``timeout`` segundos. Cada driver é verificado
+    antes de ser entregue e é descartado após ``max_usos`` empréstimos
+    ou quando deixa de responder.
+    """
+
+    def __init__(self, min_size: int, max_size: int, max_usos: int, timeout: float):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_usos = max_usos
+        self.timeout = timeout
+
+        self._livres = deque()
+        self._total = 0
+        self._encerrado = False
+        self._cond = threading.Condition()
+
+        self.criados = 0
+        self.descartados = 0
+
+    @staticmethod
+    def _saudavel(driver) -> bool:
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _descartar(self, entrada: _DriverEntry):
+        try:
+            entrada.driver.quit()
+        except Exception:
+            pass
+
+        with self._cond:
+            self._total -= 1
+            self.descartados += 1
+            self._cond.notify()
+
+        NAVEGADORES.inc(evento="descartado")
+
+    def _criar(self) -> _DriverEntry:
+        try:
+            entrada = _DriverEntry(criar_driver())
+        except Exception:
+            with self._cond:
+                self._total -= 1
+                self._cond.notify()
+            raise
+
+        with self._cond:
+            self.criados += 1
+
+        NAVEGADORES.inc(evento="criado")
+        return entrada
+
+    def _reservar(self) -> tuple[_DriverEntry | None, bool]:
+        """Pega um driver livre ou reserva vaga para criar um novo."""
+        prazo = time.monotonic() + self.timeout
+
+        with self._cond:
+            while True:
+                if self._encerrado:
+                    raise RuntimeError("Pool de drivers encerrado")
+
+                if self._livres:
+                    return self._livres.popleft(), False
+
+                if self._total < self.max_size:
+                    self._total += 1
+                    return None, True
+
+                restante = prazo - time.monotonic()
+                if restante <= 0 or not self._cond.wait(restante):
+                    raise TimeoutError(
+                        f"Nenhum driver disponível após {self.timeout}s "
+                        f"({self.max_size} em uso)"
+                    )
+
+    def _obter(self) -> tuple[_DriverEntry, bool]:
+        while True:
+            entrada, criar = self._reservar()
+
+            if criar:
+                return self._criar(), False
+
+            if self._saudavel(entrada.driver):
+                return entrada, True
+
+            self._descartar(entrada)
+
+    def _devolver(self, entrada: _DriverEntry, falhou: bool):
+        entrada.usos += 1
+
+        reciclar = (
+            self._encerrado
+            or entrada.usos >= self.max_usos
+            or (falhou and not self._saudavel(entrada.driver))
+        )
+
+        if not reciclar:
+            try:
+                entrada.driver.delete_all_cookies()
+            except Exception:
+                reciclar = True
+
+        if reciclar:
+            self._descartar(entrada)
+            self._repor()
+            return
+
+        with self._cond:
+            self._livres.append(entrada)
+            self._cond.notify()
+
+    def _repor(self):
+        with self._cond:
+            faltam = self.min_size - self._total
+            if self._encerrado or faltam <= 0:
+                return
+            self._total += faltam
+
+        def _criar_faltantes():
+            for _ in range(faltam):
+                try:
+                    entrada = self._criar()
+                except Exception:
+                    continue
+
+                with self._cond:
+                    if self._encerrado:
+                        manter = False
+                    else:
+                        self._livres.append(entrada)
+                        self._cond.notify()
+                        manter = True
+
+                if not manter:
+                    self._descartar(entrada)
+
+        threading.Thread(target=_criar_faltantes, daemon=True).start()
+
+    def aquecer(self):
+        """Abre os drivers mínimos em segundo plano."""
+        self._repor()
+
+    @contextmanager
+    def emprestar(self, metricas: dict | None = None):
+        inicio = time.perf_counter()
+        entrada, reaproveitado = self._obter()
+
+        if metricas is not None:
+            metricas["tempo_obter_driver"] = time.perf_counter() - inicio
+            metricas["driver_reaproveitado"] = reaproveitado
+
+        falhou = True
+        try:
+            yield entrada.driver
+            falhou = False
+        finally:
+            self._devolver(entrada, falhou)
+
+    def encerrar(self):
+        with self._cond:
+            self._encerrado = True
+            livres = list(self._livres)
+            self._livres.clear()
+            self._cond.notify_all()
+
+        for entrada in livres:
+            self._descartar(entrada)
+
+    def status(self) -> dict:
+        with self._cond:
+            return {
+                "abertos": self._total,
+                "livres": len(self._livres),
+                "em_uso": self._total - len(self._livres),
+                "criados": self.criados,
+                "descartados": self.descartados,
+            }
+
+
+driver_pool = DriverPool(
+    min_size=settings.rpa_pool_min,
+    max_size=settings.rpa_pool_max,
+    max_usos=settings.rpa_pool_max_usos,
+    timeout=settings.rpa_pool_timeout,
+)
+
+registro.medidor(
+    "rpa_navegadores_abertos",
+    "Navegadores do pool, em uso ou livres",
+    funcao=lambda: [
+        ({"estado": estado}, driver_pool.status()[estado]) for estado in ("em_uso", "livres")
+    ],
+)
@@ -0,0 +1,194 @@
+"""
+Servidor local que reproduz as páginas gravadas do SIJUT2.
+
+Serve o formulário de consulta em GET ``.../consulta.action`` e as
+páginas de resultado em POST, escolhidas pelo campo ``p`` do formulário
+de paginação. Permite rodar e medir os dois motores de coleta sem
+acessar o site da Receita.
+
+Como o site real, o formulário abre uma sessão (cookie ``JSESSIONID``) e
+as páginas de resultado só são servidas a quem a apresenta.
+
+Os recursos estáticos (CSS, JS, imagens, fontes) vêm vazios, exceto os
+gravados em ``fixtures`` (``fontes.css``, que puxa uma webfont); com
+``--atraso-recursos`` cada um demora esse tanto de segundos, como num site
+cujos recursos pesam mais que o HTML. ``--atraso-paginas`` faz o mesmo
+com cada página de resultado.
+
+No lugar das páginas gravadas, ``iniciar_servidor(paginas=...)`` serve
+páginas montadas a partir de atos no formato bruto do scraper (as do
+gerador dos benchmarks, por exemplo), no mesmo HTML.
+
+Uso (a partir de ``backend/``):
+
+    python -m app.rpa.fixture_server --porta 8765 [--atraso-recursos 0.3] [--atraso-paginas 0.5]
+"""
+import argparse
+import threading
+import time
+import uuid
+from html import escape
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs
+
+FIXTURES = Path(__file__).resolve().parent / "fixtures" / "sijut2"
+
+CAMINHO_CONSULTA = "/sijut2consulta/consulta.action"
+
+TIPOS_ESTATICOS = {
+    ".css": "text/css",
+    ".js": "application/javascript",
+    ".png": "image/png",
+    ".woff2": "font/woff2",
+}
+
+COOKIE_SESSAO = "JSESSIONID"
+
+
+def renderizar_resultado(linhas: list[dict], pagina: int, total: int, ultima: bool) -> str:
+    """Página de resultado no HTML das gravadas, para atos no formato bruto do scraper."""
+    celulas = ("tipo_ato", "numero", "orgao", "data_publicacao", "ementa")
+    corpo = "\n".join(
+        '        <tr class="linhaResultados">'
+        + "".join(f"<td>{escape(ato[celula])}</td>" for celula in celulas)
+        + "</tr>"
+        for ato in linhas
+    )
+    desabilitado = " disabled" if ultima else ""
+
+    return f"""<!DOCTYPE html>
+<html lang="pt-BR">
+<head>
+  <meta charset="utf-8">
+  <title>SIJUT2 - Consulta de Atos Normativos</title>
+</head>
+<body>
+  <form id="formPaginacao" action="consulta.action" method="post">
+    <input type="hidden" name="p" value="{pagina + 1}">
+  </form>
+  <span id="totalRegistros">{total} atos encontrados</span>
+  <table id="tabelaAtos">
+    <thead>
+      <tr><th>Tipo do Ato</th><th>Número</th><th>Órgão/Unidade</th><th>Publicação</th><th>Ementa</th></tr>
+    </thead>
+    <tbody>
+{corpo}
+    </tbody>
+  </table>
+  <button id="btnProximaPagina2" type="submit" form="formPaginacao"{desabilitado}>Próxima</button>
+</body>
+</html>
+"""
+
+
+class Sijut2FixtureHandler(BaseHTTPRequestHandler):
+    atraso_recursos = 0.0
+    atraso_paginas = 0.0
+    paginas = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def _responder(self, status: int, corpo: bytes, content_type: str, cookie: str | None = None):
+        self.send_response(status)
+        if cookie:
+            self.send_header("Set-Cookie", f"{COOKIE_SESSAO}={cookie}; Path=/")
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(corpo)))
+        self.end_headers()
+        self.wfile.write(corpo)
+
+    def _pagina(self, nome: str, cookie: str | None = None):
+        arquivo = FIXTURES / nome
+        if not arquivo.exists():
+            self._responder(404, b"", "text/plain")
+            return
+        self._responder(200, arquivo.read_bytes(), "text/html; charset=utf-8", cookie)
+
+    def _pagina_gerada(self, pagina: int):
+        if not 1 <= pagina <= len(self.paginas):
+            self._responder(404, b"", "text/plain")
+            return
+
+        html = renderizar_resultado(
+            self.paginas[pagina - 1],
+            pagina,
+            sum(len(linhas) for linhas in self.paginas),
+            ultima=pagina == len(self.paginas),
+        )
+        self._responder(200, html.encode("utf-8"), "text/html; charset=utf-8")
+
+    def do_GET(self):
+        caminho = self.path.split("?", 1)[0]
+
+        if caminho == CAMINHO_CONSULTA:
+            self._pagina("consulta.html", cookie=uuid.uuid4().hex)
+            return
+
+        sufixo = Path(caminho).suffix
+        if sufixo in TIPOS_ESTATICOS:
+            time.sleep(self.atraso_recursos)
+            arquivo = FIXTURES / Path(caminho).name
+            corpo = arquivo.read_bytes() if arquivo.exists() else b""
+            self._responder(200, corpo, TIPOS_ESTATICOS[sufixo])
+            return
+
+        self._responder(404, b"", "text/plain")
+
+    def do_POST(self):
+        if self.path.split("?", 1)[0] != CAMINHO_CONSULTA:
+            self._responder(404, b"", "text/plain")
+            return
+
+        tamanho = int(self.headers.get("Content-Length", 0))
+        campos = parse_qs(self.rfile.read(tamanho).decode("utf-8"))
+        pagina = campos.get("p", ["1"])[0]
+
+        # Sem a sessão aberta pelo formulário, não há consulta em andamento
+        if COOKIE_SESSAO not in SimpleCookie(self.headers.get("Cookie", "")):
+            self._responder(403, b"", "text/plain")
+            return
+
+        time.sleep(self.atraso_paginas)
+
+        if self.paginas is not None:
+            self._pagina_gerada(int(pagina))
+        else:
+            self._pagina(f"resultado_p{pagina}.html")
+
+
+def iniciar_servidor(
+    porta: int = 0,
+    atraso_recursos: float = 0.0,
+    atraso_paginas: float = 0.0,
+    paginas: list[list[dict]] | None = None,
+) -> tuple[ThreadingHTTPServer, str]:
+    """Sobe o servidor em uma thread e devolve-o com a URL da consulta."""
+    handler = type("Sijut2FixtureHandler", (Sijut2FixtureHandler,), {
+        "atraso_recursos": atraso_recursos,
+        "atraso_paginas": atraso_paginas,
+        "paginas": paginas,
+    })
+    servidor = ThreadingHTTPServer(("127.0.0.1", porta), handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+
+    host, porta = servidor.server_address[:2]
+    return servidor, f"http://{host}:{porta}{CAMINHO_CONSULTA}"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--atraso-recursos", type=float, default=0.0)
+    parser.add_argument("--atraso-paginas", type=float, default=0.0)
+    args = parser.parse_args()
+
+    servidor, url = iniciar_servidor(args.porta, args.atraso_recursos, args.atraso_paginas)
+    print(f"SIJUT2 local em {url}")
+
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servidor.shutdown()
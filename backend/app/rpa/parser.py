@@ -0,0 +1,177 @@
+import re
+
+from lxml import html as lxml_html
+
+
+SELETOR_LINHAS = "#tabelaAtos tbody tr.linhaResultados"
+
+# Mesmo recorte do seletor CSS acima, sem depender do <tbody> (o HTML bruto
+# do servidor nem sempre o traz; o DOM do navegador sempre o insere).
+XPATH_LINHAS = (
+    "//table[@id='tabelaAtos']"
+    "//tr[contains(concat(' ', normalize-space(@class), ' '), ' linhaResultados ')]"
+)
+
+SCRIPT_TABELA = (
+    "var tabela = document.getElementById('tabelaAtos');"
+    "return tabela ? tabela.outerHTML : '';"
+)
+
+# Campo do formulário de paginação com o número da página pedida
+CAMPO_PAGINA = "p"
+
+# Salta para a página arguments[1] pelo formulário do botão "próxima página"
+# (arguments[0]). Devolve false se o formulário não tem o campo da página.
+SCRIPT_SALTAR = (
+    "var botao = arguments[0], formulario = botao.form;"
+    "var campo = formulario && formulario.elements[arguments[2]];"
+    "if (!campo) return false;"
+    "campo.value = arguments[1];"
+    "botao.click();"
+    "return true;"
+)
+
+
+def total_registros(html: str) -> int | None:
+    """Quantidade de atos informada em ``#totalRegistros`` ("1.234 atos encontrados")."""
+    documento = lxml_html.fromstring(html)
+    elementos = documento.xpath("//*[@id='totalRegistros']")
+
+    if not elementos:
+        return None
+
+    numero = re.search(r"\d[\d.]*", elementos[0].text_content())
+    return int(numero.group().replace(".", "")) if numero else None
+
+
+def _texto(celula) -> str:
+    # Normaliza os espaços como o WebElement.text do Selenium
+    return " ".join(celula.text_content().split())
+
+
+def parse_tabela_atos(html: str) -> list[dict]:
+    """
+    Extrai as linhas da tabela de resultados do SIJUT2 a partir do HTML.
+
+    Aceita tanto a página inteira quanto apenas o ``outerHTML`` de
+    ``#tabelaAtos`` e devolve os mesmos dicionários montados pelo
+    percurso célula a célula do Selenium.
+    """
+    if not html or not html.strip():
+        return []
+
+    documento = lxml_html.fromstring(html)
+    atos = []
+
+    for linha in documento.xpath(XPATH_LINHAS):
+        colunas = linha.xpath("./td")
+
+        if len(colunas) >= 5:
+            atos.append({
+                "tipo_ato": _texto(colunas[0]),
+                "numero": _texto(colunas[1]),
+                "orgao": _texto(colunas[2]),
+                "data_publicacao": _texto(colunas[3]),
+                "ementa": _texto(colunas[4]),
+            })
+
+    return atos
+
+
+def _formulario_de(documento, elemento):
+    # Botões fora do <form> apontam para ele pelo atributo "form"
+    form_id = elemento.get("form")
+
+    if form_id:
+        formularios = documento.xpath(f"//form[@id='{form_id}']")
+    else:
+        formularios = elemento.xpath("ancestor::form")
+
+    return formularios[0] if formularios else None
+
+
+def montar_consulta(
+    html: str,
+    base_url: str,
+    data_inicio: str,
+    data_fim: str,
+) -> tuple[str, list[tuple[str, str]]] | None:
+    """
+    Monta a submissão do formulário de consulta por período.
+
+    Localiza o formulário que contém ``#dt_inicio``, preserva os demais
+    campos (tokens, filtros ocultos) e preenche as datas. Devolve a URL
+    de destino e os pares ``(nome, valor)`` ou ``None`` se o formulário
+    não estiver na página.
+    """
+    documento = lxml_html.fromstring(html, base_url=base_url)
+    campos_data = {}
+
+    for id_campo, valor in (("dt_inicio", data_inicio), ("dt_fim", data_fim)):
+        encontrados = documento.xpath(f"//*[@id='{id_campo}']")
+        if not encontrados:
+            return None
+        campos_data[encontrados[0].get("name") or id_campo] = valor
+
+    formulario = _formulario_de(documento, documento.xpath("//*[@id='dt_inicio']")[0])
+
+    if formulario is None:
+        return None
+
+    campos = [
+        (nome, campos_data.get(nome, valor))
+        for nome, valor in formulario.form_values()
+    ]
+
+    for nome, valor in campos_data.items():
+        if nome not in dict(campos):
+            campos.append((nome, valor))
+
+    return formulario.action or base_url, campos
+
+
+def proxima_pagina(html: str, base_url: str) -> tuple[str, list[tuple[str, str]]] | None:
+    """
+    Devolve a submissão equivalente ao clique em ``#btnProximaPagina2``.
+
+    Retorna ``None`` quando o botão não existe ou está desabilitado,
+    ou seja, quando a página atual é a última.
+    """
+    documento = lxml_html.fromstring(html, base_url=base_url)
+    botoes = documento.xpath("//*[@id='btnProximaPagina2']")
+
+    if not botoes or botoes[0].get("disabled") is not None:
+        return None
+
+    botao = botoes[0]
+    formulario = _formulario_de(documento, botao)
+
+    if formulario is None:
+        return None
+
+    campos = formulario.form_values()
+
+    if botao.get("name"):
+        campos.append((botao.get("name"), botao.get("value", "")))
+
+    return formulario.action or base_url, campos
+
+
+def saltar_para_pagina(
+    consulta: tuple[str, list[tuple[str, str]]],
+    pagina: int,
+) -> tuple[str, list[tuple[str, str]]] | None:
+    """
+    Troca o número da página na submissão de ``proxima_pagina``, para ir
+    direto a ``pagina`` sem passar pelas anteriores. ``None`` se o
+    formulário não tem o campo da página.
+    """
+    action, campos = consulta
+
+    if not any(nome == CAMPO_PAGINA for nome, _ in campos):
+        return None
+
+    return action, [
+        (nome, str(pagina) if nome == CAMPO_PAGINA else valor)
+        for nome, valor in campos
+    ]
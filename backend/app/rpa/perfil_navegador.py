@@ -0,0 +1,67 @@
+"""
+Perfil enxuto do Chromium usado pela coleta.
+
+Do SIJUT2 só interessa o HTML da tabela: imagens, folhas de estilo,
+fontes e scripts de rastreamento são bloqueados pelo CDP
+(``Network.setBlockedURLs``) e a navegação volta no ``DOMContentLoaded``
+(``pageLoadStrategy=eager``), sem esperar o ``load`` dos recursos. Os
+seletores da coleta dependem só do DOM, que continua completo.
+
+Com ``rpa_perfil_enxuto=false`` o navegador sobe como antes (útil para
+comparar ou depurar visualmente).
+"""
+from selenium.webdriver.support.wait import POLL_FREQUENCY
+
+from app.core.settings import settings
+
+# Padrões do Network.setBlockedURLs: "*" casa qualquer trecho da URL, e o
+# "*" final cobre query strings de versão (estilo.css?v=3)
+RECURSOS_BLOQUEADOS = {
+    "imagens": ["*.png*", "*.jpg*", "*.jpeg*", "*.gif*", "*.webp*", "*.svg*", "*.ico*"],
+    "estilos": ["*.css*"],
+    "fontes": ["*.woff*", "*.ttf*", "*.otf*", "*.eot*"],
+    "rastreadores": [
+        "*google-analytics.com*",
+        "*googletagmanager.com*",
+        "*doubleclick.net*",
+        "*hotjar.com*",
+        "*/analytics.js*",
+    ],
+}
+
+
+def padroes_bloqueados(grupos: list[str] | None = None) -> list[str]:
+    grupos = settings.rpa_bloquear_recursos if grupos is None else grupos
+    desconhecidos = set(grupos) - set(RECURSOS_BLOQUEADOS)
+
+    if desconhecidos:
+        raise ValueError(f"Grupos de recursos desconhecidos: {sorted(desconhecidos)}")
+
+    return [padrao for grupo in grupos for padrao in RECURSOS_BLOQUEADOS[grupo]]
+
+
+def aplicar_opcoes(options):
+    """Opções de inicialização do perfil enxuto (antes de abrir o navegador)."""
+    if not settings.rpa_perfil_enxuto:
+        return
+
+    options.page_load_strategy = "eager"
+    options.add_argument("--disable-extensions")
+    options.add_argument("--disable-gpu")
+
+
+def bloquear_recursos(driver):
+    """Liga o bloqueio de recursos na sessão CDP do navegador recém-aberto."""
+    if not settings.rpa_perfil_enxuto:
+        return
+
+    padroes = padroes_bloqueados()
+
+    if padroes:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": padroes})
+
+
+def intervalo_espera() -> float:
+    """Intervalo de consulta dos ``WebDriverWait`` (o padrão do Selenium é 0,5 s)."""
+    return settings.rpa_wait_intervalo if settings.rpa_perfil_enxuto else POLL_FREQUENCY
@@ -0,0 +1,302 @@
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from app.core.settings import settings
+from app.rpa.collector import (
+    RETENTATIVAS,
+    Collector,
+    PaginacaoInterrompida,
+    Prazo,
+    acumular,
+    janela_padrao,
+    limitar,
+    registrar_pagina,
+)
+from app.rpa.parser import (
+    montar_consulta,
+    parse_tabela_atos,
+    proxima_pagina,
+    saltar_para_pagina,
+    total_registros,
+)
+
+
+class _RetryMedido(Retry):
+    # urllib3 cria uma instância nova a cada tentativa via increment()
+    def increment(self, *args, **kwargs):
+        RETENTATIVAS.inc(tipo="http")
+        return super().increment(*args, **kwargs)
+
+
+# Pool de conexões compartilhado entre execuções. Cada coleta usa a sua
+# própria Session (cookies e estado da consulta ficam isolados), mas todas
+# reaproveitam as conexões keep-alive deste adapter.
+_adapter = HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=_RetryMedido(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=None,
+    ),
+)
+
+
+def _nova_sessao() -> requests.Session:
+    session = requests.Session()
+    session.mount("http://", _adapter)
+    session.mount("https://", _adapter)
+    session.headers["User-Agent"] = "Mozilla/5.0 (API-RPA)"
+    return session
+
+
+def _enviar(session: requests.Session, consulta, pagina: int, timeout: float) -> requests.Response:
+    action, campos = consulta
+
+    try:
+        resposta = session.post(action, data=campos, timeout=timeout)
+    except requests.Timeout as exc:
+        raise PaginacaoInterrompida(f"Página {pagina} não respondeu em {timeout}s") from exc
+
+    resposta.raise_for_status()
+    return resposta
+
+
+def ultima_pagina(html: str, linhas_por_pagina: int) -> int | None:
+    """Número de páginas do resultado, pela quantidade em ``#totalRegistros``."""
+    total = total_registros(html)
+
+    if not total or not linhas_por_pagina:
+        return None
+
+    return math.ceil(total / linhas_por_pagina)
+
+
+def buscar_paginas(
+    consulta: tuple[str, list[tuple[str, str]]],
+    primeira: int,
+    ultima: int,
+    cookies,
+    simultaneas: int,
+    timeout: float,
+    metricas: dict,
+    user_agent: str | None = None,
+    prazo: Prazo | None = None,
+) -> Iterator[tuple[int, list[dict]]]:
+    """
+    Busca as páginas ``primeira``..``ultima`` de uma consulta já enviada,
+    até ``simultaneas`` ao mesmo tempo, e as gera na ordem.
+
+    Cada página é pedida reenviando o formulário de paginação
+    (``consulta``) com o número dela. O estado da pesquisa fica na sessão
+    do servidor, então cada thread usa uma Session própria com os
+    ``cookies`` de quem fez a consulta (a Session do motor HTTP ou o
+    navegador do Selenium). No máximo ``2 * simultaneas`` páginas ficam
+    prontas à espera de quem consome.
+
+    Se a última página ainda tem "próxima" (a listagem cresceu desde a
+    primeira), a coleta continua dali em sequência; uma página vazia no
+    meio encerra a coleta. Com ``prazo``, cada requisição espera no
+    máximo o que resta dele.
+    """
+    local = threading.local()
+
+    def _sessao() -> requests.Session:
+        if not hasattr(local, "sessao"):
+            local.sessao = _nova_sessao()
+            local.sessao.cookies.update(cookies)
+            if user_agent:
+                local.sessao.headers["User-Agent"] = user_agent
+        return local.sessao
+
+    def _buscar(pagina: int, submissao) -> tuple[list[dict], tuple | None, float, float]:
+        marco = time.perf_counter()
+        resposta = _enviar(_sessao(), submissao, pagina, limitar(timeout, prazo))
+        fetch = time.perf_counter() - marco
+
+        marco = time.perf_counter()
+        linhas = parse_tabela_atos(resposta.text)
+        proxima = proxima_pagina(resposta.text, resposta.url) if linhas else None
+        return linhas, proxima, fetch, time.perf_counter() - marco
+
+    executor = ThreadPoolExecutor(max_workers=simultaneas, thread_name_prefix="rpa-pagina")
+    pendentes = deque()
+    a_pedir = iter(range(primeira, ultima + 1))
+    proxima = None
+
+    def _pedir():
+        pagina = next(a_pedir, None)
+        if pagina is not None:
+            submissao = saltar_para_pagina(consulta, pagina)
+            pendentes.append((pagina, executor.submit(_buscar, pagina, submissao)))
+
+    try:
+        for _ in range(2 * simultaneas):
+            _pedir()
+
+        while pendentes:
+            pagina, futuro = pendentes.popleft()
+            linhas, proxima, fetch, parse = futuro.result()
+            acumular(metricas, "tempo_fetch", fetch)
+            acumular(metricas, "tempo_parse", parse)
+
+            if not linhas:
+                return
+
+            _pedir()
+            yield pagina, linhas
+
+        pagina = ultima
+
+        # A listagem cresceu: segue o botão "próxima" a partir da última
+        while proxima is not None:
+            pagina += 1
+            linhas, proxima, fetch, parse = _buscar(pagina, proxima)
+            acumular(metricas, "tempo_fetch", fetch)
+            acumular(metricas, "tempo_parse", parse)
+
+            if not linhas:
+                return
+
+            yield pagina, linhas
+    finally:
+        for _, futuro in pendentes:
+            futuro.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+        metricas["paginas_simultaneas"] = simultaneas
+
+
+def pode_buscar_em_paralelo(consulta, simultaneas: int, ultima: int | None, atual: int) -> bool:
+    """Vale buscar em paralelo: há páginas depois da atual e o formulário aceita o número da página."""
+    return (
+        simultaneas > 1
+        and consulta is not None
+        and ultima is not None
+        and ultima > atual
+        and saltar_para_pagina(consulta, atual + 1) is not None
+    )
+
+
+class HttpCollector(Collector):
+    """
+    Coleta o SIJUT2 sem navegador: envia o mesmo formulário de período
+    que o Selenium preenche e segue a paginação reenviando o formulário
+    do botão "próxima página".
+
+    Com ``simultaneas > 1``, depois da primeira página (que informa o
+    total de atos) as demais são buscadas em paralelo por
+    ``buscar_paginas`` e entregues na mesma ordem. Com ``prazo``, cada
+    requisição espera no máximo o que resta dele.
+    """
+
+    nome = "http"
+
+    def __init__(
+        self,
+        url: str | None = None,
+        timeout: int | None = None,
+        simultaneas: int | None = None,
+        prazo: Prazo | None = None,
+    ):
+        self.url = url or settings.sijut2_url
+        self.timeout = timeout or settings.rpa_http_timeout
+        self.simultaneas = simultaneas or settings.rpa_paginas_simultaneas
+        self.prazo = prazo
+
+    def coletar_paginas(
+        self,
+        data_inicio: date | None = None,
+        data_fim: date | None = None,
+        metricas: dict | None = None,
+        pagina_inicial: int = 1,
+    ):
+        metricas = metricas if metricas is not None else {}
+        inicio = time.perf_counter()
+        data_inicio, data_fim = janela_padrao(data_inicio, data_fim)
+        session = _nova_sessao()
+
+        # O carregamento do formulário conta como fetch da primeira página
+        marco = time.perf_counter()
+        resposta = session.get(self.url, timeout=limitar(self.timeout, self.prazo))
+        resposta.raise_for_status()
+
+        consulta = montar_consulta(
+            resposta.text,
+            resposta.url,
+            data_inicio.strftime("%d/%m/%Y"),
+            data_fim.strftime("%d/%m/%Y"),
+        )
+
+        if consulta is None:
+            raise Exception("Formulário de consulta do SIJUT2 não encontrado")
+
+        total = 0
+        lidas = 0
+        pagina = 1
+
+        def _entregar(linhas: list[dict]):
+            nonlocal total, lidas
+            if "tempo_ate_primeira_linha" not in metricas:
+                metricas["tempo_ate_primeira_linha"] = time.perf_counter() - inicio
+            total += len(linhas)
+            lidas += 1
+            registrar_pagina(self.nome, len(linhas))
+
+        while consulta is not None:
+            print(f"Processando página {pagina}")
+
+            resposta = _enviar(session, consulta, pagina, limitar(self.timeout, self.prazo))
+            acumular(metricas, "tempo_fetch", time.perf_counter() - marco)
+
+            marco = time.perf_counter()
+            linhas = parse_tabela_atos(resposta.text)
+            consulta = proxima_pagina(resposta.text, resposta.url) if linhas else None
+            acumular(metricas, "tempo_parse", time.perf_counter() - marco)
+
+            if not linhas:
+                break
+
+            if pagina >= pagina_inicial:
+                _entregar(linhas)
+                yield linhas
+
+            ultima = ultima_pagina(resposta.text, len(linhas)) if pagina == 1 else None
+
+            if pode_buscar_em_paralelo(consulta, self.simultaneas, ultima, pagina):
+                for pagina, linhas in buscar_paginas(
+                    consulta,
+                    max(pagina_inicial, 2),
+                    ultima,
+                    session.cookies,
+                    self.simultaneas,
+                    self.timeout,
+                    metricas,
+                    prazo=self.prazo,
+                ):
+                    _entregar(linhas)
+                    yield linhas
+                break
+
+            if pagina < pagina_inicial:
+                # Retomada: vai direto à página pedida quando o formulário permite
+                salto = consulta and saltar_para_pagina(consulta, pagina_inicial)
+                consulta, pagina = (salto, pagina_inicial) if salto else (consulta, pagina + 1)
+            else:
+                pagina += 1
+
+            marco = time.perf_counter()
+
+        print(f"Total capturado: {total}")
+
+        metricas["paginas"] = lidas
+        metricas["tempo_coleta"] = time.perf_counter() - inicio
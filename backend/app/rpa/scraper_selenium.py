@@ -1,42 +1,147 @@
-import os
-from selenium import webdriver
+import time
+from requests.cookies import RequestsCookieJar
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import NoSuchElementException, TimeoutException
 
-from datetime import datetime, timedelta
+from datetime import date
+
+from app.core.settings import settings
+from app.rpa.collector import (
+    Collector,
+    PaginacaoInterrompida,
+    Prazo,
+    acumular,
+    ao_expirar,
+    coletar_com_retomada,
+    janela_padrao,
+    limitar,
+    registrar_pagina,
+)
+from app.rpa.driver_pool import derrubar_driver, driver_pool
+from app.rpa.parser import (
+    CAMPO_PAGINA,
+    SCRIPT_SALTAR,
+    SCRIPT_TABELA,
+    SELETOR_LINHAS,
+    parse_tabela_atos,
+    proxima_pagina,
+)
+from app.rpa.perfil_navegador import intervalo_espera
+from app.rpa.scraper_http import buscar_paginas, pode_buscar_em_paralelo, ultima_pagina
+
+
+def _extrair_linhas_dom(driver) -> list[dict]:
+    """Percorre as linhas célula a célula (uma chamada WebDriver por célula)."""
+    atos = []
+    linhas = driver.find_elements(By.CSS_SELECTOR, SELETOR_LINHAS)
 
+    for linha in linhas:
+        colunas = linha.find_elements(By.TAG_NAME, "td")
 
-URL = "http://normas.receita.fazenda.gov.br/sijut2consulta/consulta.action"
+        if len(colunas) >= 5:
+            atos.append({
+                "tipo_ato": colunas[0].text,
+                "numero": colunas[1].text,
+                "orgao": colunas[2].text,
+                "data_publicacao": colunas[3].text,
+                "ementa": colunas[4].text
+            })
 
+    return atos
 
-def coletar_atos():
-    options = webdriver.ChromeOptions()
-    options.add_argument("--headless=new")
-    options.add_argument("--window-size=1920,1080")
 
-    running_in_docker = os.getenv("RUNNING_IN_DOCKER", "false").lower() == "true"
+def _extrair_linhas_html(driver) -> list[dict]:
+    """Lê o HTML de #tabelaAtos em uma única chamada e faz o parse localmente."""
+    return parse_tabela_atos(driver.execute_script(SCRIPT_TABELA))
 
-    if running_in_docker:
-        options.binary_location = "/usr/bin/chromium"
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        driver = webdriver.Chrome(service=Service("/usr/bin/chromedriver"), options=options)
-    else:
-        # Windows/local: deixa o Selenium Manager resolver o driver automaticamente
-        driver = webdriver.Chrome(options=options)
 
-    atos = []
+EXTRATORES = {
+    "dom": _extrair_linhas_dom,
+    "html": _extrair_linhas_html,
+}
+
 
+def _cookies_do_navegador(driver) -> RequestsCookieJar:
+    cookies = RequestsCookieJar()
+    for cookie in driver.get_cookies():
+        cookies.set(cookie["name"], cookie["value"], domain=cookie.get("domain"), path=cookie.get("path", "/"))
+    return cookies
+
+
+def _avancar(driver, wait, primeira_linha, pagina: int, destino: int) -> int | None:
+    """
+    Carrega a página seguinte à atual, ou salta direto para ``destino``
+    pelo formulário de paginação quando ainda não se chegou lá. Devolve o
+    número da página carregada, ou ``None`` se a atual é a última.
+    """
     try:
-        driver.get(URL)
-        wait = WebDriverWait(driver, 20)
+        botao_proxima = driver.find_element(By.ID, "btnProximaPagina2")
+    except NoSuchElementException:
+        return None
 
-        # ===== Intervalo (últimos 3 dias) =====
-        data_fim = datetime.today()
-        data_inicio = data_fim - timedelta(days=3)
+    if not botao_proxima.is_enabled():
+        return None
+
+    if destino > pagina + 1 and driver.execute_script(SCRIPT_SALTAR, botao_proxima, destino, CAMPO_PAGINA):
+        proxima = destino
+    else:
+        botao_proxima.click()
+        proxima = pagina + 1
+
+    # Espera a tabela atualizar. Sem isso a página seguinte se perderia
+    # calada e a coleta pareceria completa
+    try:
+        wait.until(EC.staleness_of(primeira_linha))
+    except TimeoutException as exc:
+        raise PaginacaoInterrompida(f"Página {proxima} não carregou a tempo") from exc
+
+    return proxima
+
+
+def coletar_paginas(
+    data_inicio: date | None = None,
+    data_fim: date | None = None,
+    modo_parse: str | None = None,
+    url: str | None = None,
+    metricas: dict | None = None,
+    pagina_inicial: int = 1,
+    simultaneas: int | None = None,
+    prazo: Prazo | None = None,
+):
+    """
+    Gera os atos de cada página de resultado assim que ela é lida.
+
+    Com ``simultaneas > 1``, o navegador faz a consulta e lê a primeira
+    página; as demais são pedidas em paralelo por HTTP, com os cookies do
+    navegador (``buscar_paginas``), e entregues na ordem. Com ``prazo``,
+    ``Prazo.expirar`` derruba o navegador emprestado.
+    """
+    extrair_linhas = EXTRATORES[modo_parse or settings.rpa_modo_parse]
+    metricas = metricas if metricas is not None else {}
+    simultaneas = simultaneas or settings.rpa_paginas_simultaneas
+    inicio = time.perf_counter()
+
+    total = 0
+    lidas = 0
+
+    def _entregar(linhas: list[dict]):
+        nonlocal total, lidas
+        if "tempo_ate_primeira_linha" not in metricas:
+            metricas["tempo_ate_primeira_linha"] = time.perf_counter() - inicio
+        total += len(linhas)
+        lidas += 1
+        registrar_pagina("selenium", len(linhas))
+
+    with driver_pool.emprestar(metricas) as driver, ao_expirar(prazo, lambda: derrubar_driver(driver)):
+        # Formulário, envio e primeira tabela contam como fetch da página 1
+        marco = time.perf_counter()
+        driver.get(url or settings.sijut2_url)
+        wait = WebDriverWait(driver, limitar(20, prazo), poll_frequency=intervalo_espera())
+
+        # ===== Intervalo (padrão: últimos 3 dias) =====
+        data_inicio, data_fim = janela_padrao(data_inicio, data_fim)
 
         data_inicio_str = data_inicio.strftime("%d/%m/%Y")
         data_fim_str = data_fim.strftime("%d/%m/%Y")
@@ -65,57 +170,107 @@ def coletar_atos():
         while True:
             print(f"Processando página {pagina}")
 
-            wait.until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "#tabelaAtos tbody tr.linhaResultados")
+            try:
+                primeira_linha = wait.until(
+                    EC.presence_of_element_located(
+                        (By.CSS_SELECTOR, SELETOR_LINHAS)
+                    )
                 )
-            )
+            except TimeoutException as exc:
+                raise PaginacaoInterrompida(f"Tabela da página {pagina} não carregou a tempo") from exc
+            acumular(metricas, "tempo_fetch", time.perf_counter() - marco)
 
-            linhas = driver.find_elements(
-                By.CSS_SELECTOR,
-                "#tabelaAtos tbody tr.linhaResultados"
-            )
+            marco = time.perf_counter()
+            linhas = extrair_linhas(driver)
+            acumular(metricas, "tempo_parse", time.perf_counter() - marco)
 
             if not linhas:
                 break
 
-            for linha in linhas:
-                colunas = linha.find_elements(By.TAG_NAME, "td")
-
-                if len(colunas) >= 5:
-                    atos.append({
-                        "tipo_ato": colunas[0].text,
-                        "numero": colunas[1].text,
-                        "orgao": colunas[2].text,
-                        "data_publicacao": colunas[3].text,
-                        "ementa": colunas[4].text
-                    })
-
-            # ===== Tentar ir para próxima página =====
-            try:
-                botao_proxima = driver.find_element(By.ID, "btnProximaPagina2")
-
-                if not botao_proxima.is_enabled():
+            # Retomada: as páginas anteriores à pedida não são entregues
+            if pagina >= pagina_inicial:
+                _entregar(linhas)
+                yield linhas
+
+            # ===== Demais páginas em paralelo, fora do navegador =====
+            if pagina == 1 and simultaneas > 1:
+                html = driver.page_source
+                consulta = proxima_pagina(html, driver.current_url)
+                ultima = ultima_pagina(html, len(linhas))
+
+                if pode_buscar_em_paralelo(consulta, simultaneas, ultima, pagina):
+                    for pagina, linhas in buscar_paginas(
+                        consulta,
+                        max(pagina_inicial, 2),
+                        ultima,
+                        _cookies_do_navegador(driver),
+                        simultaneas,
+                        settings.rpa_http_timeout,
+                        metricas,
+                        user_agent=driver.execute_script("return navigator.userAgent"),
+                        prazo=prazo,
+                    ):
+                        _entregar(linhas)
+                        yield linhas
                     break
 
-                primeira_linha = linhas[0]
-
-                botao_proxima.click()
-
-                # Espera a tabela atualizar
-                wait.until(EC.staleness_of(primeira_linha))
-
-                pagina += 1
-
-            except NoSuchElementException:
-                break
+            # ===== Tentar ir para próxima página =====
+            marco = time.perf_counter()
+            proxima = _avancar(driver, wait, primeira_linha, pagina, pagina_inicial)
 
-            except TimeoutException:
+            if proxima is None:
                 break
 
-        print(f"Total capturado: {len(atos)}")
-
-    finally:
-        driver.quit()
-
-    return atos
\ No newline at end of file
+            pagina = proxima
+
+        print(f"Total capturado: {total}")
+
+    metricas["paginas"] = lidas
+    metricas["tempo_coleta"] = time.perf_counter() - inicio
+
+
+def coletar_atos(
+    data_inicio: date | None = None,
+    data_fim: date | None = None,
+    modo_parse: str | None = None,
+    url: str | None = None,
+    metricas: dict | None = None,
+    progresso: dict | None = None,
+):
+    """
+    Todos os atos do período, retomando da última página lida em caso de
+    falha. ``progresso["estado"]`` diz se a coleta foi completa ou truncada.
+    """
+    data_inicio, data_fim = janela_padrao(data_inicio, data_fim)
+    paginas = coletar_com_retomada(
+        SeleniumCollector(modo_parse, url), data_inicio, data_fim, metricas, progresso
+    )
+    return [ato for pagina in paginas for ato in pagina]
+
+
+class SeleniumCollector(Collector):
+    nome = "selenium"
+
+    def __init__(
+        self,
+        modo_parse: str | None = None,
+        url: str | None = None,
+        simultaneas: int | None = None,
+        prazo: Prazo | None = None,
+    ):
+        self.modo_parse = modo_parse
+        self.url = url
+        self.simultaneas = simultaneas
+        self.prazo = prazo
+
+    def coletar_paginas(self, data_inicio=None, data_fim=None, metricas=None, pagina_inicial=1):
+        return coletar_paginas(
+            data_inicio,
+            data_fim,
+            modo_parse=self.modo_parse,
+            url=self.url,
+            metricas=metricas,
+            pagina_inicial=pagina_inicial,
+            simultaneas=self.simultaneas,
+            prazo=self.prazo,
+        )
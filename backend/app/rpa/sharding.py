@@ -0,0 +1,207 @@
+import queue
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+
+from app.core.settings import settings
+from app.rpa.collector import (
+    RETENTATIVAS,
+    Prazo,
+    PrazoEsgotado,
+    coletar_com_retomada,
+    criar_collector,
+)
+
+
+def dividir_periodo(data_inicio: date, data_fim: date, dias_por_shard: int) -> list[tuple[date, date]]:
+    """Quebra ``[data_inicio, data_fim]`` em janelas contíguas de até ``dias_por_shard`` dias."""
+    if dias_por_shard < 1:
+        raise ValueError("dias_por_shard deve ser >= 1")
+
+    janelas = []
+    atual = data_inicio
+
+    while atual <= data_fim:
+        fim = min(atual + timedelta(days=dias_por_shard - 1), data_fim)
+        janelas.append((atual, fim))
+        atual = fim + timedelta(days=1)
+
+    return janelas
+
+
+def criar_shards(data_inicio: date, data_fim: date, dias_por_shard: int | None = None) -> list[dict]:
+    """
+    Uma entrada por janela de ``dividir_periodo``, no formato que
+    ``coletar_em_shards`` atualiza durante a coleta.
+    """
+    janelas = dividir_periodo(data_inicio, data_fim, dias_por_shard or settings.rpa_shard_dias)
+
+    return [
+        {
+            "indice": indice,
+            "data_inicio": janela_inicio,
+            "data_fim": janela_fim,
+            "status": "pendente",
+            "tentativas": 0,
+            "linhas": 0,
+            "tempo_execucao": None,
+            "metricas": None,
+            "progresso": {},
+            "erro": None,
+        }
+        for indice, (janela_inicio, janela_fim) in enumerate(janelas)
+    ]
+
+
+def _entregar(saida: queue.Queue, pagina: list[dict], encerrar: threading.Event) -> bool:
+    """Põe a página na fila de saída; ``False`` se a coleta foi encerrada enquanto esperava."""
+    while not encerrar.is_set():
+        try:
+            saida.put(pagina, timeout=0.5)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _coletar_shard(
+    engine: str | None,
+    shard: dict,
+    controle: dict,
+    saida: queue.Queue,
+    encerrar: threading.Event,
+):
+    prazo = controle["prazo"]
+    # O progresso é o da janela: uma nova tentativa continua da última página entregue
+    paginas = coletar_com_retomada(
+        criar_collector(engine, prazo=prazo),
+        shard["data_inicio"],
+        shard["data_fim"],
+        metricas=controle["metricas"],
+        progresso=shard["progresso"],
+    )
+
+    try:
+        for pagina in paginas:
+            shard["linhas"] += len(pagina)
+
+            # Ingestão atrasada segura a coleta, mas não conta no prazo
+            with prazo.suspenso():
+                if not _entregar(saida, pagina, encerrar):
+                    return
+    finally:
+        paginas.close()
+
+
+def coletar_em_shards(
+    shards: list[dict],
+    engine: str | None = None,
+    workers: int | None = None,
+    timeout: float | None = None,
+    tentativas: int | None = None,
+) -> Iterator[list[dict]]:
+    """
+    Coleta as janelas de ``criar_shards`` em paralelo, gerando as páginas
+    à medida que cada janela as lê.
+
+    Cada janela roda em uma thread do pool com o seu próprio collector
+    (no Selenium, com um navegador emprestado do ``driver_pool``) e põe as
+    páginas numa fila de até ``2 * workers`` páginas: quando quem consome
+    fica para trás, as coletas esperam (o tempo de espera não conta no
+    ``timeout``). As páginas de janelas diferentes chegam intercaladas;
+    como as janelas não se sobrepõem, não se repetem entre elas.
+
+    Uma tentativa que falha ou passa de ``timeout`` segundos volta para a
+    fila até esgotar ``tentativas``, continuando da última página
+    entregue. Dentro de cada tentativa, falhas de página retomam da última
+    página lida (``coletar_com_retomada``); uma janela cuja paginação
+    parou por timeout termina com status ``"truncada"``. ``shards`` é
+    atualizado com o status, as tentativas, as linhas e as métricas de
+    cada janela.
+
+    O ``timeout`` conta desde a submissão da tentativa e é cumprido pelo
+    próprio collector (``Prazo``): esgotado, o navegador é derrubado e a
+    thread termina com ``PrazoEsgotado``. A tentativa só sai do pool
+    quando a thread termina, então uma coleta presa não divide a vaga
+    com a nova tentativa. Fechar o gerador encerra as coletas em curso.
+    """
+    workers = workers or settings.rpa_shard_workers
+    timeout = timeout or settings.rpa_shard_timeout
+    tentativas = tentativas or settings.rpa_shard_tentativas
+
+    fila = deque(shards)
+    ativos = {}
+    saida = queue.Queue(maxsize=2 * workers)
+    encerrar = threading.Event()
+
+    def _falhou(shard: dict, erro: str):
+        shard["erro"] = erro
+        if shard["tentativas"] < tentativas:
+            RETENTATIVAS.inc(tipo="shard")
+            fila.append(shard)
+        else:
+            shard["status"] = "erro"
+
+    def _concluir(futuro):
+        shard, controle = ativos.pop(futuro)
+        shard["metricas"] = controle["metricas"]
+        shard["tempo_execucao"] = time.perf_counter() - controle["iniciado_em"]
+
+        try:
+            futuro.result()
+        except PrazoEsgotado:
+            _falhou(shard, f"Timeout após {timeout}s")
+            return
+        except Exception as exc:
+            _falhou(shard, str(exc))
+            return
+
+        progresso = shard["progresso"]
+        truncada = progresso.get("estado") == "truncada"
+        shard.update(
+            status="truncada" if truncada else "sucesso",
+            erro=progresso.get("erro") if truncada else None,
+        )
+
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="rpa-shard")
+
+    try:
+        while fila or ativos:
+            while fila and len(ativos) < workers:
+                shard = fila.popleft()
+                shard["tentativas"] += 1
+                controle = {
+                    "iniciado_em": time.perf_counter(),
+                    "prazo": Prazo(timeout),
+                    "metricas": {},
+                }
+                futuro = executor.submit(_coletar_shard, engine, shard, controle, saida, encerrar)
+                ativos[futuro] = (shard, controle)
+
+            try:
+                pagina = saida.get(timeout=0.5)
+            except queue.Empty:
+                pass
+            else:
+                yield pagina
+
+            for futuro in list(ativos):
+                prazo = ativos[futuro][1]["prazo"]
+
+                if futuro.done():
+                    _concluir(futuro)
+                elif prazo.esgotado() and not prazo.expirado:
+                    # Destrava a coleta; a vaga é liberada quando a thread terminar
+                    prazo.expirar()
+
+        # Páginas postas na fila pelas últimas janelas antes de terminarem
+        while not saida.empty():
+            yield saida.get_nowait()
+    finally:
+        encerrar.set()
+        for _, controle in ativos.values():
+            controle["prazo"].expirar()
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -3,7 +3,11 @@ from datetime import date
 from uuid import UUID
 from typing import Optional
 from datetime import date
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
+
+# Itens por chamada em PATCH/DELETE /atos/batch: com seis valores por ato,
+# fica abaixo do limite de 32767 parâmetros por comando do asyncpg
+LOTE_MAX = 5000
 
 
 class AtoBase(BaseModel):
@@ -25,6 +29,29 @@ class AtoUpdate(BaseModel):
     ementa: Optional[str] = None
 
 
+class AtoFiltroLote(BaseModel):
+    data_inicio: Optional[date] = None
+    data_fim: Optional[date] = None
+    orgao_unidade: Optional[str] = None
+    tipo_ato: Optional[str] = None
+
+
+class AtoAtualizacaoLote(AtoUpdate):
+    id: UUID
+
+
+class AtosAtualizacaoLote(BaseModel):
+    # Alterações por id, ou as mesmas alterações em todos os atos do filtro
+    atos: Optional[list[AtoAtualizacaoLote]] = Field(None, max_length=LOTE_MAX)
+    filtro: Optional[AtoFiltroLote] = None
+    alteracoes: Optional[AtoUpdate] = None
+
+
+class AtosExclusaoLote(BaseModel):
+    ids: Optional[list[UUID]] = Field(None, max_length=LOTE_MAX)
+    filtro: Optional[AtoFiltroLote] = None
+
+
 class AtoResponse(AtoBase):
     id: UUID
 
@@ -21,6 +21,9 @@ class RpaLogBase(BaseModel):
 class RpaLogResponse(RpaLogBase):
     id: UUID
     execution_date: datetime
+    etapas: Optional[dict[str, float]] = None
+    linhas_vistas: Optional[int] = None
+    linhas_duplicadas: Optional[int] = None
 
     class Config:
         from_attributes = True
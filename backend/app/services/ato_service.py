@@ -1,31 +1,151 @@
+import csv
+import io
+from collections import Counter
+from sqlalchemy import String, and_, case, cast, column, exists, func, literal, or_, select, text, update, values
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.util import await_only
+from sqlalchemy.dialects.postgresql import UUID, insert
+from sqlalchemy.orm import aliased
+from app.core.cache import response_cache
+from app.core.settings import settings
 from app.models.ato import Ato
 from app.models.rpa_log import RpaLog
+from app.services.resumo_service import aplicar_variacoes
 import time
 
+COLUNAS_COPY = ("tipo_ato", "numero_ato", "orgao_unidade", "publicacao", "ementa")
+
+# Tabela temporária por conexão; ON COMMIT DELETE ROWS permite reaproveitá-la
+# entre lotes sem recriar o catálogo a cada chamada.
+SQL_STAGING = text("""
+    CREATE TEMP TABLE IF NOT EXISTS atos_staging (
+        tipo_ato VARCHAR(255),
+        numero_ato VARCHAR(100),
+        orgao_unidade VARCHAR(255),
+        publicacao DATE,
+        ementa TEXT
+    ) ON COMMIT DELETE ROWS
+""")
+
+# No CSV, campo vazio sem aspas vira NULL: FORCE_NOT_NULL mantém o texto
+# vazio (uma ementa em branco) como '' e não quebra o NOT NULL de atos
+SQL_COPY_STAGING = (
+    f"COPY atos_staging ({', '.join(COLUNAS_COPY)}) FROM STDIN WITH "
+    "(FORMAT csv, FORCE_NOT_NULL (tipo_ato, numero_ato, orgao_unidade, ementa))"
+)
+
+# Insere os novos atos e soma no resumo diário apenas os que entraram de fato
+SQL_MERGE_STAGING = text("""
+    WITH novos AS (
+        INSERT INTO atos (id, tipo_ato, numero_ato, orgao_unidade, publicacao, ementa, created_at)
+        SELECT gen_random_uuid(), tipo_ato, numero_ato, orgao_unidade, publicacao, ementa,
+               timezone('utc', now())
+        FROM atos_staging
+        ON CONFLICT ON CONSTRAINT uq_ato_unico DO NOTHING
+        RETURNING publicacao, orgao_unidade, tipo_ato
+    ),
+    resumo AS (
+        INSERT INTO atos_resumo_diario (publicacao, orgao_unidade, tipo_ato, quantidade)
+        SELECT publicacao, orgao_unidade, tipo_ato, count(*)
+        FROM novos
+        GROUP BY publicacao, orgao_unidade, tipo_ato
+        ORDER BY publicacao, orgao_unidade, tipo_ato
+        ON CONFLICT (publicacao, orgao_unidade, tipo_ato)
+        DO UPDATE SET quantidade = atos_resumo_diario.quantidade + excluded.quantidade
+    )
+    SELECT count(*) FROM novos
+""")
+
 def _chunks(data: list[dict], size: int):
     for i in range(0, len(data), size):
         yield data[i:i + size]
 
-def salvar_lote_atos(db: Session, atos_data: list[dict], chunk_size: int = 500):
+def _inserir_em_chunks(db: Session, atos_data: list[dict], chunk_size: int) -> int:
+    total = 0
+    variacoes = Counter()
+    for chunk in _chunks(atos_data, chunk_size):
+        stmt = (
+            insert(Ato)
+            .values(chunk)
+            .on_conflict_do_nothing(constraint="uq_ato_unico")
+            .returning(Ato.publicacao, Ato.orgao_unidade, Ato.tipo_ato)
+        )
+        inseridos = db.execute(stmt).all()
+        variacoes.update(tuple(linha) for linha in inseridos)
+        total += len(inseridos)
+    aplicar_variacoes(db, variacoes)
+    return total
+
+def _suporta_copy(db: Session) -> bool:
+    dialect = db.get_bind().dialect
+    return dialect.name == "postgresql" and dialect.driver in ("psycopg2", "asyncpg")
+
+def _copiar_asyncpg(db: Session, atos_data: list[dict]):
+    # Chamado dentro de AsyncSession.run_sync: a corrotina do asyncpg é
+    # aguardada pelo greenlet do SQLAlchemy
+    conexao = db.connection().connection.driver_connection
+    await_only(conexao.copy_records_to_table(
+        "atos_staging",
+        records=[tuple(ato[coluna] for coluna in COLUNAS_COPY) for ato in atos_data],
+        columns=COLUNAS_COPY,
+    ))
+
+def _inserir_via_copy(db: Session, atos_data: list[dict], copy_chunk_size: int = 50_000) -> int:
+    """
+    Carrega os atos com COPY em uma tabela temporária e faz um único
+    ``INSERT ... SELECT ... ON CONFLICT DO NOTHING`` na tabela ``atos``.
+    """
+    db.execute(SQL_STAGING)
+
+    if db.get_bind().dialect.driver == "asyncpg":
+        _copiar_asyncpg(db, atos_data)
+        return db.execute(SQL_MERGE_STAGING).scalar_one()
+
+    cursor = db.connection().connection.cursor()
+
+    try:
+        for chunk in _chunks(atos_data, copy_chunk_size):
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            for ato in chunk:
+                writer.writerow([ato[coluna] for coluna in COLUNAS_COPY])
+            buffer.seek(0)
+
+            cursor.copy_expert(SQL_COPY_STAGING, buffer)
+    finally:
+        cursor.close()
+
+    return db.execute(SQL_MERGE_STAGING).scalar_one()
+
+def salvar_lote_atos(
+    db: Session,
+    atos_data: list[dict],
+    chunk_size: int = 500,
+    metodo: str | None = None,
+    registrar_log: bool = True,
+    invalidar_cache: bool = True,
+):
     inicio = time.time()
     total = 0
     status = "SUCESSO"
     error_message = None
+    metodo = metodo or settings.ingest_metodo
 
     try:
-        for chunk in _chunks(atos_data, chunk_size):
-            stmt = (
-                insert(Ato)
-                .values(chunk)
-                .on_conflict_do_nothing(constraint="uq_ato_unico")
-            )
-            result = db.execute(stmt)
-            total += result.rowcount or 0
+        # COPY só existe no Postgres via psycopg2; demais engines usam INSERT em chunks
+        if metodo == "copy" and atos_data and _suporta_copy(db):
+            total = _inserir_via_copy(db, atos_data)
+        else:
+            total = _inserir_em_chunks(db, atos_data, chunk_size)
 
         db.commit()
 
+        # Só lotes que inseriram algo mudam as leituras em cache
+        if total and invalidar_cache:
+            response_cache.invalidar()
+
     except Exception as exc:
         db.rollback()
         status = "ERRO"
@@ -33,18 +153,391 @@ def salvar_lote_atos(db: Session, atos_data: list[dict], chunk_size: int = 500):
 
     tempo_execucao = time.time() - inicio
 
-    log = RpaLog(
-        total_registros=total,
-        status=status,
-        error_message=error_message,
-        execution_time=tempo_execucao,
-    )
-    db.add(log)
-    db.commit()
+    # O RPA registra um log por execução (com as etapas), não um por lote
+    if registrar_log:
+        log = RpaLog(
+            total_registros=total,
+            status=status,
+            error_message=error_message,
+            execution_time=tempo_execucao,
+        )
+        db.add(log)
+        db.commit()
 
     return {
         "status": status.lower(),
         "total_registros": total,
         "execution_time": tempo_execucao,
         "error_message": error_message,
-    }
\ No newline at end of file
+    }
+
+
+async def salvar_lote_atos_async(
+    db: AsyncSession,
+    atos_data: list[dict],
+    chunk_size: int = 500,
+    metodo: str | None = None,
+    registrar_log: bool = True,
+):
+    """
+    Versão de ``salvar_lote_atos`` para ``AsyncSession`` (asyncpg).
+
+    Reaproveita a mesma implementação via ``run_sync``: os comandos SQL
+    continuam assíncronos na conexão asyncpg, sem ocupar uma thread. O
+    cache é invalidado depois, fora do ``run_sync``, que roda no event loop.
+    """
+    resultado = await db.run_sync(
+        salvar_lote_atos, atos_data, chunk_size, metodo, registrar_log, invalidar_cache=False
+    )
+
+    if resultado["status"] == "sucesso" and resultado["total_registros"]:
+        await response_cache.invalidar_async()
+
+    return resultado
+
+
+CAMPOS_ATUALIZAVEIS = ("tipo_ato", "numero_ato", "orgao_unidade", "publicacao", "ementa")
+
+# Colunas de uq_ato_unico: alterá-las pode colidir com outro ato
+CAMPOS_CHAVE = ("numero_ato", "publicacao", "orgao_unidade")
+
+# Conferências dos conflitos quando outra transação grava a mesma chave
+TENTATIVAS_CONFLITO = 3
+
+
+def _condicoes_filtro(filtro: dict) -> list:
+    condicoes = [Ato.deleted_at.is_(None)]
+
+    if filtro.get("data_inicio"):
+        condicoes.append(Ato.publicacao >= filtro["data_inicio"])
+    if filtro.get("data_fim"):
+        condicoes.append(Ato.publicacao <= filtro["data_fim"])
+    if filtro.get("orgao_unidade"):
+        condicoes.append(Ato.orgao_unidade == filtro["orgao_unidade"])
+    if filtro.get("tipo_ato"):
+        condicoes.append(Ato.tipo_ato == filtro["tipo_ato"])
+
+    return condicoes
+
+
+def _valores_por_id(atualizacoes: list[dict]):
+    """
+    CTE ``v`` (id + campos) com uma linha por ato, montada com ``VALUES``.
+    Campo ausente vira NULL e mantém o valor atual (todos são NOT NULL).
+    """
+    tipos = {campo: Ato.__table__.c[campo].type for campo in CAMPOS_ATUALIZAVEIS}
+    linhas = values(
+        column("id", UUID(as_uuid=True)),
+        *(column(campo, tipo) for campo, tipo in tipos.items()),
+        name="valores",
+    ).data([
+        (atualizacao["id"], *(atualizacao.get(campo) for campo in CAMPOS_ATUALIZAVEIS))
+        for atualizacao in atualizacoes
+    ])
+
+    # Coluna só com NULL no VALUES sairia como text: o CAST mantém o tipo
+    return select(
+        linhas.c.id,
+        *(cast(linhas.c[campo], tipo).label(campo) for campo, tipo in tipos.items()),
+    ).cte("v")
+
+
+def _valores_por_filtro(filtro: dict, alteracoes: dict):
+    """CTE ``v`` com as mesmas ``alteracoes`` para cada ato ativo do filtro."""
+    return select(
+        Ato.id,
+        *(
+            cast(literal(alteracoes.get(campo)), Ato.__table__.c[campo].type).label(campo)
+            for campo in CAMPOS_ATUALIZAVEIS
+        ),
+    ).where(*_condicoes_filtro(filtro)).cte("v")
+
+
+def _conflitos(db: Session, v) -> tuple[set, dict]:
+    """
+    Atos do lote cuja nova chave de ``uq_ato_unico`` não pode ser aplicada:
+    já é de um ato fora do lote (ou de um do lote que a mantém), se repete
+    no lote ou é a chave atual de um ato do lote que também fica de fora.
+    Só contam os atos cuja chave muda; a chave atual dos que são
+    renomeados no lote fica livre para os demais.
+
+    Devolve também, para os atos renomeados cuja chave atual passa a outro
+    do lote, o ``numero_ato`` atual (ver ``_liberar_chaves``).
+    """
+    muda = or_(*(
+        and_(v.c[campo].is_not(None), v.c[campo] != getattr(Ato, campo)) for campo in CAMPOS_CHAVE
+    ))
+    novos = (
+        select(
+            Ato.id,
+            *(getattr(Ato, campo).label(f"{campo}_atual") for campo in CAMPOS_CHAVE),
+            *(func.coalesce(v.c[campo], getattr(Ato, campo)).label(campo) for campo in CAMPOS_CHAVE),
+        )
+        .join(v, Ato.id == v.c.id)
+        .where(Ato.deleted_at.is_(None), muda)
+        .cte("novos")
+    )
+    # Inclui os excluídos: a constraint vale para eles também
+    outro = aliased(Ato)
+    ocupante = novos.alias("ocupante")
+    renomeado = novos.alias("renomeado")
+
+    consulta = select(
+        novos.c.id,
+        novos.c.numero_ato_atual,
+        exists().where(
+            *(getattr(outro, campo) == novos.c[campo] for campo in CAMPOS_CHAVE),
+            outro.id != novos.c.id,
+            ~exists().where(renomeado.c.id == outro.id),
+        ).label("externo"),
+        (func.count().over(partition_by=[novos.c[campo] for campo in CAMPOS_CHAVE]) > 1).label("repetido"),
+        select(ocupante.c.id)
+        .where(*(ocupante.c[f"{campo}_atual"] == novos.c[campo] for campo in CAMPOS_CHAVE))
+        .scalar_subquery()
+        .label("ocupante"),
+    )
+    linhas = db.execute(consulta).all()
+
+    conflitos = {linha.id for linha in linhas if linha.externo or linha.repetido}
+
+    # Quem quer a chave de um ato que não vai mudar também fica de fora
+    alterou = True
+    while alterou:
+        alterou = False
+        for linha in linhas:
+            if linha.id not in conflitos and linha.ocupante in conflitos:
+                conflitos.add(linha.id)
+                alterou = True
+
+    numeros = {linha.id: linha.numero_ato_atual for linha in linhas}
+    liberar = {
+        linha.ocupante: numeros[linha.ocupante]
+        for linha in linhas
+        if linha.id not in conflitos and linha.ocupante is not None
+    }
+    return conflitos, liberar
+
+
+def _liberar_chaves(db: Session, liberar: dict):
+    """
+    ``uq_ato_unico`` não é deferível: o Postgres confere a chave linha a
+    linha, então um ato só pode assumir a chave de outro do lote depois que
+    este a deixou. Os atos em ``liberar`` recebem antes um ``numero_ato``
+    provisório e único; o ``UPDATE`` do lote grava o valor final.
+    """
+    if liberar:
+        db.execute(
+            update(Ato.__table__)
+            .where(Ato.__table__.c.id.in_(liberar))
+            .values(numero_ato=func.concat("~", cast(Ato.__table__.c.id, String)))
+        )
+
+
+def _atualizar(db: Session, v, conflitos: set, liberar: dict) -> list:
+    # Valores anteriores (para o resumo diário), com as linhas já travadas
+    antes = (
+        select(Ato.id, Ato.publicacao, Ato.orgao_unidade, Ato.tipo_ato)
+        .join(v, Ato.id == v.c.id)
+        .where(Ato.deleted_at.is_(None))
+        .with_for_update(of=Ato)
+        .cte("antes")
+    )
+    atos = Ato.__table__
+
+    valores = {campo: func.coalesce(v.c[campo], atos.c[campo]) for campo in CAMPOS_ATUALIZAVEIS}
+    if liberar:
+        # O número provisório não vale como "valor atual"
+        valores["numero_ato"] = func.coalesce(
+            v.c.numero_ato, case(liberar, value=atos.c.id, else_=atos.c.numero_ato)
+        )
+
+    stmt = (
+        update(atos)
+        .where(
+            atos.c.id == v.c.id,
+            atos.c.id == antes.c.id,
+            atos.c.publicacao == antes.c.publicacao,
+        )
+        .values(**valores, updated_at=func.timezone("utc", func.now()))
+        .returning(
+            atos.c.id,
+            antes.c.publicacao,
+            antes.c.orgao_unidade,
+            antes.c.tipo_ato,
+            atos.c.publicacao,
+            atos.c.orgao_unidade,
+            atos.c.tipo_ato,
+        )
+    )
+
+    if conflitos:
+        stmt = stmt.where(atos.c.id.not_in(conflitos))
+
+    return db.execute(stmt).all()
+
+
+def _aplicar_atualizacao(db: Session, v, altera_chave: bool) -> tuple[list, set]:
+    """
+    Um único ``UPDATE atos ... FROM v``: só os campos informados mudam.
+    Devolve as linhas atualizadas (id, chave do resumo antes e depois) e
+    os ids deixados de fora por conflito em ``uq_ato_unico``.
+
+    Quando a chave muda, os atos do lote são travados antes da conferência
+    dos conflitos. Um ato gravado ao mesmo tempo por outra transação com
+    uma das novas chaves ainda viola a constraint: o lote volta ao
+    savepoint e é conferido de novo, agora enxergando esse ato.
+    """
+    if not altera_chave:
+        return _atualizar(db, v, set(), {}), set()
+
+    for tentativa in range(TENTATIVAS_CONFLITO):
+        try:
+            with db.begin_nested():
+                db.execute(
+                    select(Ato.id).join(v, Ato.id == v.c.id)
+                    .where(Ato.deleted_at.is_(None))
+                    .with_for_update(of=Ato)
+                )
+                conflitos, liberar = _conflitos(db, v)
+                _liberar_chaves(db, liberar)
+                return _atualizar(db, v, conflitos, liberar), conflitos
+        except IntegrityError:
+            if tentativa == TENTATIVAS_CONFLITO - 1:
+                raise
+
+
+def _resultado_lote(contagens: dict, resultados: dict) -> dict:
+    return {
+        **contagens,
+        "resultados": [{"id": ato_id, "resultado": resultado} for ato_id, resultado in resultados.items()],
+    }
+
+
+def atualizar_lote_atos(
+    db: Session,
+    atualizacoes: list[dict] | None = None,
+    filtro: dict | None = None,
+    alteracoes: dict | None = None,
+    invalidar_cache: bool = True,
+) -> dict:
+    """
+    Atualiza vários atos numa transação: ``atualizacoes`` traz o ``id`` e
+    os campos alterados de cada ato; com ``filtro``, as mesmas
+    ``alteracoes`` valem para todos os atos ativos que o atendem.
+
+    Atos que colidiriam com outro em ``uq_ato_unico`` ficam de fora
+    (``conflito``); ids inexistentes ou excluídos, ``nao_encontrado``.
+    O resumo diário é ajustado na mesma transação.
+    """
+    if filtro is not None:
+        v = _valores_por_filtro(filtro, alteracoes)
+        altera_chave = any(alteracoes.get(campo) is not None for campo in CAMPOS_CHAVE)
+        pedidos = []
+    else:
+        v = _valores_por_id(atualizacoes)
+        altera_chave = any(
+            atualizacao.get(campo) is not None
+            for atualizacao in atualizacoes
+            for campo in CAMPOS_CHAVE
+        )
+        pedidos = [atualizacao["id"] for atualizacao in atualizacoes]
+
+    try:
+        linhas, conflitos = _aplicar_atualizacao(db, v, altera_chave)
+
+        variacoes = Counter()
+        for _, *chaves in linhas:
+            anterior, nova = tuple(chaves[:3]), tuple(chaves[3:])
+            if anterior != nova:
+                variacoes.update({anterior: -1, nova: 1})
+        aplicar_variacoes(db, variacoes)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if linhas and invalidar_cache:
+        response_cache.invalidar()
+
+    resultados = dict.fromkeys(pedidos, "nao_encontrado")
+    resultados.update(dict.fromkeys(conflitos, "conflito"))
+    resultados.update(dict.fromkeys((linha[0] for linha in linhas), "atualizado"))
+
+    return _resultado_lote(
+        {
+            "atualizados": len(linhas),
+            "conflitos": len(conflitos),
+            "nao_encontrados": sum(resultado == "nao_encontrado" for resultado in resultados.values()),
+        },
+        resultados,
+    )
+
+
+def excluir_lote_atos(
+    db: Session,
+    ids: list | None = None,
+    filtro: dict | None = None,
+    invalidar_cache: bool = True,
+) -> dict:
+    """
+    Exclusão lógica de vários atos (por ``ids`` ou ``filtro``) num único
+    ``UPDATE``, descontando-os do resumo diário na mesma transação.
+    """
+    atos = Ato.__table__
+    stmt = update(atos).values(deleted_at=func.timezone("utc", func.now()))
+
+    if filtro is not None:
+        stmt = stmt.where(*_condicoes_filtro(filtro))
+    else:
+        linhas = values(column("id", UUID(as_uuid=True)), name="v").data([(ato_id,) for ato_id in ids])
+        stmt = stmt.where(atos.c.id == linhas.c.id, atos.c.deleted_at.is_(None))
+
+    stmt = stmt.returning(atos.c.id, atos.c.publicacao, atos.c.orgao_unidade, atos.c.tipo_ato)
+
+    try:
+        linhas = db.execute(stmt).all()
+
+        variacoes = Counter()
+        for _, *chave in linhas:
+            variacoes[tuple(chave)] -= 1
+        aplicar_variacoes(db, variacoes)
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if linhas and invalidar_cache:
+        response_cache.invalidar()
+
+    resultados = dict.fromkeys(ids or [], "nao_encontrado")
+    resultados.update(dict.fromkeys((linha[0] for linha in linhas), "excluido"))
+
+    return _resultado_lote(
+        {
+            "excluidos": len(linhas),
+            "nao_encontrados": sum(resultado == "nao_encontrado" for resultado in resultados.values()),
+        },
+        resultados,
+    )
+
+
+async def atualizar_lote_atos_async(db: AsyncSession, *args, **kwargs) -> dict:
+    """``atualizar_lote_atos`` sobre ``AsyncSession`` (asyncpg), via ``run_sync``."""
+    resultado = await db.run_sync(atualizar_lote_atos, *args, invalidar_cache=False, **kwargs)
+
+    if resultado["atualizados"]:
+        await response_cache.invalidar_async()
+
+    return resultado
+
+
+async def excluir_lote_atos_async(db: AsyncSession, *args, **kwargs) -> dict:
+    """``excluir_lote_atos`` sobre ``AsyncSession`` (asyncpg), via ``run_sync``."""
+    resultado = await db.run_sync(excluir_lote_atos, *args, invalidar_cache=False, **kwargs)
+
+    if resultado["excluidos"]:
+        await response_cache.invalidar_async()
+
+    return resultado
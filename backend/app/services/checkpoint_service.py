@@ -0,0 +1,172 @@
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import tuple_
+from sqlalchemy.orm import Session
+
+from app.models.ato import Ato
+from app.models.rpa_checkpoint import RpaCheckpoint
+from app.rpa.collector import janela_padrao
+
+FONTE_SIJUT2 = "sijut2"
+
+
+def janela_incremental(db: Session, fonte: str, overlap_dias: int) -> tuple[date, date, date | None]:
+    """
+    Período da próxima coleta: da última publicação já gravada (menos
+    ``overlap_dias`` de margem) até hoje. Sem checkpoint, usa a janela
+    padrão. Devolve também a data do checkpoint encontrado.
+    """
+    checkpoint = db.get(RpaCheckpoint, fonte)
+
+    if checkpoint is None or checkpoint.ultima_publicacao is None:
+        data_inicio, data_fim = janela_padrao()
+        return data_inicio, data_fim, None
+
+    data_fim = date.today()
+    data_inicio = min(checkpoint.ultima_publicacao - timedelta(days=overlap_dias), data_fim)
+
+    return data_inicio, data_fim, checkpoint.ultima_publicacao
+
+
+def chaves_existentes(db: Session, chaves: Iterable[tuple]) -> set[tuple]:
+    """
+    Quais das chaves ``(numero_ato, publicacao, orgao_unidade)`` já estão
+    gravadas (inclusive excluídas). Consulta só as chaves pedidas, pelo
+    índice de ``uq_ato_unico``, em vez de carregar o período inteiro.
+    """
+    chaves = set(chaves)
+    if not chaves:
+        return set()
+
+    colunas = tuple_(Ato.numero_ato, Ato.publicacao, Ato.orgao_unidade)
+    linhas = (
+        db.query(Ato.numero_ato, Ato.publicacao, Ato.orgao_unidade)
+        .filter(colunas.in_(chaves))
+        .all()
+    )
+    return {tuple(linha) for linha in linhas}
+
+
+def _chave(ato: dict) -> tuple:
+    return (
+        ato["numero"],
+        datetime.strptime(ato["data_publicacao"], "%d/%m/%Y").date(),
+        ato["orgao"],
+    )
+
+
+def filtrar_conhecidos(
+    paginas: Iterable[list[dict]],
+    existentes: Callable[[list[tuple]], set[tuple]],
+    estatisticas: dict,
+    parar_em_pagina_conhecida: bool = True,
+) -> Iterator[list[dict]]:
+    """
+    Remove das páginas os atos cujas chaves já estão no banco, conferidas
+    página a página por ``existentes`` (chaves -> as já gravadas).
+
+    Com ``parar_em_pagina_conhecida``, a coleta é encerrada na primeira
+    página composta só por atos conhecidos: como o SIJUT2 lista do mais
+    recente para o mais antigo, as páginas seguintes também já foram
+    gravadas. Os contadores são acumulados em ``estatisticas``.
+    """
+    estatisticas.update(
+        linhas_coletadas=0,
+        linhas_conhecidas=0,
+        parada_antecipada=False,
+        ultima_publicacao=None,
+        ultimo_numero_ato=None,
+    )
+
+    try:
+        for pagina in paginas:
+            chaves = [_chave(ato) for ato in pagina]
+            conhecidas = existentes(chaves)
+            novos = []
+
+            for ato, chave in zip(pagina, chaves):
+                # Primeiro ato da data mais recente (páginas de janelas em
+                # paralelo não chegam em ordem de data)
+                if estatisticas["ultima_publicacao"] is None or chave[1] > estatisticas["ultima_publicacao"]:
+                    estatisticas["ultima_publicacao"] = chave[1]
+                    estatisticas["ultimo_numero_ato"] = ato["numero"]
+
+                if chave not in conhecidas:
+                    novos.append(ato)
+
+            estatisticas["linhas_coletadas"] += len(pagina)
+            estatisticas["linhas_conhecidas"] += len(pagina) - len(novos)
+
+            if pagina and not novos and parar_em_pagina_conhecida:
+                estatisticas["parada_antecipada"] = True
+                return
+
+            yield novos
+    finally:
+        if hasattr(paginas, "close"):
+            paginas.close()
+
+
+def atualizar_checkpoint(
+    db: Session,
+    fonte: str,
+    ultima_publicacao: date | None,
+    ultimo_numero_ato: str | None,
+):
+    """Avança o checkpoint da fonte; nunca volta para uma data anterior."""
+    if ultima_publicacao is None:
+        return
+
+    checkpoint = db.get(RpaCheckpoint, fonte)
+
+    if checkpoint is None:
+        checkpoint = RpaCheckpoint(fonte=fonte)
+        db.add(checkpoint)
+
+    if checkpoint.ultima_publicacao is None or ultima_publicacao >= checkpoint.ultima_publicacao:
+        checkpoint.ultima_publicacao = ultima_publicacao
+        checkpoint.ultimo_numero_ato = ultimo_numero_ato
+
+    db.commit()
+
+
+def carregar_paginacao(db: Session, fonte: str) -> dict:
+    """
+    Progresso por página deixado por uma coleta que não terminou, no
+    formato de ``coletar_com_retomada`` (vazio se não há).
+    """
+    checkpoint = db.get(RpaCheckpoint, fonte)
+
+    if checkpoint is None or checkpoint.pagina is None:
+        return {}
+
+    return {
+        "data_inicio": checkpoint.janela_inicio,
+        "data_fim": checkpoint.janela_fim,
+        "pagina": checkpoint.pagina,
+        "chave_primeira_linha": checkpoint.chave_primeira_linha,
+        "linhas": checkpoint.linhas_pagina,
+        "linhas_coletadas": checkpoint.linhas_coletadas,
+    }
+
+
+def salvar_paginacao(db: Session, fonte: str, progresso: dict | None):
+    """Grava a última página concluída (``None`` limpa o progresso)."""
+    progresso = progresso or {}
+    checkpoint = db.get(RpaCheckpoint, fonte)
+
+    if checkpoint is None:
+        if not progresso:
+            return
+        checkpoint = RpaCheckpoint(fonte=fonte)
+        db.add(checkpoint)
+
+    checkpoint.janela_inicio = progresso.get("data_inicio")
+    checkpoint.janela_fim = progresso.get("data_fim")
+    checkpoint.pagina = progresso.get("pagina")
+    checkpoint.chave_primeira_linha = progresso.get("chave_primeira_linha")
+    checkpoint.linhas_pagina = progresso.get("linhas")
+    checkpoint.linhas_coletadas = progresso.get("linhas_coletadas")
+
+    db.commit()
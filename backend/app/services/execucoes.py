@@ -0,0 +1,441 @@
+"""
+Execuções do RPA em segundo plano.
+
+``POST /rpa/executar`` e os agendamentos apenas submetem a execução e
+recebem um id; um pool de threads do worker que recebeu a submissão roda
+``executar_rpa``.
+
+O estado fica na tabela ``rpa_execucoes``: qualquer worker responde
+``GET /rpa/runs/{id}`` e os limites valem para o conjunto dos workers.
+
+- A submissão conta as execuções ativas sob um advisory lock e é recusada
+  acima de ``rpa_execucoes_simultaneas + rpa_execucoes_fila``.
+- Para começar, a execução ocupa uma das ``rpa_execucoes_simultaneas``
+  vagas: cada vaga é um advisory lock numa conexão própria, mantida até
+  o fim. Se o worker cair, o Postgres libera a vaga junto com a conexão.
+  Entre workers, as vagas não seguem a ordem de chegada.
+- Cada worker renova a cada ``rpa_execucoes_heartbeat`` segundos o
+  ``atualizado_em`` das suas execuções ativas e encerra como erro as que
+  ficaram sem sinal por ``HEARTBEATS_PERDIDOS`` intervalos (de um worker
+  que caiu), para que não ocupem a fila para sempre.
+
+O histórico guarda as últimas ``rpa_execucoes_historico`` execuções; o
+resultado definitivo continua em ``rpa_logs``.
+"""
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, delete, func, select, text, update
+from sqlalchemy.orm import defer
+from sqlalchemy.pool import NullPool
+
+from app.core.metrics import registro
+from app.core.settings import settings
+from app.database.session import SessionLocal
+from app.models.rpa_execucao import RpaExecucao
+from app.services.rpa_service import executar_rpa
+
+ESTADOS_FINAIS = ("sucesso", "truncada", "erro")
+ESTADOS_ATIVOS = ("na_fila", "executando")
+
+# Advisory locks das execuções (scheduler 0x52504153, migrações 0x52504154,
+# partições 0x52504155): a fila usa a chave sozinha e cada vaga o par
+# (chave, número da vaga), que não colide com ela
+CHAVE_EXECUCOES = 0x52504156
+
+# Intervalos sem heartbeat até a execução ser dada como abandonada
+HEARTBEATS_PERDIDOS = 4
+
+# Segundos entre as tentativas de ocupar uma vaga e entre as gravações do progresso
+INTERVALO_VAGA = 1.0
+INTERVALO_PROGRESSO = 1.0
+
+EXECUCOES = registro.contador("rpa_execucoes_total", "Execuções do RPA finalizadas, por origem e estado")
+DURACAO_JOB = registro.histograma(
+    "scheduler_job_segundos",
+    "Duração dos jobs do scheduler, da submissão ao fim da execução (inclui a fila)",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+DURACAO_EXECUCAO = registro.histograma(
+    "rpa_execucao_segundos",
+    "Duração das execuções do RPA, por origem",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600),
+)
+
+
+class FilaCheiaError(RuntimeError):
+    pass
+
+
+def _json(valor):
+    # O resultado de executar_rpa tem datas; a coluna é JSONB
+    return json.loads(json.dumps(
+        valor, default=lambda v: v.isoformat() if isinstance(v, (date, datetime)) else str(v)
+    ))
+
+
+def _para_dict(execucao: RpaExecucao, com_resultado: bool = True) -> dict:
+    return {
+        "id": execucao.id,
+        "estado": execucao.estado,
+        "origem": execucao.origem,
+        "data_inicio": execucao.data_inicio,
+        "data_fim": execucao.data_fim,
+        "criado_em": execucao.criado_em,
+        "iniciado_em": execucao.iniciado_em,
+        "finalizado_em": execucao.finalizado_em,
+        "tempo_execucao": execucao.tempo_execucao,
+        "progresso": execucao.progresso,
+        "resultado": execucao.resultado if com_resultado else None,
+        "erro": execucao.erro,
+        "worker": execucao.worker,
+    }
+
+
+class GerenciadorExecucoes:
+    def __init__(self, simultaneas: int, max_fila: int, historico: int, heartbeat: float, database_url: str):
+        self.simultaneas = simultaneas
+        self.max_fila = max_fila
+        self.historico = historico
+        self.heartbeat = heartbeat
+        self._concluidas = {}
+        self._lock = threading.Lock()
+        self._parar = threading.Event()
+        self._thread = None
+        # Última contagem do banco, para o medidor (sem consulta a cada scrape)
+        self._contagem = {"executando": 0, "na_fila": 0}
+        self._executor = ThreadPoolExecutor(
+            max_workers=simultaneas, thread_name_prefix="rpa-execucao"
+        )
+        # Conexões das vagas: fora do pool da API e em autocommit, como a da
+        # eleição do scheduler (abertas a execução inteira, nunca "idle in transaction")
+        self._engine_vagas = create_engine(
+            database_url, poolclass=NullPool, isolation_level="AUTOCOMMIT"
+        )
+
+    @property
+    def worker(self) -> str:
+        # Lido a cada uso: com workers criados por fork, o pid é o do filho
+        return f"{socket.gethostname()}:{os.getpid()}"
+
+    def _encerrar_abandonadas(self, db):
+        limite = datetime.utcnow() - timedelta(seconds=self.heartbeat * HEARTBEATS_PERDIDOS)
+        db.execute(
+            update(RpaExecucao)
+            .where(RpaExecucao.estado.in_(ESTADOS_ATIVOS), RpaExecucao.atualizado_em < limite)
+            .values(
+                estado="erro",
+                erro=func.concat("Execução abandonada: o worker ", RpaExecucao.worker, " parou de responder"),
+                finalizado_em=datetime.utcnow(),
+            )
+        )
+
+    def _descartar_antigas(self, db):
+        # Mantém o histórico limitado, nunca removendo execuções em andamento
+        antigas = (
+            select(RpaExecucao.id)
+            .where(RpaExecucao.estado.in_(ESTADOS_FINAIS))
+            .order_by(RpaExecucao.criado_em.desc())
+            .offset(self.historico)
+        )
+        db.execute(delete(RpaExecucao).where(RpaExecucao.id.in_(antigas)))
+
+    def _atualizar(self, execucao_id: str, **valores):
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(RpaExecucao)
+                .where(RpaExecucao.id == execucao_id)
+                .values(**valores, atualizado_em=datetime.utcnow())
+            )
+            db.commit()
+        finally:
+            db.close()
+
+    def submeter(
+        self,
+        data_inicio: date | None = None,
+        data_fim: date | None = None,
+        origem: str = "api",
+    ) -> dict:
+        db = SessionLocal()
+        try:
+            # Serializa as submissões de todos os workers até o commit
+            db.execute(text("SELECT pg_advisory_xact_lock(:chave)"), {"chave": CHAVE_EXECUCOES})
+            self._encerrar_abandonadas(db)
+
+            # Conta pelo total ativo: uma execução recém-submetida aparece
+            # "na_fila" até ocupar uma vaga, mesmo com vaga livre
+            ativas = db.scalar(
+                select(func.count()).where(RpaExecucao.estado.in_(ESTADOS_ATIVOS))
+            )
+            if ativas >= self.simultaneas + self.max_fila:
+                raise FilaCheiaError(
+                    f"Fila de execuções cheia ({self.max_fila} aguardando)"
+                )
+
+            agora = datetime.utcnow()
+            execucao = RpaExecucao(
+                id=uuid.uuid4().hex,
+                estado="na_fila",
+                origem=origem,
+                data_inicio=data_inicio,
+                data_fim=data_fim,
+                criado_em=agora,
+                progresso={"paginas": 0, "linhas_coletadas": 0, "total_inseridos": 0},
+                worker=self.worker,
+                atualizado_em=agora,
+            )
+            db.add(execucao)
+            resposta = _para_dict(execucao)
+
+            self._descartar_antigas(db)
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+        with self._lock:
+            self._concluidas[resposta["id"]] = threading.Event()
+
+        self._executor.submit(self._executar, resposta)
+        return resposta
+
+    def _ocupar_vaga(self):
+        """Conexão segurando uma das vagas, ou ``None`` se o worker está encerrando."""
+        conexao = self._engine_vagas.connect()
+
+        try:
+            while not self._parar.is_set():
+                for vaga in range(self.simultaneas):
+                    if conexao.execute(
+                        text("SELECT pg_try_advisory_lock(:chave, :vaga)"),
+                        {"chave": CHAVE_EXECUCOES, "vaga": vaga},
+                    ).scalar():
+                        return conexao
+
+                self._parar.wait(INTERVALO_VAGA)
+        except Exception:
+            conexao.close()
+            raise
+
+        conexao.close()
+        return None
+
+    def _executar(self, execucao: dict):
+        execucao_id = execucao["id"]
+        progresso = {"atual": execucao["progresso"], "gravado_em": 0.0}
+        lock_progresso = threading.Lock()
+
+        # Chamado pela coleta e pela thread de ingestão; grava no máximo
+        # uma vez por INTERVALO_PROGRESSO (o último fica para o final)
+        def _progredir(atual: dict):
+            with lock_progresso:
+                progresso["atual"] = atual
+                if time.monotonic() - progresso["gravado_em"] < INTERVALO_PROGRESSO:
+                    return
+                progresso["gravado_em"] = time.monotonic()
+                try:
+                    self._atualizar(execucao_id, progresso=atual)
+                except Exception as exc:
+                    # O progresso é informativo: não derruba a coleta
+                    print(f"Execução {execucao_id}: falha ao gravar o progresso ({exc})")
+
+        vaga = None
+        inicio = time.perf_counter()
+
+        try:
+            vaga = self._ocupar_vaga()
+
+            # Worker encerrando: a execução da fila é descartada em encerrar()
+            if vaga is None:
+                return
+
+            self._atualizar(execucao_id, estado="executando", iniciado_em=datetime.utcnow())
+            inicio = time.perf_counter()
+
+            try:
+                resultado = executar_rpa(
+                    execucao["data_inicio"], execucao["data_fim"], ao_progredir=_progredir
+                )
+            except Exception as exc:
+                resultado = None
+                estado, erro = "erro", str(exc)
+            else:
+                estado, erro = resultado["status"], resultado.get("erro")
+
+        except Exception as exc:
+            # Sem banco para ocupar a vaga: a execução não chegou a rodar
+            resultado = None
+            estado, erro = "erro", str(exc)
+
+        finally:
+            if vaga is not None:
+                # Fechar a conexão libera a vaga
+                vaga.close()
+
+        tempo_execucao = time.perf_counter() - inicio
+
+        try:
+            with lock_progresso:
+                self._atualizar(
+                    execucao_id,
+                    estado=estado,
+                    erro=erro,
+                    resultado=_json(resultado),
+                    progresso=progresso["atual"],
+                    finalizado_em=datetime.utcnow(),
+                    tempo_execucao=tempo_execucao,
+                )
+        finally:
+            with self._lock:
+                concluida = self._concluidas.pop(execucao_id, None)
+            if concluida:
+                concluida.set()
+
+        EXECUCOES.inc(origem=execucao["origem"], estado=estado)
+        DURACAO_EXECUCAO.observe(tempo_execucao, origem=execucao["origem"])
+
+    def obter(self, execucao_id: str) -> dict | None:
+        db = SessionLocal()
+        try:
+            execucao = db.get(RpaExecucao, execucao_id)
+            return _para_dict(execucao) if execucao else None
+        finally:
+            db.close()
+
+    def listar(self) -> list[dict]:
+        # Mais recentes primeiro, sem o resultado completo
+        db = SessionLocal()
+        try:
+            execucoes = db.scalars(
+                select(RpaExecucao)
+                .options(defer(RpaExecucao.resultado))
+                .order_by(RpaExecucao.criado_em.desc())
+                .limit(self.historico)
+            )
+            return [_para_dict(execucao, com_resultado=False) for execucao in execucoes]
+        finally:
+            db.close()
+
+    def aguardar(self, execucao_id: str, timeout: float | None = None) -> dict | None:
+        """Espera uma execução submetida por este worker (as demais só são consultadas)."""
+        with self._lock:
+            concluida = self._concluidas.get(execucao_id)
+
+        if concluida:
+            concluida.wait(timeout)
+
+        return self.obter(execucao_id)
+
+    def status(self) -> dict:
+        db = SessionLocal()
+        try:
+            contagem = dict(db.execute(
+                select(RpaExecucao.estado, func.count())
+                .where(RpaExecucao.estado.in_(ESTADOS_ATIVOS))
+                .group_by(RpaExecucao.estado)
+            ).all())
+        finally:
+            db.close()
+
+        self._contagem = {estado: contagem.get(estado, 0) for estado in ESTADOS_ATIVOS}
+        return {"simultaneas": self.simultaneas, "max_fila": self.max_fila, **self._contagem}
+
+    def contagem(self) -> dict:
+        """Execuções ativas na última consulta ao banco (heartbeat ou ``status``)."""
+        return self._contagem
+
+    def _renovar(self):
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(RpaExecucao)
+                .where(RpaExecucao.worker == self.worker, RpaExecucao.estado.in_(ESTADOS_ATIVOS))
+                .values(atualizado_em=datetime.utcnow())
+            )
+            self._encerrar_abandonadas(db)
+            db.commit()
+        finally:
+            db.close()
+
+    def _loop(self):
+        while True:
+            try:
+                self._renovar()
+                self.status()
+            except Exception as exc:
+                print(f"Execuções: falha ao renovar o heartbeat ({exc})")
+
+            if self._parar.wait(self.heartbeat):
+                return
+
+    def iniciar(self):
+        self._thread = threading.Thread(target=self._loop, name="rpa-execucoes-heartbeat", daemon=True)
+        self._thread.start()
+
+    def encerrar(self):
+        # Execuções em andamento não são interrompidas; as da fila são descartadas
+        self._parar.set()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+        db = SessionLocal()
+        try:
+            db.execute(
+                update(RpaExecucao)
+                .where(RpaExecucao.worker == self.worker, RpaExecucao.estado == "na_fila")
+                .values(
+                    estado="erro",
+                    erro="Execução descartada: o worker foi encerrado antes de ela começar",
+                    finalizado_em=datetime.utcnow(),
+                    atualizado_em=datetime.utcnow(),
+                )
+            )
+            db.commit()
+        finally:
+            db.close()
+
+
+gerenciador_execucoes = GerenciadorExecucoes(
+    simultaneas=settings.rpa_execucoes_simultaneas,
+    max_fila=settings.rpa_execucoes_fila,
+    historico=settings.rpa_execucoes_historico,
+    heartbeat=settings.rpa_execucoes_heartbeat,
+    database_url=settings.database_url,
+)
+
+registro.medidor(
+    "rpa_execucoes_ativas",
+    "Execuções do RPA rodando ou aguardando na fila (todos os workers, contadas a cada heartbeat)",
+    funcao=lambda: [
+        ({"estado": estado}, quantidade)
+        for estado, quantidade in gerenciador_execucoes.contagem().items()
+    ],
+)
+
+
+def executar_agendado():
+    """
+    Job do scheduler: submete uma execução incremental e espera terminar,
+    para que ``max_instances=1`` impeça o próximo disparo de sobrepô-la.
+    """
+    inicio = time.perf_counter()
+
+    try:
+        execucao = gerenciador_execucoes.submeter(origem="agendamento")
+    except FilaCheiaError as exc:
+        print(f"Execução agendada ignorada: {exc}")
+        return
+
+    gerenciador_execucoes.aguardar(execucao["id"])
+    DURACAO_JOB.observe(time.perf_counter() - inicio)
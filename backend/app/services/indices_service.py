@@ -0,0 +1,131 @@
+"""
+Conferência, via ``EXPLAIN``, de que as consultas quentes usam os índices
+criados pelas migrações.
+
+As consultas são montadas pelos mesmos helpers das rotas, então uma
+mudança de filtro ou de ordem que deixe de casar com o índice aparece
+aqui. Por padrão a varredura sequencial é desligada na transação
+(``enable_seqscan = off``): em bases pequenas o planejador prefere ler a
+tabela inteira, e o que se quer saber é se o índice serve para a
+consulta. Com ``planejador_real=True`` o plano é o que a base atual
+escolheria. Em bases quase vazias os planos não são representativos:
+rode sobre uma base de tamanho realista (a dos benchmarks, por exemplo).
+A agregação do resumo só vira varredura do índice com o visibility map
+em dia (autovacuum, ou ``VACUUM`` depois de cargas grandes).
+
+``atos`` e ``rpa_logs`` são particionadas: o plano cita os índices de
+cada partição, que são comparados pelo nome do índice da tabela mãe.
+"""
+import json
+from datetime import date, timedelta
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from app.models.ato import Ato
+from app.models.rpa_log import RpaLog
+from app.routers.atos import _montar_listagem
+from app.routers.rpa import _filtrar_logs
+from app.services.paginacao import codificar_cursor
+from app.services.resumo_service import SQL_AGREGADO_ATOS
+
+
+def _consultas(db: Session) -> list[tuple[str, object, tuple[str, ...]]]:
+    """(nome, consulta, índices aceitos)."""
+    hoje = date.today()
+    ano = hoje - timedelta(days=365)
+    cursor = codificar_cursor(hoje, UUID(int=0))
+
+    def listagem(*args):
+        return _montar_listagem(db.query(Ato), *args).statement
+
+    def logs(*args):
+        return (
+            _filtrar_logs(db.query(RpaLog), *args)
+            .order_by(RpaLog.execution_date.desc())
+            .limit(20)
+            .statement
+        )
+
+    return [
+        ("atos_primeira_pagina", listagem(None, None, None, "fts", 100, None), ("ix_atos_ativos_publicacao",)),
+        ("atos_proxima_pagina", listagem(None, None, None, "fts", 100, cursor), ("ix_atos_ativos_publicacao",)),
+        ("atos_periodo", listagem(ano, hoje, None, "fts", 100, None), ("ix_atos_ativos_publicacao",)),
+        # Termo raro: GIN da busca. Termo frequente: percorrer a listagem já
+        # ordenada filtrando é mais barato, e o planejador sabe disso
+        (
+            "atos_busca_fts",
+            listagem(None, None, "lucro presumido", "fts", 100, None),
+            ("ix_atos_busca", "ix_atos_ativos_publicacao"),
+        ),
+        ("resumo_agregado", text(SQL_AGREGADO_ATOS), ("ix_atos_ativos_resumo",)),
+        ("logs_primeira_pagina", logs(None, None, None), ("ix_rpa_logs_execution_date",)),
+        ("logs_periodo", logs(None, ano, hoje), ("ix_rpa_logs_execution_date",)),
+    ]
+
+
+class Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` de uma consulta, com os parâmetros ligados normalmente."""
+
+    inherit_cache = False
+
+    def __init__(self, consulta):
+        self.consulta = consulta
+
+
+@compiles(Explain, "postgresql")
+def _compilar_explain(elemento, compilador, **kwargs):
+    return "EXPLAIN (FORMAT JSON) " + compilador.process(elemento.consulta, **kwargs)
+
+
+def _indices_do_plano(no: dict) -> set[str]:
+    indices = {no["Index Name"]} if "Index Name" in no else set()
+    for filho in no.get("Plans", []):
+        indices |= _indices_do_plano(filho)
+    return indices
+
+
+def _indices_da_tabela_mae(db: Session, indices: set[str]) -> set[str]:
+    # atos_p202610_publicacao_id_idx -> ix_atos_ativos_publicacao
+    if not indices:
+        return set()
+
+    return set(db.execute(
+        text("""
+            SELECT COALESCE(pg_partition_root(CAST(nome AS regclass)), CAST(nome AS regclass))::text
+            FROM unnest(CAST(:indices AS text[])) AS nome
+        """),
+        {"indices": sorted(indices)},
+    ).scalars())
+
+
+def verificar_indices(db: Session, planejador_real: bool = False) -> list[dict]:
+    resultados = []
+
+    try:
+        # Estatísticas em dia: logo após cargas grandes o plano seria outro
+        db.execute(text("ANALYZE atos"))
+        db.execute(text("ANALYZE rpa_logs"))
+
+        if not planejador_real:
+            db.execute(text("SET LOCAL enable_seqscan = off"))
+
+        for nome, consulta, aceitos in _consultas(db):
+            plano = db.execute(Explain(consulta)).scalar()
+            if isinstance(plano, str):
+                plano = json.loads(plano)
+
+            usados = _indices_da_tabela_mae(db, _indices_do_plano(plano[0]["Plan"]))
+            resultados.append({
+                "consulta": nome,
+                "indices_aceitos": list(aceitos),
+                "indices_usados": sorted(usados),
+                "ok": bool(usados & set(aceitos)),
+            })
+    finally:
+        db.rollback()
+
+    return resultados
@@ -0,0 +1,19 @@
+import base64
+import json
+from datetime import date
+from uuid import UUID
+
+
+def codificar_cursor(publicacao: date, ato_id: UUID) -> str:
+    """Cursor opaco com a posição ``(publicacao, id)`` do último item da página."""
+    bruto = json.dumps([publicacao.isoformat(), str(ato_id)]).encode("utf-8")
+    return base64.urlsafe_b64encode(bruto).decode("ascii").rstrip("=")
+
+
+def decodificar_cursor(cursor: str) -> tuple[date, UUID]:
+    try:
+        preenchido = cursor + "=" * (-len(cursor) % 4)
+        publicacao, ato_id = json.loads(base64.urlsafe_b64decode(preenchido))
+        return date.fromisoformat(publicacao), UUID(ato_id)
+    except (ValueError, TypeError) as exc:
+        raise ValueError("Cursor inválido") from exc
@@ -0,0 +1,267 @@
+"""
+Partições mensais de ``atos`` (por ``publicacao``) e ``rpa_logs`` (por
+``execution_date``), criadas pela migração 0004.
+
+Cada tabela tem uma partição por mês (``atos_p202610``) e uma partição
+``_default`` que recebe o que cair fora delas: atos antigos de uma carga
+retroativa ou logs de um mês que ainda não foi criado. ``manter``, chamado
+diariamente pelo scheduler (e na subida da API, se faltar partição):
+
+- cria as partições do mês atual até ``particoes_meses_a_frente`` meses
+  adiante;
+- esvazia a ``_default``: cria a partição de cada mês encontrado nela e
+  move as linhas (o Postgres não deixa criar a partição de um mês que
+  tenha linhas na ``_default``);
+- em ``rpa_logs``, remove as partições inteiramente mais antigas que
+  ``rpa_logs_retencao_dias`` com ``DROP TABLE``, sem ``DELETE`` nem vacuum
+  de linhas mortas.
+
+Roda sob um advisory lock: vários workers podem chamá-la ao mesmo tempo.
+"""
+import re
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.core.settings import settings
+from app.database.session import SessionLocal
+
+# tabela -> coluna da chave de partição
+TABELAS = {"atos": "publicacao", "rpa_logs": "execution_date"}
+
+# Chave do advisory lock da manutenção (scheduler 0x52504153, migrações 0x52504154)
+CHAVE_PARTICOES = 0x52504155
+
+# Sem esperar atrás de leituras longas: a criação e a remoção de partições
+# travam a tabela mãe; se não conseguir, tenta de novo no próximo disparo
+LOCK_TIMEOUT = "5s"
+
+_NOME_PARTICAO = re.compile(r"^(?P<tabela>atos|rpa_logs)_(?:p(?P<mes>\d{6})|default)$")
+
+
+def eh_particao(nome: str) -> bool:
+    """Partições criadas aqui (ignoradas pelo autogenerate do Alembic)."""
+    return _NOME_PARTICAO.match(nome) is not None
+
+
+def nome_particao(tabela: str, mes: date) -> str:
+    return f"{tabela}_p{mes:%Y%m}"
+
+
+def inicio_do_mes(dia: date) -> date:
+    return dia.replace(day=1)
+
+
+def proximo_mes(mes: date) -> date:
+    return (mes.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def _mes_da_particao(nome: str) -> date | None:
+    encontrado = _NOME_PARTICAO.match(nome)
+    if not encontrado or not encontrado["mes"]:
+        return None
+    return datetime.strptime(encontrado["mes"], "%Y%m").date()
+
+
+def listar(db: Session, tabela: str) -> list[dict]:
+    """Partições de ``tabela`` com a faixa e as linhas estimadas (último ANALYZE)."""
+    linhas = db.execute(
+        text("""
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), c.reltuples::bigint
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = CAST(:tabela AS regclass)
+            ORDER BY c.relname
+        """),
+        {"tabela": tabela},
+    ).all()
+
+    return [
+        {"particao": nome, "faixa": faixa, "linhas_estimadas": max(linhas_estimadas, 0)}
+        for nome, faixa, linhas_estimadas in linhas
+    ]
+
+
+def _colunas(db: Session, tabela: str) -> str:
+    # Colunas geradas (atos.busca) não aceitam valor no INSERT
+    return db.execute(
+        text("""
+            SELECT string_agg(quote_ident(attname), ', ' ORDER BY attnum)
+            FROM pg_attribute
+            WHERE attrelid = CAST(:tabela AS regclass)
+              AND attnum > 0 AND NOT attisdropped AND attgenerated = ''
+        """),
+        {"tabela": tabela},
+    ).scalar_one()
+
+
+def _existe(db: Session, nome: str) -> bool:
+    return db.execute(text("SELECT to_regclass(:nome) IS NOT NULL"), {"nome": nome}).scalar_one()
+
+
+def criar_particao(db: Session, tabela: str, mes: date) -> bool:
+    """
+    Cria a partição do mês de ``mes``, movendo para ela as linhas desse
+    mês que estejam na ``_default``. Devolve ``False`` se já existia.
+    Não faz commit.
+    """
+    mes = inicio_do_mes(mes)
+    nome = nome_particao(tabela, mes)
+
+    if _existe(db, nome):
+        return False
+
+    coluna = TABELAS[tabela]
+    faixa = {"inicio": mes, "fim": proximo_mes(mes)}
+    colunas = _colunas(db, tabela)
+
+    db.execute(text(f"""
+        CREATE TEMP TABLE particao_movidos ON COMMIT DROP AS
+        SELECT {colunas} FROM {tabela} WITH NO DATA
+    """))
+    movidos = db.execute(
+        text(f"""
+            WITH movidos AS (
+                DELETE FROM {tabela}_default
+                WHERE {coluna} >= :inicio AND {coluna} < :fim
+                RETURNING {colunas}
+            )
+            INSERT INTO particao_movidos SELECT * FROM movidos
+        """),
+        faixa,
+    ).rowcount
+
+    db.execute(text(
+        f"CREATE TABLE {nome} PARTITION OF {tabela} "
+        f"FOR VALUES FROM ('{faixa['inicio']}') TO ('{faixa['fim']}')"
+    ))
+
+    if movidos:
+        db.execute(text(f"INSERT INTO {tabela} ({colunas}) SELECT {colunas} FROM particao_movidos"))
+        print(f"Partição {nome}: {movidos} linha(s) movida(s) da {tabela}_default")
+
+    db.execute(text("DROP TABLE particao_movidos"))
+    return True
+
+
+def garantir_particoes(db: Session, tabela: str, meses_a_frente: int, hoje: date | None = None) -> list[str]:
+    """Cria as partições até ``meses_a_frente`` e as dos meses parados na ``_default``."""
+    coluna = TABELAS[tabela]
+    mes = inicio_do_mes(hoje or date.today())
+    meses = {mes}
+
+    for _ in range(meses_a_frente):
+        mes = proximo_mes(mes)
+        meses.add(mes)
+
+    meses.update(
+        db.execute(text(
+            f"SELECT DISTINCT CAST(date_trunc('month', {coluna}) AS date) FROM {tabela}_default"
+        )).scalars()
+    )
+
+    return [nome_particao(tabela, mes) for mes in sorted(meses) if criar_particao(db, tabela, mes)]
+
+
+def remover_antigas(db: Session, tabela: str, retencao_dias: int, hoje: date | None = None) -> list[str]:
+    """Remove as partições cujo mês terminou antes de ``hoje - retencao_dias``."""
+    if retencao_dias <= 0:
+        return []
+
+    limite = (hoje or date.today()) - timedelta(days=retencao_dias)
+    removidas = []
+
+    for particao in listar(db, tabela):
+        mes = _mes_da_particao(particao["particao"])
+        if mes is not None and proximo_mes(mes) <= limite:
+            db.execute(text(f"DROP TABLE {particao['particao']}"))
+            removidas.append(particao["particao"])
+
+    return removidas
+
+
+def particoes_faltando(db: Session, hoje: date | None = None) -> list[str]:
+    """Partições do mês atual até ``particoes_meses_a_frente`` que não existem (só consulta o catálogo)."""
+    mes = inicio_do_mes(hoje or date.today())
+    meses = [mes]
+
+    for _ in range(settings.particoes_meses_a_frente):
+        mes = proximo_mes(mes)
+        meses.append(mes)
+
+    return [
+        nome
+        for tabela in TABELAS
+        for nome in (nome_particao(tabela, mes) for mes in meses)
+        if not _existe(db, nome)
+    ]
+
+
+def manter(db: Session, hoje: date | None = None, esperar_lock: bool = True) -> dict:
+    """
+    Cria as partições que faltam e aplica a retenção de ``rpa_logs``.
+
+    Com ``esperar_lock=False``, se outro processo já está na manutenção,
+    devolve ``{}`` sem esperar por ele.
+    """
+    try:
+        if esperar_lock:
+            db.execute(text("SELECT pg_advisory_xact_lock(:chave)"), {"chave": CHAVE_PARTICOES})
+        elif not db.execute(
+            text("SELECT pg_try_advisory_xact_lock(:chave)"), {"chave": CHAVE_PARTICOES}
+        ).scalar():
+            db.rollback()
+            return {}
+
+        db.execute(text(f"SET LOCAL lock_timeout = '{LOCK_TIMEOUT}'"))
+
+        resultado = {
+            tabela: {"criadas": garantir_particoes(db, tabela, settings.particoes_meses_a_frente, hoje)}
+            for tabela in TABELAS
+        }
+        resultado["rpa_logs"]["removidas"] = remover_antigas(
+            db, "rpa_logs", settings.rpa_logs_retencao_dias, hoje
+        )
+
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return resultado
+
+
+def verificar_na_subida(db: Session, hoje: date | None = None):
+    """
+    Na subida da API só confere, pelo catálogo, se as partições do mês
+    atual em diante existem. Se faltar alguma (a API ficou parada), tenta
+    criá-las sem esperar por outro worker; uma falha (lock timeout, DDL) é
+    registrada e fica para a manutenção diária, sem impedir a subida. Até
+    lá, as linhas desses meses vão para a ``_default``.
+    """
+    faltando = particoes_faltando(db, hoje)
+    db.rollback()
+
+    if not faltando:
+        return
+
+    try:
+        manter(db, hoje, esperar_lock=False)
+    except Exception as exc:
+        print(
+            f"Partições ausentes ({', '.join(faltando)}) não foram criadas na subida: {exc}. "
+            "A manutenção diária tenta de novo."
+        )
+
+
+def executar_manutencao():
+    """Job diário do scheduler."""
+    db = SessionLocal()
+    try:
+        resultado = manter(db)
+    finally:
+        db.close()
+
+    if any(alteracoes for tabela in resultado.values() for alteracoes in tabela.values()):
+        print(f"Manutenção das partições: {resultado}")
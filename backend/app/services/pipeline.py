@@ -0,0 +1,143 @@
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable
+from datetime import datetime
+
+from app.core.settings import settings
+
+_FIM = object()
+
+
+def formatar_ato(ato: dict) -> dict:
+    """Converte um ato bruto do scraper para os campos de ``Ato``."""
+    return {
+        "tipo_ato": ato["tipo_ato"],
+        "numero_ato": ato["numero"],
+        "orgao_unidade": ato["orgao"],
+        "publicacao": datetime.strptime(
+            ato["data_publicacao"], "%d/%m/%Y"
+        ).date(),
+        "ementa": ato["ementa"],
+    }
+
+
+def executar_pipeline(
+    paginas: Iterable[list[dict]],
+    enviar: Callable[[list[dict]], dict],
+    tamanho_lote: int | None = None,
+    fila_max: int | None = None,
+    ao_progredir: Callable[[dict], None] | None = None,
+) -> dict:
+    """
+    Envia os atos para ingestão enquanto a coleta continua.
+
+    As páginas geradas pelo scraper são agrupadas em lotes de
+    ``tamanho_lote`` atos formatados e colocadas em uma fila limitada a
+    ``fila_max`` lotes. Uma thread consome a fila chamando ``enviar`` para
+    cada lote; quando a ingestão fica para trás a fila enche e a coleta
+    espera (backpressure).
+
+    Se um lote falhar, a coleta é interrompida e os lotes já enviados
+    permanecem gravados. Exceções da coleta são propagadas depois que os
+    atos já coletados forem enviados.
+
+    ``ao_progredir`` recebe ``{"paginas", "linhas_coletadas",
+    "total_inseridos"}`` a cada página coletada e a cada lote gravado.
+    """
+    tamanho_lote = tamanho_lote or settings.rpa_lote_tamanho
+    fila_max = fila_max or settings.rpa_fila_lotes
+
+    fila = queue.Queue(maxsize=fila_max)
+    lotes = []
+    falhas = []
+    progresso = {"paginas": 0, "linhas_coletadas": 0, "total_inseridos": 0}
+    lock_progresso = threading.Lock()
+
+    # Chamado pela coleta e pela thread de ingestão
+    def _notificar(**variacoes):
+        with lock_progresso:
+            for campo, valor in variacoes.items():
+                progresso[campo] += valor
+            atual = dict(progresso)
+        if ao_progredir:
+            ao_progredir(atual)
+
+    def _consumir():
+        while True:
+            lote = fila.get()
+
+            if lote is _FIM:
+                return
+
+            # Após uma falha, apenas drena a fila para liberar a coleta
+            if falhas:
+                continue
+
+            inicio = time.perf_counter()
+
+            try:
+                resposta = enviar(lote)
+            except Exception as exc:
+                falhas.append(str(exc))
+                continue
+
+            lotes.append({
+                "indice": len(lotes),
+                "linhas": len(lote),
+                "inseridos": resposta.get("total_registros", 0),
+                "status": resposta.get("status"),
+                "latencia": time.perf_counter() - inicio,
+                # Tempo no banco informado pelo serviço; o resto da latência é transferência
+                "tempo_insercao": resposta.get("execution_time") or 0.0,
+            })
+            _notificar(total_inseridos=resposta.get("total_registros", 0))
+
+            if resposta.get("status") == "erro":
+                falhas.append(resposta.get("error_message") or "Falha na ingestão do lote")
+
+    consumidor = threading.Thread(target=_consumir, name="rpa-ingestao", daemon=True)
+    consumidor.start()
+
+    inicio = time.perf_counter()
+    buffer = []
+    linhas_coletadas = 0
+    tempo_formatacao = 0.0
+
+    try:
+        for pagina in paginas:
+            linhas_coletadas += len(pagina)
+
+            marco = time.perf_counter()
+            buffer.extend(formatar_ato(ato) for ato in pagina)
+            tempo_formatacao += time.perf_counter() - marco
+            _notificar(paginas=1, linhas_coletadas=len(pagina))
+
+            while len(buffer) >= tamanho_lote:
+                fila.put(buffer[:tamanho_lote])
+                buffer = buffer[tamanho_lote:]
+
+            if falhas:
+                break
+    finally:
+        if hasattr(paginas, "close"):
+            paginas.close()
+
+        # Envia o resto mesmo se a coleta falhou no meio
+        if buffer and not falhas:
+            fila.put(buffer)
+
+        fila.put(_FIM)
+        consumidor.join()
+
+    return {
+        "status": "erro" if falhas else "sucesso",
+        "linhas_coletadas": linhas_coletadas,
+        "total_inseridos": sum(lote["inseridos"] for lote in lotes),
+        "lotes": lotes,
+        "erro": falhas[0] if falhas else None,
+        "tempo_execucao": time.perf_counter() - inicio,
+        "tempo_formatacao": tempo_formatacao,
+        "tempo_insercao": sum(lote["tempo_insercao"] for lote in lotes),
+        "tempo_transferencia": sum(lote["latencia"] - lote["tempo_insercao"] for lote in lotes),
+    }
@@ -0,0 +1,129 @@
+from collections import Counter
+from datetime import date
+
+from sqlalchemy import func, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.models.ato import Ato
+from app.models.ato_resumo import AtoResumoDiario
+
+
+def chave_resumo(ato) -> tuple:
+    return ato.publicacao, ato.orgao_unidade, ato.tipo_ato
+
+
+def aplicar_variacoes(db: Session, variacoes: Counter):
+    """
+    Soma as variações ``{(publicacao, orgao_unidade, tipo_ato): delta}`` no
+    resumo diário. Não faz commit: roda na mesma transação da alteração
+    dos atos.
+    """
+    linhas = [
+        {
+            "publicacao": publicacao,
+            "orgao_unidade": orgao_unidade,
+            "tipo_ato": tipo_ato,
+            "quantidade": delta,
+        }
+        # Ordenado para que lotes concorrentes travem as linhas na mesma ordem
+        for (publicacao, orgao_unidade, tipo_ato), delta in sorted(variacoes.items())
+        if delta
+    ]
+
+    if not linhas:
+        return
+
+    stmt = insert(AtoResumoDiario).values(linhas)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["publicacao", "orgao_unidade", "tipo_ato"],
+        set_={"quantidade": AtoResumoDiario.quantidade + stmt.excluded.quantidade},
+    )
+    db.execute(stmt)
+
+
+def resumo_dashboard(db: Session, data_inicio: date | None, data_fim: date | None) -> dict:
+    query_base = db.query(AtoResumoDiario)
+
+    if data_inicio:
+        query_base = query_base.filter(AtoResumoDiario.publicacao >= data_inicio)
+
+    if data_fim:
+        query_base = query_base.filter(AtoResumoDiario.publicacao <= data_fim)
+
+    quantidade = func.sum(AtoResumoDiario.quantidade)
+
+    total_atos = query_base.with_entities(func.coalesce(quantidade, 0)).scalar()
+
+    por_orgao = (
+        query_base.with_entities(AtoResumoDiario.orgao_unidade, quantidade)
+        .group_by(AtoResumoDiario.orgao_unidade)
+        .having(quantidade > 0)
+        .all()
+    )
+
+    por_tipo = (
+        query_base.with_entities(AtoResumoDiario.tipo_ato, quantidade)
+        .group_by(AtoResumoDiario.tipo_ato)
+        .having(quantidade > 0)
+        .all()
+    )
+
+    return {
+        "total_atos": total_atos,
+        "por_orgao": [
+            {"orgao_unidade": orgao, "quantidade": qtd}
+            for orgao, qtd in por_orgao
+        ],
+        "por_tipo": [
+            {"tipo_ato": tipo, "quantidade": qtd}
+            for tipo, qtd in por_tipo
+        ]
+    }
+
+
+SQL_AGREGADO_ATOS = """
+    SELECT publicacao, orgao_unidade, tipo_ato, count(*) AS quantidade
+    FROM atos
+    WHERE deleted_at IS NULL
+    GROUP BY publicacao, orgao_unidade, tipo_ato
+"""
+
+
+def reconstruir(db: Session) -> int:
+    """Recalcula o resumo inteiro a partir da tabela ``atos``."""
+    db.execute(text("LOCK TABLE atos_resumo_diario IN EXCLUSIVE MODE"))
+    db.execute(text("DELETE FROM atos_resumo_diario"))
+    total = db.execute(text(f"""
+        INSERT INTO atos_resumo_diario (publicacao, orgao_unidade, tipo_ato, quantidade)
+        {SQL_AGREGADO_ATOS}
+    """)).rowcount
+    db.commit()
+    return total
+
+
+def reconstruir_se_vazio(db: Session):
+    """Popula o resumo na primeira subida sobre uma base que já tem atos."""
+    if db.query(AtoResumoDiario).first() is None and db.query(Ato.id).first() is not None:
+        reconstruir(db)
+
+
+def verificar(db: Session) -> list[dict]:
+    """Lista as chaves em que o resumo diverge da contagem real."""
+    linhas = db.execute(text(f"""
+        SELECT
+            coalesce(r.publicacao, a.publicacao) AS publicacao,
+            coalesce(r.orgao_unidade, a.orgao_unidade) AS orgao_unidade,
+            coalesce(r.tipo_ato, a.tipo_ato) AS tipo_ato,
+            coalesce(r.quantidade, 0) AS resumo,
+            coalesce(a.quantidade, 0) AS real
+        FROM (SELECT * FROM atos_resumo_diario WHERE quantidade <> 0) r
+        FULL OUTER JOIN ({SQL_AGREGADO_ATOS}) a
+            ON a.publicacao = r.publicacao
+            AND a.orgao_unidade = r.orgao_unidade
+            AND a.tipo_ato = r.tipo_ato
+        WHERE coalesce(r.quantidade, 0) <> coalesce(a.quantidade, 0)
+        ORDER BY 1, 2, 3
+    """)).mappings().all()
+
+    return [dict(linha) for linha in linhas]
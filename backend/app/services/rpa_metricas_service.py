@@ -0,0 +1,52 @@
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+# Percentis de cada etapa sobre os logs de execução (os que têm "etapas")
+SQL_PERCENTIS_ETAPAS = text("""
+    SELECT etapa.key AS etapa,
+           count(*) AS execucoes,
+           percentile_cont(0.5) WITHIN GROUP (ORDER BY etapa.value::float) AS p50,
+           percentile_cont(0.95) WITHIN GROUP (ORDER BY etapa.value::float) AS p95,
+           max(etapa.value::float) AS maximo
+    FROM rpa_logs
+    CROSS JOIN LATERAL jsonb_each_text(rpa_logs.etapas) AS etapa
+    WHERE rpa_logs.etapas IS NOT NULL
+      AND rpa_logs.execution_date BETWEEN :inicio AND :fim
+    GROUP BY etapa.key
+    ORDER BY etapa.key
+""")
+
+SQL_TOTAIS_EXECUCOES = text("""
+    SELECT count(*) AS execucoes,
+           count(*) FILTER (WHERE status = 'ERRO') AS erros,
+           count(*) FILTER (WHERE status = 'TRUNCADA') AS truncadas,
+           coalesce(sum(linhas_vistas), 0) AS linhas_vistas,
+           coalesce(sum(total_registros), 0) AS linhas_inseridas,
+           coalesce(sum(linhas_duplicadas), 0) AS linhas_duplicadas
+    FROM rpa_logs
+    WHERE etapas IS NOT NULL
+      AND execution_date BETWEEN :inicio AND :fim
+""")
+
+
+def resumo_etapas(db: Session, inicio: datetime, fim: datetime) -> dict:
+    """p50/p95 (em segundos) de cada etapa das execuções do RPA no período."""
+    params = {"inicio": inicio, "fim": fim}
+    totais = db.execute(SQL_TOTAIS_EXECUCOES, params).mappings().one()
+
+    return {
+        "inicio": inicio,
+        "fim": fim,
+        **totais,
+        "etapas": {
+            linha["etapa"]: {
+                "execucoes": linha["execucoes"],
+                "p50": linha["p50"],
+                "p95": linha["p95"],
+                "maximo": linha["maximo"],
+            }
+            for linha in db.execute(SQL_PERCENTIS_ETAPAS, params).mappings()
+        },
+    }
@@ -1,10 +1,25 @@
 import time
-from datetime import datetime
+from collections.abc import Callable
+from datetime import date
 
 import requests
 
 from app.core.settings import settings
-from app.rpa.scraper_selenium import coletar_atos
+from app.database.session import SessionLocal
+from app.models.rpa_log import RpaLog
+from app.rpa.collector import coletar_com_retomada, criar_collector, janela_padrao
+from app.rpa.sharding import coletar_em_shards, criar_shards
+from app.services.ato_service import salvar_lote_atos
+from app.services.checkpoint_service import (
+    FONTE_SIJUT2,
+    atualizar_checkpoint,
+    carregar_paginacao,
+    chaves_existentes,
+    filtrar_conhecidos,
+    janela_incremental,
+    salvar_paginacao,
+)
+from app.services.pipeline import executar_pipeline
 
 API_BASE_URL = settings.api_base_url.rstrip("/")
 API_URL = f"{API_BASE_URL}/atos/batch"
@@ -27,45 +42,262 @@ def obter_token() -> str:
     return response.json()["access_token"]
 
 
-def executar_rpa():
-    inicio = time.time()
-
+def _enviar_http():
+    """Envia cada lote para ``/atos/batch`` (runners fora do processo da API)."""
     token = obter_token()
     headers = {"Authorization": f"Bearer {token}"}
 
-    atos_coletados = coletar_atos()
-
-    dados_formatados = [
-        {
-            "tipo_ato": ato["tipo_ato"],
-            "numero_ato": ato["numero"],
-            "orgao_unidade": ato["orgao"],
-            "publicacao": datetime.strptime(
-                ato["data_publicacao"], "%d/%m/%Y"
-            ).date().isoformat(),
-            "ementa": ato["ementa"],
-        }
-        for ato in atos_coletados
-    ]
+    def enviar(lote: list[dict]) -> dict:
+        response = requests.post(
+            API_URL,
+            json=[
+                {**ato, "publicacao": ato["publicacao"].isoformat()}
+                for ato in lote
+            ],
+            headers=headers,
+            timeout=60,
+        )
 
-    response = requests.post(
-        API_URL,
-        json=dados_formatados,
-        headers=headers,
-        timeout=60,
-    )
+        if response.status_code != 200:
+            raise Exception(f"API retornou {response.status_code}: {response.text}")
 
-    tempo_execucao = time.time() - inicio
+        return response.json()
 
-    if response.status_code != 200:
-        return {
-            "status_code_api": response.status_code,
-            "erro_api": response.text,
-            "tempo_execucao_rpa": tempo_execucao,
-        }
-
-    return {
-        "status_code_api": response.status_code,
-        "resposta_api": response.json(),
-        "tempo_execucao_rpa": tempo_execucao,
+    return enviar
+
+
+def _enviar_direto():
+    """Grava cada lote chamando o serviço direto, sem HTTP, JSON nem JWT."""
+    def enviar(lote: list[dict]) -> dict:
+        db = SessionLocal()
+        try:
+            return salvar_lote_atos(db, lote, registrar_log=False)
+        finally:
+            db.close()
+
+    return enviar
+
+
+ENVIOS = {
+    "http": _enviar_http,
+    "direto": _enviar_direto,
+}
+
+
+def _etapas(metricas_coleta: list[dict], resultado: dict | None, tempo_total: float) -> dict:
+    """Segundos gastos em cada etapa da execução, para o log em ``rpa_logs.etapas``."""
+    def somar(chave: str) -> float:
+        return sum(metricas.get(chave, 0.0) for metricas in metricas_coleta)
+
+    paginas = sum(metricas.get("paginas", 0) for metricas in metricas_coleta)
+    etapas = {
+        "fetch": somar("tempo_fetch"),
+        "parse": somar("tempo_parse"),
+        "total": tempo_total,
     }
+
+    # Só o Selenium usa navegador
+    if any("tempo_obter_driver" in metricas for metricas in metricas_coleta):
+        etapas["driver"] = somar("tempo_obter_driver")
+
+    if paginas:
+        etapas["fetch_por_pagina"] = etapas["fetch"] / paginas
+        etapas["parse_por_pagina"] = etapas["parse"] / paginas
+
+    if resultado is not None:
+        etapas["formatacao"] = resultado["tempo_formatacao"]
+        etapas["transferencia"] = resultado["tempo_transferencia"]
+        etapas["insercao"] = resultado["tempo_insercao"]
+
+    return etapas
+
+
+def _chaves_existentes(chaves: list[tuple]) -> set[tuple]:
+    # Sessão curta por página: nenhuma transação fica aberta durante a coleta
+    db = SessionLocal()
+    try:
+        return chaves_existentes(db, chaves)
+    finally:
+        db.close()
+
+
+def _registrar_execucao(
+    status: str,
+    erro: str | None,
+    etapas: dict,
+    linhas_vistas: int,
+    linhas_inseridas: int,
+):
+    db = SessionLocal()
+    try:
+        db.add(RpaLog(
+            total_registros=linhas_inseridas,
+            status=status,
+            error_message=erro,
+            execution_time=etapas["total"],
+            etapas=etapas,
+            linhas_vistas=linhas_vistas,
+            linhas_duplicadas=linhas_vistas - linhas_inseridas,
+        ))
+        db.commit()
+    finally:
+        db.close()
+
+
+def executar_rpa(
+    data_inicio: date | None = None,
+    data_fim: date | None = None,
+    ao_progredir: Callable[[dict], None] | None = None,
+):
+    inicio = time.time()
+
+    enviar = ENVIOS[settings.rpa_ingest_modo]()
+
+    db = SessionLocal()
+
+    try:
+        checkpoint_anterior = None
+
+        # Sem período explícito, retoma do último ato gravado
+        if data_inicio is None and data_fim is None and settings.rpa_incremental:
+            data_inicio, data_fim, checkpoint_anterior = janela_incremental(
+                db, FONTE_SIJUT2, settings.rpa_checkpoint_overlap_dias
+            )
+        else:
+            data_inicio, data_fim = janela_padrao(data_inicio, data_fim)
+
+        paginacao = carregar_paginacao(db, FONTE_SIJUT2)
+    finally:
+        db.close()
+
+    # Uma coleta anterior parou no meio: as páginas depois de onde ela
+    # parou nunca foram lidas, então uma página toda conhecida não
+    # garante que as seguintes também sejam
+    retomada = bool(paginacao)
+
+    shards = None
+    metricas_coleta = {}
+    incremental = {
+        "data_inicio": data_inicio,
+        "data_fim": data_fim,
+        "checkpoint_anterior": checkpoint_anterior,
+        # Página de onde a coleta continua, se a janela é a da coleta interrompida
+        "retomada_pagina": (
+            paginacao["pagina"]
+            if retomada and (paginacao["data_inicio"], paginacao["data_fim"]) == (data_inicio, data_fim)
+            else None
+        ),
+    }
+
+    # Último progresso visto: em caso de falha, quantos atos já foram gravados
+    progresso = {"total_inseridos": 0}
+
+    def _progredir(atual: dict):
+        progresso.update(atual)
+        if ao_progredir:
+            ao_progredir(atual)
+
+    def _metricas() -> list[dict]:
+        if shards is not None:
+            return [shard["metricas"] or {} for shard in shards]
+        return [metricas_coleta]
+
+    try:
+        # Períodos maiores que uma janela são coletados em paralelo; as
+        # páginas das janelas entram no pipeline à medida que são lidas
+        if (data_fim - data_inicio).days + 1 > settings.rpa_shard_dias:
+            shards = criar_shards(data_inicio, data_fim)
+            paginas = coletar_em_shards(shards)
+        else:
+            paginas = coletar_com_retomada(
+                criar_collector(),
+                data_inicio,
+                data_fim,
+                metricas=metricas_coleta,
+                progresso=paginacao,
+            )
+
+        # Com janelas em paralelo as páginas chegam intercaladas: uma página
+        # toda conhecida de uma janela nada diz sobre as das outras
+        paginas = filtrar_conhecidos(
+            paginas,
+            _chaves_existentes,
+            incremental,
+            parar_em_pagina_conhecida=(
+                settings.rpa_parada_antecipada and not retomada and shards is None
+            ),
+        )
+
+        resultado = executar_pipeline(paginas, enviar, ao_progredir=_progredir)
+
+    except Exception as exc:
+        _registrar_execucao(
+            "ERRO",
+            str(exc),
+            _etapas(_metricas(), None, time.time() - inicio),
+            incremental.get("linhas_coletadas", 0),
+            progresso["total_inseridos"],
+        )
+        raise
+
+    # Coleta parcial não é sucesso: o checkpoint não avança e a próxima
+    # execução na mesma janela continua da última página lida
+    if shards is not None:
+        incompletas = [shard for shard in shards if shard["status"] != "sucesso"]
+        truncada = bool(incompletas)
+        erro_coleta = "; ".join(
+            f"janela {shard['data_inicio']}..{shard['data_fim']}: {shard['erro']}"
+            for shard in incompletas
+        )
+    else:
+        truncada = paginacao.get("estado") == "truncada"
+        erro_coleta = paginacao.get("erro")
+
+    resultado["coleta"] = "truncada" if truncada else "completa"
+
+    if resultado["status"] == "sucesso" and truncada:
+        resultado["status"] = "truncada"
+        resultado["erro"] = f"Coleta truncada: {erro_coleta}"
+
+    db = SessionLocal()
+    try:
+        if resultado["status"] == "sucesso":
+            atualizar_checkpoint(
+                db,
+                FONTE_SIJUT2,
+                incremental["ultima_publicacao"],
+                incremental["ultimo_numero_ato"],
+            )
+            salvar_paginacao(db, FONTE_SIJUT2, None)
+
+        # Só aqui, com todos os lotes gravados: salvo a cada página, uma
+        # queda do processo deixaria para trás atos ainda no buffer
+        elif resultado["status"] == "truncada" and shards is None:
+            salvar_paginacao(db, FONTE_SIJUT2, paginacao)
+    finally:
+        db.close()
+
+    incremental["linhas_novas"] = resultado["total_inseridos"]
+    incremental["linhas_descartadas"] = (
+        incremental["linhas_coletadas"] - incremental["linhas_novas"]
+    )
+
+    resultado["incremental"] = incremental
+    resultado["tempo_execucao_rpa"] = time.time() - inicio
+    resultado["etapas"] = _etapas(_metricas(), resultado, resultado["tempo_execucao_rpa"])
+
+    _registrar_execucao(
+        resultado["status"].upper(),
+        resultado["erro"],
+        resultado["etapas"],
+        incremental["linhas_coletadas"],
+        resultado["total_inseridos"],
+    )
+
+    if shards is not None:
+        resultado["shards"] = shards
+    else:
+        resultado["metricas_coleta"] = metricas_coleta
+        resultado["paginacao"] = paginacao
+
+    return resultado
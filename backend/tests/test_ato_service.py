@@ -0,0 +1,192 @@
+import threading
+import uuid
+from datetime import date
+
+from sqlalchemy import delete, select, text
+
+from app.database.session import engine
+from app.models.ato import Ato
+from app.services import resumo_service
+from app.services.ato_service import atualizar_lote_atos, excluir_lote_atos, salvar_lote_atos
+
+
+def _ato(numero: str, **campos) -> dict:
+    return {
+        "tipo_ato": "Portaria",
+        "numero_ato": numero,
+        "orgao_unidade": "RFB",
+        "publicacao": date(2026, 1, 5),
+        "ementa": "Ementa de teste",
+        **campos,
+    }
+
+
+def test_copy_mantem_texto_vazio(db):
+    # No CSV do COPY, o campo vazio sem aspas chegaria como NULL
+    resultado = salvar_lote_atos(
+        db,
+        [_ato("TESTE-COPY-1", ementa=""), _ato("TESTE-COPY-2")],
+        metodo="copy",
+        registrar_log=False,
+    )
+
+    assert resultado["status"] == "sucesso", resultado["error_message"]
+    assert resultado["total_registros"] == 2
+
+    ementa = db.execute(select(Ato.ementa).where(Ato.numero_ato == "TESTE-COPY-1")).scalar_one()
+    assert ementa == ""
+
+
+def test_copy_e_insert_ignoram_duplicados(db):
+    atos = [_ato("TESTE-COPY-3")]
+
+    assert salvar_lote_atos(db, atos, metodo="copy", registrar_log=False)["total_registros"] == 1
+    assert salvar_lote_atos(db, atos, metodo="copy", registrar_log=False)["total_registros"] == 0
+    assert salvar_lote_atos(db, atos, metodo="insert", registrar_log=False)["total_registros"] == 0
+
+
+def _gravar(db, *numeros: str, **campos) -> dict:
+    """Grava os atos e devolve o id de cada número."""
+    salvar_lote_atos(db, [_ato(numero, **campos) for numero in numeros], registrar_log=False)
+    return dict(db.execute(select(Ato.numero_ato, Ato.id).where(Ato.numero_ato.in_(numeros))).all())
+
+
+def _resultados(resposta: dict) -> dict:
+    return {item["id"]: item["resultado"] for item in resposta["resultados"]}
+
+
+def _numero(db, ato_id) -> str:
+    return db.execute(select(Ato.numero_ato).where(Ato.id == ato_id)).scalar_one()
+
+
+def test_atualizacao_por_id_informa_cada_ato(db):
+    ids = _gravar(db, "ZZ-1", "ZZ-2")
+    excluir_lote_atos(db, ids=[ids["ZZ-2"]])
+    inexistente = uuid.uuid4()
+
+    resposta = atualizar_lote_atos(db, atualizacoes=[
+        {"id": ids["ZZ-1"], "ementa": "Nova ementa", "publicacao": date(2026, 3, 10)},
+        {"id": ids["ZZ-2"], "ementa": "Excluído não muda"},
+        {"id": inexistente, "ementa": "Não existe"},
+    ])
+
+    assert _resultados(resposta) == {
+        ids["ZZ-1"]: "atualizado",
+        ids["ZZ-2"]: "nao_encontrado",
+        inexistente: "nao_encontrado",
+    }
+    # Mudou de mês: a linha passa para outra partição e o resumo acompanha
+    ato = db.execute(select(Ato.publicacao, Ato.ementa).where(Ato.id == ids["ZZ-1"])).one()
+    assert tuple(ato) == (date(2026, 3, 10), "Nova ementa")
+    assert resumo_service.verificar(db) == []
+
+
+def test_ato_sem_mudanca_de_chave_nao_e_conflito(db):
+    ids = _gravar(db, "ZZ-1", "ZZ-2")
+
+    resposta = atualizar_lote_atos(db, atualizacoes=[
+        {"id": ids["ZZ-1"], "numero_ato": "ZZ-2"},
+        {"id": ids["ZZ-2"], "ementa": "Só a ementa"},
+    ])
+
+    assert _resultados(resposta) == {ids["ZZ-1"]: "conflito", ids["ZZ-2"]: "atualizado"}
+    assert (_numero(db, ids["ZZ-1"]), _numero(db, ids["ZZ-2"])) == ("ZZ-1", "ZZ-2")
+    assert db.execute(select(Ato.ementa).where(Ato.id == ids["ZZ-2"])).scalar_one() == "Só a ementa"
+    assert resumo_service.verificar(db) == []
+
+
+def test_chaves_trocadas_dentro_do_lote(db):
+    ids = _gravar(db, "ZZ-1", "ZZ-2", "ZZ-3", "ZZ-4")
+
+    # Em cadeia (ZZ-2 assume a chave que ZZ-1 deixa) e em ciclo (ZZ-3 <-> ZZ-4)
+    resposta = atualizar_lote_atos(db, atualizacoes=[
+        {"id": ids["ZZ-1"], "numero_ato": "ZZ-9"},
+        {"id": ids["ZZ-2"], "numero_ato": "ZZ-1", "ementa": "Renumerado"},
+        {"id": ids["ZZ-3"], "numero_ato": "ZZ-4"},
+        {"id": ids["ZZ-4"], "numero_ato": "ZZ-3"},
+    ])
+
+    assert set(_resultados(resposta).values()) == {"atualizado"}
+    assert [_numero(db, ids[numero]) for numero in ("ZZ-1", "ZZ-2", "ZZ-3", "ZZ-4")] == [
+        "ZZ-9", "ZZ-1", "ZZ-4", "ZZ-3",
+    ]
+    assert resumo_service.verificar(db) == []
+
+
+def test_conflitos_com_atos_de_fora_e_repetidos(db):
+    ids = _gravar(db, "ZZ-1", "ZZ-2", "ZZ-3", "ZZ-4", "ZZ-5")
+
+    resposta = atualizar_lote_atos(db, atualizacoes=[
+        # ZZ-5 não está no lote
+        {"id": ids["ZZ-1"], "numero_ato": "ZZ-5"},
+        # ZZ-1 não sai da própria chave: quem a queria também fica de fora
+        {"id": ids["ZZ-2"], "numero_ato": "ZZ-1"},
+        # Mesma chave nova para dois atos
+        {"id": ids["ZZ-3"], "numero_ato": "ZZ-8"},
+        {"id": ids["ZZ-4"], "numero_ato": "ZZ-8"},
+    ])
+
+    assert set(_resultados(resposta).values()) == {"conflito"}
+    assert resposta["atualizados"] == 0
+    assert resumo_service.verificar(db) == []
+
+
+def test_atualizacao_e_exclusao_por_filtro(db):
+    _gravar(db, "ZZ-1", "ZZ-2", tipo_ato="Portaria ZZ")
+    _gravar(db, "ZZ-3", tipo_ato="Portaria ZZ", publicacao=date(2026, 2, 1))
+    filtro = {"tipo_ato": "Portaria ZZ", "data_inicio": date(2026, 1, 1), "data_fim": date(2026, 1, 31)}
+
+    resposta = atualizar_lote_atos(db, filtro=filtro, alteracoes={"orgao_unidade": "PGFN"})
+
+    assert resposta["atualizados"] == 2
+    orgaos = dict(db.execute(
+        select(Ato.numero_ato, Ato.orgao_unidade).where(Ato.tipo_ato == "Portaria ZZ")
+    ).all())
+    assert orgaos == {"ZZ-1": "PGFN", "ZZ-2": "PGFN", "ZZ-3": "RFB"}
+    assert resumo_service.verificar(db) == []
+
+    # A mesma chave para os dois atos do filtro: nenhum é alterado
+    resposta = atualizar_lote_atos(db, filtro=filtro, alteracoes={"numero_ato": "ZZ-7"})
+    assert resposta["atualizados"] == 0 and resposta["conflitos"] == 2
+
+    resposta = excluir_lote_atos(db, filtro={"tipo_ato": "Portaria ZZ"})
+    assert resposta["excluidos"] == 3
+    assert excluir_lote_atos(db, filtro={"tipo_ato": "Portaria ZZ"})["excluidos"] == 0
+    assert resumo_service.verificar(db) == []
+
+
+def test_exclusao_por_id_informa_cada_ato(db):
+    ids = _gravar(db, "ZZ-1")
+    inexistente = uuid.uuid4()
+
+    resposta = excluir_lote_atos(db, ids=[ids["ZZ-1"], inexistente])
+
+    assert _resultados(resposta) == {ids["ZZ-1"]: "excluido", inexistente: "nao_encontrado"}
+    # Já excluído: não conta de novo nem mexe no resumo
+    assert _resultados(excluir_lote_atos(db, ids=[ids["ZZ-1"]])) == {ids["ZZ-1"]: "nao_encontrado"}
+    assert resumo_service.verificar(db) == []
+
+
+def test_chave_gravada_ao_mesmo_tempo_vira_conflito(db):
+    ids = _gravar(db, "ZZ-CONC-1")
+    outra = engine.connect()
+
+    try:
+        # Outra transação grava a chave pretendida e só confirma com o
+        # UPDATE do lote já esperando por ela: a constraint é violada e o
+        # lote, conferido de novo, passa a ver o ato
+        outra.execute(text("""
+            INSERT INTO atos (id, tipo_ato, numero_ato, orgao_unidade, publicacao, ementa)
+            VALUES (gen_random_uuid(), 'Portaria', 'ZZ-CONC-2', 'RFB', '2026-01-05', 'x')
+        """))
+        threading.Timer(0.5, outra.commit).start()
+
+        resposta = atualizar_lote_atos(db, atualizacoes=[{"id": ids["ZZ-CONC-1"], "numero_ato": "ZZ-CONC-2"}])
+
+        assert _resultados(resposta) == {ids["ZZ-CONC-1"]: "conflito"}
+        assert _numero(db, ids["ZZ-CONC-1"]) == "ZZ-CONC-1"
+    finally:
+        outra.rollback()
+        outra.execute(delete(Ato).where(Ato.numero_ato == "ZZ-CONC-2"))
+        outra.commit()
+        outra.close()
@@ -0,0 +1,74 @@
+import asyncio
+import threading
+
+from app.core.cache import MemoriaCache, RedisCache, ResponseCache
+
+
+def _cache(janela_primario: int) -> ResponseCache:
+    return ResponseCache(MemoriaCache(max_itens=10), ttl=60, janela_primario=janela_primario)
+
+
+def test_invalidar_muda_a_chave():
+    cache = _cache(0)
+    antes = cache.chave("listar", {"limit": 10})
+
+    cache.invalidar()
+
+    assert cache.chave("listar", {"limit": 10}) != antes
+
+
+def test_escrita_recente_nao_guarda_resposta():
+    cache = _cache(5)
+    cache.invalidar()
+    chave = cache.chave("listar", {"limit": 10})
+
+    assert cache.escrita_recente()
+    cache.guardar(chave, b"[]", {})
+    assert cache.obter(chave) is None
+
+
+def test_sem_replica_guarda_logo_depois_da_escrita():
+    cache = _cache(0)
+    cache.invalidar()
+    chave = cache.chave("listar", {"limit": 10})
+
+    assert not cache.escrita_recente()
+    cache.guardar(chave, b"[]", {})
+    assert cache.obter(chave)["corpo"] == "[]"
+
+
+class _ClienteLento:
+    """Cliente com a API do Redis que anota a thread de cada chamada."""
+
+    def __init__(self):
+        self.dados = {}
+        self.threads = set()
+
+    def get(self, chave):
+        self.threads.add(threading.get_ident())
+        return self.dados.get(chave)
+
+    def set(self, chave, valor, ex=None):
+        self.threads.add(threading.get_ident())
+        self.dados[chave] = valor
+
+    def incr(self, chave):
+        self.threads.add(threading.get_ident())
+        self.dados[chave] = str(int(self.dados.get(chave, 0)) + 1).encode()
+        return int(self.dados[chave])
+
+
+def test_rotas_async_nao_chamam_o_redis_no_event_loop():
+    cliente = _ClienteLento()
+    cache = ResponseCache(RedisCache(cliente), ttl=60)
+
+    async def _rota():
+        await cache.invalidar_async()
+        chave = await cache.chave_async("listar", {"limit": 10})
+        await cache.guardar_async(chave, b"[]", {})
+        return threading.get_ident(), await cache.obter_async(chave)
+
+    loop, entrada = asyncio.run(_rota())
+
+    assert entrada["corpo"] == "[]"
+    assert cliente.threads and loop not in cliente.threads
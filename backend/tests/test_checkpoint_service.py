@@ -0,0 +1,52 @@
+from datetime import date
+
+from app.services.ato_service import salvar_lote_atos
+from app.services.checkpoint_service import chaves_existentes, filtrar_conhecidos
+
+
+def _linha(numero: str, data: str = "05/01/2026", orgao: str = "RFB") -> dict:
+    return {"tipo_ato": "Portaria", "numero": numero, "orgao": orgao, "data_publicacao": data, "ementa": "x"}
+
+
+def test_chaves_existentes_consulta_so_as_chaves_pedidas(db):
+    salvar_lote_atos(
+        db,
+        [{
+            "tipo_ato": "Portaria",
+            "numero_ato": "TESTE-CHAVE-1",
+            "orgao_unidade": "RFB",
+            "publicacao": date(2026, 1, 5),
+            "ementa": "Ementa de teste",
+        }],
+        registrar_log=False,
+    )
+
+    existentes = chaves_existentes(db, [
+        ("TESTE-CHAVE-1", date(2026, 1, 5), "RFB"),
+        # Mesma numeração de outro órgão e de outra data: atos diferentes
+        ("TESTE-CHAVE-1", date(2026, 1, 5), "PGFN"),
+        ("TESTE-CHAVE-1", date(2026, 1, 6), "RFB"),
+    ])
+
+    assert existentes == {("TESTE-CHAVE-1", date(2026, 1, 5), "RFB")}
+    assert chaves_existentes(db, []) == set()
+
+
+def test_filtrar_conhecidos_confere_pagina_a_pagina():
+    gravadas = {("2", date(2026, 1, 5), "RFB"), ("3", date(2026, 1, 5), "RFB"), ("4", date(2026, 1, 5), "RFB")}
+    consultas = []
+
+    def existentes(chaves):
+        consultas.append(chaves)
+        return gravadas & set(chaves)
+
+    paginas = [[_linha("1"), _linha("2")], [_linha("3"), _linha("4")], [_linha("5")]]
+    estatisticas = {}
+
+    novos = list(filtrar_conhecidos(iter(paginas), existentes, estatisticas))
+
+    # A segunda página é toda conhecida: a terceira nem é consultada
+    assert novos == [[_linha("1")]]
+    assert len(consultas) == 2
+    assert estatisticas["parada_antecipada"] is True
+    assert estatisticas["linhas_conhecidas"] == 3
@@ -0,0 +1,114 @@
+import threading
+
+import pytest
+from sqlalchemy import delete
+
+from app.core.settings import settings
+from app.database.session import SessionLocal
+from app.models.rpa_execucao import RpaExecucao
+from app.services import execucoes
+from app.services.execucoes import FilaCheiaError, GerenciadorExecucoes
+
+
+@pytest.fixture
+def gerenciadores(conexao_banco, monkeypatch):
+    """Dois gerenciadores, como dois workers, sobre a mesma tabela."""
+    monkeypatch.setattr(execucoes, "INTERVALO_VAGA", 0.05)
+    monkeypatch.setattr(execucoes, "INTERVALO_PROGRESSO", 0)
+
+    criados = [
+        GerenciadorExecucoes(
+            simultaneas=1, max_fila=1, historico=10, heartbeat=60, database_url=settings.database_url
+        )
+        for _ in range(2)
+    ]
+    ids = []
+
+    yield criados, ids
+
+    for gerenciador in criados:
+        gerenciador.encerrar()
+
+    db = SessionLocal()
+    db.execute(delete(RpaExecucao).where(RpaExecucao.id.in_(ids)))
+    db.commit()
+    db.close()
+
+
+def test_estado_e_limites_comuns_aos_workers(gerenciadores, monkeypatch):
+    (primeiro, segundo), ids = gerenciadores
+    liberar = threading.Event()
+    rodando = []
+
+    def executar_rpa(data_inicio, data_fim, ao_progredir=None):
+        rodando.append(data_inicio)
+        ao_progredir({"paginas": 1, "linhas_coletadas": 10, "total_inseridos": 0})
+        liberar.wait(10)
+        return {"status": "sucesso", "total_inseridos": 10}
+
+    monkeypatch.setattr(execucoes, "executar_rpa", executar_rpa)
+
+    a = primeiro.submeter(origem="teste")
+    b = segundo.submeter(origem="teste")
+    ids += [a["id"], b["id"]]
+
+    # Uma vaga e uma posição na fila para os dois workers juntos
+    with pytest.raises(FilaCheiaError):
+        segundo.submeter(origem="teste")
+
+    # Cada worker enxerga a execução do outro
+    assert segundo.obter(a["id"])["worker"] == a["worker"]
+    assert {e["id"] for e in primeiro.listar()} >= {a["id"], b["id"]}
+
+    # Só uma ocupa a vaga; a outra espera na fila
+    threading.Event().wait(0.5)
+    assert len(rodando) == 1
+    assert primeiro.status()["executando"] == 1
+    assert segundo.status()["na_fila"] == 1
+
+    liberar.set()
+    finais = [primeiro.aguardar(a["id"], timeout=10), segundo.aguardar(b["id"], timeout=10)]
+
+    assert len(rodando) == 2
+    assert [e["estado"] for e in finais] == ["sucesso", "sucesso"]
+    assert finais[0]["resultado"] == {"status": "sucesso", "total_inseridos": 10}
+    assert finais[0]["progresso"]["linhas_coletadas"] == 10
+
+
+def test_execucao_de_worker_parado_vira_erro(gerenciadores):
+    (primeiro, _), ids = gerenciadores
+
+    execucao_id = "abandonada" + "0" * 22
+    ids.append(execucao_id)
+
+    db = SessionLocal()
+    db.add(RpaExecucao(
+        id=execucao_id,
+        estado="executando",
+        origem="teste",
+        criado_em=execucoes.datetime(2000, 1, 1),
+        progresso={},
+        worker="outro-host:1",
+        atualizado_em=execucoes.datetime(2000, 1, 1),
+    ))
+    db.commit()
+    db.close()
+
+    primeiro._renovar()
+
+    execucao = primeiro.obter(execucao_id)
+    assert execucao["estado"] == "erro"
+    assert "outro-host:1" in execucao["erro"]
+
+
+def test_medidor_nao_consulta_o_banco(monkeypatch):
+    def _sem_banco():
+        raise AssertionError("o scrape não deve abrir sessão")
+
+    monkeypatch.setattr(execucoes, "SessionLocal", _sem_banco)
+    monkeypatch.setattr(execucoes.gerenciador_execucoes, "_contagem", {"na_fila": 2, "executando": 1})
+
+    exposicao = execucoes.registro.exportar()
+
+    assert 'rpa_execucoes_ativas{estado="executando"} 1.0' in exposicao
+    assert 'rpa_execucoes_ativas{estado="na_fila"} 2.0' in exposicao
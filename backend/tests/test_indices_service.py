@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import text
+
+from app.benchmarks import gerador
+from app.database.session import SessionLocal, engine
+from app.services.indices_service import verificar_indices
+
+PREFIXO = "TESTE-IDX-"
+ATOS = 30_000
+LOGS = 20_000
+
+
+@pytest.fixture(scope="module")
+def base_realista(conexao_banco):
+    """
+    Atos e logs sintéticos gravados de verdade, com visibility map e
+    estatísticas em dia: sobre poucas linhas o planejador prefere ler a
+    tabela inteira e o plano não diz nada sobre os índices.
+    """
+    db = SessionLocal()
+    ids_logs = []
+
+    try:
+        gerador.popular(db, 0, ATOS, PREFIXO)
+        ids_logs = gerador.popular_logs(db, LOGS)
+
+        with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conexao:
+            conexao.execute(text("VACUUM ANALYZE atos"))
+            conexao.execute(text("VACUUM ANALYZE rpa_logs"))
+
+        yield db
+    finally:
+        db.rollback()
+        gerador.limpar(db, PREFIXO)
+        gerador.limpar_logs(db, ids_logs)
+        db.close()
+
+
+def test_consultas_quentes_usam_os_indices(base_realista):
+    # Plano que a base escolheria, sem desligar a varredura sequencial
+    resultados = verificar_indices(base_realista, planejador_real=True)
+
+    assert {r["consulta"] for r in resultados} >= {"atos_primeira_pagina", "logs_primeira_pagina"}
+    assert [r for r in resultados if not r["ok"]] == []
+
+
+def test_indices_da_particao_aparecem_pelo_nome_da_tabela_mae(base_realista):
+    resultados = {r["consulta"]: r for r in verificar_indices(base_realista, planejador_real=True)}
+
+    assert "ix_atos_ativos_publicacao" in resultados["atos_primeira_pagina"]["indices_usados"]
+    assert not any("_p2" in indice for r in resultados.values() for indice in r["indices_usados"])
@@ -0,0 +1,11 @@
+from app.core import instrumentacao
+
+
+def test_sql_sem_contexto_nao_e_medido():
+    antes = instrumentacao.TEMPO_SQL._linhas()
+
+    # Execuções internas do dialeto chegam aos eventos com context=None
+    instrumentacao._antes_sql(None, None, "SELECT 1", {}, None, False)
+    instrumentacao._depois_sql(None, None, "SELECT 1", {}, None, False)
+
+    assert instrumentacao.TEMPO_SQL._linhas() == antes
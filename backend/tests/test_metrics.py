@@ -0,0 +1,24 @@
+from app.core import metrics
+
+
+def test_medidor_com_falha_repete_os_ultimos_valores():
+    registro = metrics.Registro()
+    leituras = iter([[({"pool": "principal"}, 3)]])
+
+    def _ler():
+        # Primeira leitura funciona; as seguintes falham (banco fora)
+        try:
+            return next(leituras)
+        except StopIteration:
+            raise RuntimeError("banco indisponível") from None
+
+    registro.medidor("teste_medidor", "Medidor de teste", funcao=_ler)
+    registro.contador("teste_contador", "Contador de teste").inc()
+
+    assert 'teste_medidor{pool="principal"} 3.0' in registro.exportar()
+
+    exposicao = registro.exportar()
+
+    assert 'teste_medidor{pool="principal"} 3.0' in exposicao
+    assert "teste_contador 1.0" in exposicao
+    assert 'metricas_medidor_erros_total{metrica="teste_medidor"}' in metrics.registro.exportar()
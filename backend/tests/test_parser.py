@@ -0,0 +1,118 @@
+from pathlib import Path
+
+import pytest
+
+from app.rpa import parser
+
+FIXTURES = Path(__file__).resolve().parent.parent / "app" / "rpa" / "fixtures" / "sijut2"
+BASE_URL = "http://sijut2.local/sijut2consulta/consulta.action"
+
+
+def _pagina(nome: str) -> str:
+    return (FIXTURES / nome).read_text(encoding="utf-8")
+
+
+@pytest.mark.parametrize("numero, linhas, primeiro, ultimo", [
+    (1, 50, "300", "251"),
+    (2, 50, "250", "201"),
+    (3, 17, "200", "184"),
+])
+def test_parse_das_paginas_salvas(numero, linhas, primeiro, ultimo):
+    atos = parser.parse_tabela_atos(_pagina(f"resultado_p{numero}.html"))
+
+    assert len(atos) == linhas
+    assert (atos[0]["numero"], atos[-1]["numero"]) == (primeiro, ultimo)
+    # Os números das páginas salvas são consecutivos, do mais recente ao mais antigo
+    assert [int(ato["numero"]) for ato in atos] == list(range(int(primeiro), int(ultimo) - 1, -1))
+
+
+def test_parse_monta_os_mesmos_dicionarios_do_selenium():
+    atos = parser.parse_tabela_atos(_pagina("resultado_p1.html"))
+
+    # A ementa vem no HTML entre quebras de linha e recuo, que o
+    # WebElement.text descarta
+    assert atos[0] == {
+        "tipo_ato": "Ato Declaratório Executivo",
+        "numero": "300",
+        "orgao": "Coordenação-Geral de Tributação",
+        "data_publicacao": "03/03/2025",
+        "ementa": (
+            "Imposto sobre Produtos Industrializados - IPI. Estabelece procedimentos "
+            "para a habilitação ao regime especial. Dispõe sobre a apresentação da "
+            "Escrituração Contábil Fiscal (ECF). Declara a inaptidão de inscrição no "
+            "Cadastro Nacional da Pessoa Jurídica."
+        ),
+    }
+    assert atos[-1]["ementa"].startswith("Imposto sobre a Renda de Pessoa Jurídica - IRPJ.")
+
+
+def test_texto_junta_espacos_como_o_selenium():
+    # Sem <tbody> (HTML bruto do servidor), com quebras de linha, tabulação,
+    # espaços repetidos e &nbsp; dentro das células
+    html = """
+        <table id="tabelaAtos">
+          <tr class="linhaResultados destaque">
+            <td>
+              Solução de
+                  Consulta\tCOSIT
+            </td>
+            <td> 12 </td>
+            <td>Coordenação-Geral&nbsp;de   Tributação</td>
+            <td>05/01/2026</td>
+            <td><p>Lucro presumido.</p>
+                <span>Receita   bruta.</span></td>
+          </tr>
+          <tr class="cabecalho"><td>a</td><td>b</td><td>c</td><td>d</td><td>e</td></tr>
+        </table>
+    """
+
+    assert parser.parse_tabela_atos(html) == [{
+        "tipo_ato": "Solução de Consulta COSIT",
+        "numero": "12",
+        "orgao": "Coordenação-Geral de Tributação",
+        "data_publicacao": "05/01/2026",
+        "ementa": "Lucro presumido. Receita bruta.",
+    }]
+
+
+def test_parse_sem_tabela():
+    assert parser.parse_tabela_atos("") == []
+    assert parser.parse_tabela_atos(_pagina("consulta.html")) == []
+
+
+def test_total_registros():
+    assert parser.total_registros(_pagina("resultado_p1.html")) == 117
+    assert parser.total_registros(_pagina("consulta.html")) is None
+
+
+def test_proxima_pagina_segue_o_formulario_do_botao():
+    assert parser.proxima_pagina(_pagina("resultado_p1.html"), BASE_URL) == (
+        BASE_URL,
+        [("dt_inicio", "28/02/2025"), ("dt_fim", "03/03/2025"), ("p", "2")],
+    )
+    assert parser.proxima_pagina(_pagina("resultado_p2.html"), BASE_URL)[1][-1] == ("p", "3")
+
+
+def test_ultima_pagina_nao_tem_proxima():
+    # Botão desabilitado na última página; sem botão, idem
+    assert parser.proxima_pagina(_pagina("resultado_p3.html"), BASE_URL) is None
+    assert parser.proxima_pagina(_pagina("consulta.html"), BASE_URL) is None
+
+
+def test_saltar_para_pagina():
+    consulta = parser.proxima_pagina(_pagina("resultado_p1.html"), BASE_URL)
+
+    assert parser.saltar_para_pagina(consulta, 7) == (
+        BASE_URL,
+        [("dt_inicio", "28/02/2025"), ("dt_fim", "03/03/2025"), ("p", "7")],
+    )
+    assert parser.saltar_para_pagina((BASE_URL, [("dt_inicio", "28/02/2025")]), 7) is None
+
+
+def test_montar_consulta_preenche_as_datas():
+    assert parser.montar_consulta(_pagina("consulta.html"), BASE_URL, "01/01/2025", "31/01/2025") == (
+        BASE_URL,
+        [("tipoConsulta", "formulario"), ("dt_inicio", "01/01/2025"), ("dt_fim", "31/01/2025")],
+    )
+    # Página sem o formulário de consulta
+    assert parser.montar_consulta(_pagina("resultado_p1.html"), BASE_URL, "01/01/2025", "31/01/2025") is None
@@ -0,0 +1,30 @@
+from datetime import date
+
+from sqlalchemy import text
+
+from app.database.session import engine
+from app.services import particoes_service
+
+
+def test_particoes_faltando_lista_os_meses_a_frente(db, monkeypatch):
+    monkeypatch.setattr(particoes_service.settings, "particoes_meses_a_frente", 2)
+
+    faltando = particoes_service.particoes_faltando(db, hoje=date(2099, 11, 15))
+
+    assert faltando == [
+        "atos_p209911", "atos_p209912", "atos_p210001",
+        "rpa_logs_p209911", "rpa_logs_p209912", "rpa_logs_p210001",
+    ]
+
+
+def test_subida_segue_quando_a_manutencao_falha(db, monkeypatch, capsys):
+    monkeypatch.setattr(particoes_service, "LOCK_TIMEOUT", "100ms")
+
+    # Outra transação segura atos: a criação da partição estoura o lock_timeout
+    with engine.connect() as outra:
+        outra.execute(text("LOCK TABLE atos IN ACCESS EXCLUSIVE MODE"))
+        particoes_service.verificar_na_subida(db, hoje=date(2099, 1, 15))
+        outra.rollback()
+
+    assert "não foram criadas na subida" in capsys.readouterr().out
+    assert not particoes_service._existe(db, "atos_p209901")
@@ -0,0 +1,128 @@
+import threading
+import time
+from datetime import date
+
+import pytest
+
+from app.rpa import sharding
+from app.rpa.collector import Collector, ao_expirar
+
+
+class _ColetorPreso(Collector):
+    """As primeiras ``presas`` tentativas travam até ``Prazo.expirar`` fechar o "navegador"."""
+
+    nome = "teste"
+
+    def __init__(self, estado: dict, prazo=None):
+        self.estado = estado
+        self.prazo = prazo
+
+    def coletar_paginas(self, data_inicio=None, data_fim=None, metricas=None, pagina_inicial=1):
+        estado = self.estado
+        with estado["lock"]:
+            estado["tentativas"] += 1
+            estado["rodando"] += 1
+            estado["max_rodando"] = max(estado["max_rodando"], estado["rodando"])
+            presa = estado["tentativas"] <= estado["presas"]
+
+        try:
+            if presa:
+                navegador_aberto = threading.Event()
+                with ao_expirar(self.prazo, navegador_aberto.set):
+                    navegador_aberto.wait(30)
+                raise ConnectionError("navegador fechado")
+
+            yield [{
+                "tipo_ato": "Portaria",
+                "numero": f"{data_inicio:%Y%m%d}",
+                "orgao": "RFB",
+                "data_publicacao": f"{data_inicio:%d/%m/%Y}",
+                "ementa": "Ementa",
+            }]
+        finally:
+            with estado["lock"]:
+                estado["rodando"] -= 1
+
+
+@pytest.fixture
+def coletor_preso(monkeypatch):
+    estado = {"lock": threading.Lock(), "tentativas": 0, "rodando": 0, "max_rodando": 0, "presas": 0}
+    monkeypatch.setattr(
+        sharding, "criar_collector", lambda engine=None, prazo=None: _ColetorPreso(estado, prazo)
+    )
+    return estado
+
+
+def _coletar(**opcoes) -> tuple[list[dict], list[list[dict]]]:
+    shards = sharding.criar_shards(date(2026, 1, 1), date(2026, 1, 1), dias_por_shard=1)
+    paginas = list(sharding.coletar_em_shards(shards, workers=1, timeout=0.5, **opcoes))
+    return shards, paginas
+
+
+def test_timeout_derruba_a_tentativa_presa_e_tenta_de_novo(coletor_preso):
+    coletor_preso["presas"] = 1
+
+    inicio = time.perf_counter()
+    shards, paginas = _coletar(tentativas=2)
+
+    assert time.perf_counter() - inicio < 5
+    assert shards[0]["status"] == "sucesso"
+    assert shards[0]["tentativas"] == 2
+    assert sum(len(pagina) for pagina in paginas) == 1
+    # A nova tentativa só começa quando a presa terminou
+    assert coletor_preso["max_rodando"] == 1
+
+
+def test_timeout_esgota_as_tentativas(coletor_preso):
+    coletor_preso["presas"] = 2
+
+    inicio = time.perf_counter()
+    shards, paginas = _coletar(tentativas=2)
+
+    assert time.perf_counter() - inicio < 5
+    assert shards[0]["status"] == "erro"
+    assert shards[0]["erro"] == "Timeout após 0.5s"
+    assert paginas == []
+    assert coletor_preso["rodando"] == 0
+
+
+def _segunda_janela_espera(monkeypatch, liberar: threading.Event):
+    """A janela de 02/01 só começa depois de ``liberar`` (ou do prazo dela)."""
+    original = _ColetorPreso.coletar_paginas
+
+    def coletar_paginas(self, data_inicio=None, data_fim=None, metricas=None, pagina_inicial=1):
+        if data_inicio == date(2026, 1, 2):
+            with ao_expirar(self.prazo, liberar.set):
+                liberar.wait(30)
+        yield from original(self, data_inicio, data_fim, metricas, pagina_inicial)
+
+    monkeypatch.setattr(_ColetorPreso, "coletar_paginas", coletar_paginas)
+
+
+def test_paginas_saem_antes_das_outras_janelas_terminarem(coletor_preso, monkeypatch):
+    liberar = threading.Event()
+    _segunda_janela_espera(monkeypatch, liberar)
+
+    shards = sharding.criar_shards(date(2026, 1, 1), date(2026, 1, 2), dias_por_shard=1)
+    paginas = sharding.coletar_em_shards(shards, workers=2, timeout=30)
+
+    assert next(paginas)[0]["data_publicacao"] == "01/01/2026"
+    assert shards[1]["status"] == "pendente"
+
+    liberar.set()
+    assert [pagina[0]["data_publicacao"] for pagina in paginas] == ["02/01/2026"]
+    assert [shard["status"] for shard in shards] == ["sucesso", "sucesso"]
+
+
+def test_fechar_o_gerador_encerra_as_coletas(coletor_preso, monkeypatch):
+    _segunda_janela_espera(monkeypatch, threading.Event())
+
+    shards = sharding.criar_shards(date(2026, 1, 1), date(2026, 1, 2), dias_por_shard=1)
+    paginas = sharding.coletar_em_shards(shards, workers=2, timeout=30)
+    next(paginas)
+
+    inicio = time.perf_counter()
+    paginas.close()
+
+    assert time.perf_counter() - inicio < 5
+    assert coletor_preso["rodando"] == 0